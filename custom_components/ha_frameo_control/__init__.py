@@ -1,45 +1,147 @@
 """The HA Frameo Control integration."""
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Any
+
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID, CONF_HOST, CONF_PORT
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 
-from .api import FrameoAddonApiClient, FrameoApiError
+from .adb import FrameoAdbClient, async_get_adb_key
+from .api import FrameoApiError
+from .backend import get_backend_pool
+from .discovery import get_usb_discovery
 from .const import (
+    ATTR_CACHE_TTL,
     ATTR_COMMAND,
+    ATTR_CPROFILE,
+    ATTR_DURATION,
+    ATTR_FILENAME,
+    ATTR_INTERVAL,
+    ATTR_MAX_WIDTH,
+    ATTR_NAME,
+    ATTR_OPERATIONS,
+    ATTR_PATTERN,
     ATTR_RESULT,
+    ATTR_TAGS,
+    CONF_ADDON_BACKENDS,
     CONF_ADDON_HOST,
     CONF_ADDON_PORT,
+    CONF_CONN_TYPE,
+    CONF_DIRECT_ADB,
+    CONF_FALLBACK_HOST,
+    CONF_FALLBACK_SERIAL,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_OFFLINE_QUEUE_TTL,
     CONF_SCREEN_HEIGHT,
     CONF_SCREEN_WIDTH,
+    CONF_SERIAL,
     DEFAULT_ADDON_HOST,
     DEFAULT_ADDON_PORT,
+    DEFAULT_DEVICE_PORT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LOGCAT_INTERVAL,
+    DEFAULT_PROFILE_DURATION,
     DEFAULT_SCREEN_HEIGHT,
     DEFAULT_SCREEN_WIDTH,
     DOMAIN,
     EVENT_ADB_RESPONSE,
     LOGGER,
+    MAX_CACHE_TTL,
+    MAX_PROFILE_DURATION,
+    MIN_LOGCAT_INTERVAL,
     PLATFORMS,
+    SERVICE_CAPTURE_SCREEN,
+    SERVICE_PROFILE,
+    SERVICE_RESTORE_STATE,
     SERVICE_RUN_ADB_COMMAND,
+    SERVICE_SNAPSHOT_STATE,
+    SERVICE_SUBSCRIBE_LOGCAT,
+    SERVICE_UNSUBSCRIBE_LOGCAT,
+    ConnectionType,
 )
 from .coordinator import FrameoDataUpdateCoordinator
 
 type FrameoConfigEntry = ConfigEntry[FrameoDataUpdateCoordinator]
 
-# Valid connection statuses from the addon
-_CONNECTED_STATUSES = frozenset({"connected", "already_connected"})
-
 # Service schema
 SERVICE_RUN_ADB_COMMAND_SCHEMA = vol.Schema(
     {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
         vol.Required(ATTR_COMMAND): cv.string,
+        vol.Optional(ATTR_CACHE_TTL): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_CACHE_TTL)
+        ),
+    }
+)
+
+SERVICE_SUBSCRIBE_LOGCAT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_TAGS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_PATTERN): cv.string,
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_LOGCAT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=MIN_LOGCAT_INTERVAL)
+        ),
+    }
+)
+
+SERVICE_UNSUBSCRIBE_LOGCAT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Optional(ATTR_OPERATIONS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_CPROFILE, default=False): cv.boolean,
     }
 )
 
+SERVICE_STATE_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+
+SERVICE_CAPTURE_SCREEN_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_MAX_WIDTH): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+# Services removed when the last config entry is unloaded
+_SERVICES = (
+    SERVICE_RUN_ADB_COMMAND,
+    SERVICE_SUBSCRIBE_LOGCAT,
+    SERVICE_UNSUBSCRIBE_LOGCAT,
+    SERVICE_PROFILE,
+    SERVICE_SNAPSHOT_STATE,
+    SERVICE_RESTORE_STATE,
+    SERVICE_CAPTURE_SCREEN,
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: FrameoConfigEntry) -> bool:
     """Set up HA Frameo Control from a config entry.
@@ -72,21 +174,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: FrameoConfigEntry) -> bo
     screen_width = entry.options.get(CONF_SCREEN_WIDTH, DEFAULT_SCREEN_WIDTH)
     screen_height = entry.options.get(CONF_SCREEN_HEIGHT, DEFAULT_SCREEN_HEIGHT)
 
-    api_client = FrameoAddonApiClient(hass, host=addon_host, port=addon_port)
-
-    # Establish connection with the device via the addon
-    LOGGER.debug("Attempting to establish connection with the Frameo addon at %s:%s", addon_host, addon_port)
-    try:
-        connect_result = await api_client.async_connect(dict(entry.data))
-    except FrameoApiError as err:
-        raise ConfigEntryNotReady(f"Failed to connect to Frameo addon: {err}") from err
+    # Additional addon backends the device may be placed on
+    backend_addresses = [(addon_host, int(addon_port))] + [
+        _parse_backend_address(address)
+        for address in entry.options.get(CONF_ADDON_BACKENDS, [])
+    ]
+    direct = (
+        entry.options.get(CONF_DIRECT_ADB, False)
+        and entry.data.get(CONF_CONN_TYPE) == ConnectionType.NETWORK
+    )
 
-    if not connect_result or connect_result.get("status") not in _CONNECTED_STATUSES:
-        raise ConfigEntryNotReady(
-            f"Initial connection to Frameo device failed: {connect_result}"
+    if direct:
+        # Talk ADB to the device ourselves; the fallback transport needs the addon
+        api_client = FrameoAdbClient(
+            hass,
+            entry.data[CONF_HOST],
+            entry.data.get(CONF_PORT, DEFAULT_DEVICE_PORT),
+            await async_get_adb_key(hass),
         )
-
-    LOGGER.info("Connection successful, initializing coordinator")
+        backend_pool = None
+        fallback_details = None
+    else:
+        backend_pool = get_backend_pool(hass)
+        api_client = await backend_pool.async_place(dict(entry.data), backend_addresses)
+        if api_client is None:
+            raise ConfigEntryNotReady("No Frameo addon backend can reach the device")
+        fallback_details = _build_fallback_details(entry)
 
     coordinator = FrameoDataUpdateCoordinator(
         hass,
@@ -94,29 +207,173 @@ async def async_setup_entry(hass: HomeAssistant, entry: FrameoConfigEntry) -> bo
         conn_details=dict(entry.data),
         configured_width=screen_width,
         configured_height=screen_height,
+        fallback_details=fallback_details,
+        backend_pool=backend_pool,
+        backend_addresses=backend_addresses,
+        offline_queue_ttl=entry.options.get(CONF_OFFLINE_QUEUE_TTL, 0),
     )
 
+    # Establish connection with the device via the addon, picking the fastest
+    # transport when a fallback is configured
+    LOGGER.debug("Attempting to establish connection with the Frameo device via %s", api_client.base_url)
+    if not await coordinator.async_select_transport():
+        await coordinator.async_shutdown()
+        raise ConfigEntryNotReady(
+            f"Initial connection to Frameo device via {api_client.base_url} failed"
+        )
+
+    LOGGER.info("Connection successful over %s", coordinator.active_transport.name)
+
     # Fetch initial data before entities are set up
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        await coordinator.async_shutdown()
+        raise
 
     entry.runtime_data = coordinator
 
+    # Keep the connection warm so interactions rarely have to reconnect
+    coordinator.async_start_heartbeat(
+        entry.options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+    )
+
+    # Keep an eye on the addon for newly plugged-in devices
+    if not direct:
+        get_usb_discovery(hass).async_add_entry(entry.entry_id)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     # Register services
-    await _async_setup_services(hass, entry)
+    await _async_setup_services(hass)
 
     return True
 
 
-async def _async_setup_services(hass: HomeAssistant, entry: FrameoConfigEntry) -> None:
+def _parse_backend_address(address: str) -> tuple[str, int]:
+    """Split a "host:port" backend address, defaulting to the addon port.
+
+    Args:
+        address: Backend address.
+
+    Returns:
+        Tuple of (host, port).
+
+    """
+    host, _, port = address.strip().rpartition(":")
+    if not host:
+        return (port, DEFAULT_ADDON_PORT)
+    return (host, int(port))
+
+
+def _build_fallback_details(entry: FrameoConfigEntry) -> dict[str, Any] | None:
+    """Build connection details for the entry's fallback transport, if any.
+
+    A USB entry can fall back to a network address and a network entry to a
+    USB serial.
+
+    Args:
+        entry: Config entry.
+
+    Returns:
+        Connection details, or None if no fallback is configured.
+
+    """
+    if entry.data.get(CONF_CONN_TYPE) == ConnectionType.USB:
+        if host := entry.options.get(CONF_FALLBACK_HOST):
+            return {
+                CONF_CONN_TYPE: ConnectionType.NETWORK,
+                CONF_HOST: host,
+                CONF_PORT: DEFAULT_DEVICE_PORT,
+            }
+    elif serial := entry.options.get(CONF_FALLBACK_SERIAL):
+        return {CONF_CONN_TYPE: ConnectionType.USB, CONF_SERIAL: serial}
+    return None
+
+
+@callback
+def async_move_entry_to_network(
+    hass: HomeAssistant, entry: FrameoConfigEntry, conn_details: dict[str, Any]
+) -> None:
+    """Switch a USB config entry to a network connection in place.
+
+    Entities are keyed by the entry ID, so they keep their entity IDs. The
+    USB serial becomes the fallback, as rebooting the device turns wireless
+    ADB off again. Updating the entry reloads it over the new connection.
+
+    Args:
+        hass: Home Assistant instance.
+        entry: USB config entry.
+        conn_details: Connection details of the network transport.
+
+    """
+    host = conn_details[CONF_HOST]
+    options = {
+        key: value for key, value in entry.options.items() if key != CONF_FALLBACK_HOST
+    }
+    if serial := entry.data.get(CONF_SERIAL):
+        options[CONF_FALLBACK_SERIAL] = serial
+    # Keep the old unique ID if another entry already uses this address
+    unique_id = (
+        entry.unique_id
+        if hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, host)
+        else host
+    )
+    hass.config_entries.async_update_entry(
+        entry,
+        title=f"Frameo ({host})",
+        unique_id=unique_id,
+        data={
+            **{key: value for key, value in entry.data.items() if key != CONF_SERIAL},
+            **conn_details,
+        },
+        options=options,
+    )
+
+
+@callback
+def _async_get_target_entry(hass: HomeAssistant, call: ServiceCall) -> FrameoConfigEntry:
+    """Find the config entry of the device a service call targets.
+
+    Args:
+        hass: Home Assistant instance.
+        call: Service call, optionally with the device ID to target.
+
+    Returns:
+        Loaded config entry of the device.
+
+    Raises:
+        HomeAssistantError: If the device is not a loaded Frameo device, or
+            no device was given and there is not exactly one.
+
+    """
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    if (device_id := call.data.get(ATTR_DEVICE_ID)) is None:
+        if len(entries) == 1:
+            return entries[0]
+        if not entries:
+            raise HomeAssistantError("No Frameo device is loaded")
+        raise HomeAssistantError(
+            "More than one Frameo device is set up, choose one with device_id"
+        )
+    if device := dr.async_get(hass).async_get(device_id):
+        for entry in entries:
+            if entry.entry_id in device.config_entries:
+                return entry
+    raise HomeAssistantError(f"No loaded Frameo device with ID '{device_id}'")
+
+
+async def _async_setup_services(hass: HomeAssistant) -> None:
     """Set up integration services.
 
     Args:
         hass: Home Assistant instance.
-        entry: Config entry.
 
     """
     async def handle_run_adb_command(call: ServiceCall) -> ServiceResponse:
@@ -130,13 +387,15 @@ async def _async_setup_services(hass: HomeAssistant, entry: FrameoConfigEntry) -
 
         """
         command = call.data[ATTR_COMMAND]
-        coordinator: FrameoDataUpdateCoordinator = entry.runtime_data
+        coordinator = _async_get_target_entry(hass, call).runtime_data
 
         LOGGER.info("Running custom ADB command: %s", command)
 
         try:
-            result = await coordinator.async_execute_command(command)
-            output = result.get("result", "") if result else ""
+            result = await coordinator.async_execute_command(
+                command, cache_ttl=call.data.get(ATTR_CACHE_TTL)
+            )
+            output = result.output
 
             # Fire an event so users can capture the response in automations
             hass.bus.async_fire(
@@ -151,11 +410,125 @@ async def _async_setup_services(hass: HomeAssistant, entry: FrameoConfigEntry) -
                 "command": command,
                 "result": output,
                 "success": True,
+                "queued": result.queued,
             }
         except FrameoApiError as err:
             LOGGER.error("ADB command failed: %s", err)
             raise HomeAssistantError(f"ADB command failed: {err}") from err
 
+    async def handle_subscribe_logcat(call: ServiceCall) -> None:
+        """Handle the subscribe_logcat service call.
+
+        Args:
+            call: Service call data.
+
+        """
+        target = _async_get_target_entry(hass, call)
+        name = call.data[ATTR_NAME]
+
+        LOGGER.info("Subscribing to logcat as '%s'", name)
+        target.runtime_data.async_subscribe_logcat(
+            target.entry_id,
+            name,
+            call.data[ATTR_TAGS],
+            call.data.get(ATTR_PATTERN),
+            call.data[ATTR_INTERVAL],
+        )
+
+    async def handle_unsubscribe_logcat(call: ServiceCall) -> None:
+        """Handle the unsubscribe_logcat service call.
+
+        Args:
+            call: Service call data.
+
+        """
+        coordinator = _async_get_target_entry(hass, call).runtime_data
+        name = call.data[ATTR_NAME]
+
+        if not coordinator.async_unsubscribe_logcat(name):
+            raise HomeAssistantError(f"No logcat subscription named '{name}'")
+
+    async def handle_profile(call: ServiceCall) -> None:
+        """Handle the profile service call.
+
+        Args:
+            call: Service call data.
+
+        """
+        coordinator = _async_get_target_entry(hass, call).runtime_data
+        duration = call.data.get(ATTR_DURATION)
+        operations = call.data.get(ATTR_OPERATIONS)
+        if duration is None and operations is None:
+            duration = DEFAULT_PROFILE_DURATION
+
+        await coordinator.async_start_profile(
+            duration, operations, call.data[ATTR_CPROFILE]
+        )
+
+    async def handle_snapshot_state(call: ServiceCall) -> ServiceResponse:
+        """Handle the snapshot_state service call.
+
+        Args:
+            call: Service call data.
+
+        Returns:
+            Service response with the captured state.
+
+        """
+        coordinator = _async_get_target_entry(hass, call).runtime_data
+        try:
+            snapshot = await coordinator.async_snapshot_state(call.data[ATTR_NAME])
+        except FrameoApiError as err:
+            raise HomeAssistantError(f"State snapshot failed: {err}") from err
+        return snapshot.as_dict()
+
+    async def handle_restore_state(call: ServiceCall) -> None:
+        """Handle the restore_state service call.
+
+        Args:
+            call: Service call data.
+
+        """
+        name = call.data[ATTR_NAME]
+        coordinator = _async_get_target_entry(hass, call).runtime_data
+        try:
+            await coordinator.async_restore_state(name)
+        except KeyError as err:
+            raise HomeAssistantError(f"No state snapshot named '{name}'") from err
+        except FrameoApiError as err:
+            raise HomeAssistantError(f"State restore failed: {err}") from err
+
+    async def handle_capture_screen(call: ServiceCall) -> ServiceResponse:
+        """Handle the capture_screen service call.
+
+        Args:
+            call: Service call data.
+
+        Returns:
+            Service response with the file written and the image size.
+
+        """
+        filename = call.data[ATTR_FILENAME]
+        if not hass.config.is_allowed_path(filename):
+            raise HomeAssistantError(f"Cannot write '{filename}', no access to path")
+        coordinator = _async_get_target_entry(hass, call).runtime_data
+        try:
+            screenshot = await coordinator.async_capture_screen(
+                call.data.get(ATTR_MAX_WIDTH)
+            )
+        except FrameoApiError as err:
+            raise HomeAssistantError(f"Screen capture failed: {err}") from err
+        png = await hass.async_add_executor_job(screenshot.to_png)
+        try:
+            await hass.async_add_executor_job(Path(filename).write_bytes, png)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot write '{filename}': {err}") from err
+        return {
+            ATTR_FILENAME: filename,
+            "width": screenshot.width,
+            "height": screenshot.height,
+        }
+
     # Only register if not already registered
     if not hass.services.has_service(DOMAIN, SERVICE_RUN_ADB_COMMAND):
         hass.services.async_register(
@@ -165,6 +538,50 @@ async def _async_setup_services(hass: HomeAssistant, entry: FrameoConfigEntry) -
             schema=SERVICE_RUN_ADB_COMMAND_SCHEMA,
             supports_response=SupportsResponse.OPTIONAL,
         )
+    if not hass.services.has_service(DOMAIN, SERVICE_SUBSCRIBE_LOGCAT):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SUBSCRIBE_LOGCAT,
+            handle_subscribe_logcat,
+            schema=SERVICE_SUBSCRIBE_LOGCAT_SCHEMA,
+        )
+    if not hass.services.has_service(DOMAIN, SERVICE_UNSUBSCRIBE_LOGCAT):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_UNSUBSCRIBE_LOGCAT,
+            handle_unsubscribe_logcat,
+            schema=SERVICE_UNSUBSCRIBE_LOGCAT_SCHEMA,
+        )
+    if not hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_PROFILE,
+            handle_profile,
+            schema=SERVICE_PROFILE_SCHEMA,
+        )
+    if not hass.services.has_service(DOMAIN, SERVICE_SNAPSHOT_STATE):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SNAPSHOT_STATE,
+            handle_snapshot_state,
+            schema=SERVICE_STATE_SNAPSHOT_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+    if not hass.services.has_service(DOMAIN, SERVICE_RESTORE_STATE):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_RESTORE_STATE,
+            handle_restore_state,
+            schema=SERVICE_STATE_SNAPSHOT_SCHEMA,
+        )
+    if not hass.services.has_service(DOMAIN, SERVICE_CAPTURE_SCREEN):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_CAPTURE_SCREEN,
+            handle_capture_screen,
+            schema=SERVICE_CAPTURE_SCREEN_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
 
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -193,6 +610,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: FrameoConfigEntry) -> b
 
     # Unregister services if this is the last config entry
     if len(hass.config_entries.async_entries(DOMAIN)) == 1:
-        hass.services.async_remove(DOMAIN, SERVICE_RUN_ADB_COMMAND)
+        for service in _SERVICES:
+            hass.services.async_remove(DOMAIN, service)
+
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        get_usb_discovery(hass).async_remove_entry(entry.entry_id)
+        await entry.runtime_data.async_shutdown()
 
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
\ No newline at end of file
+    return unload_ok
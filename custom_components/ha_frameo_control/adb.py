@@ -0,0 +1,745 @@
+"""Direct ADB over TCP for network-connected Frameo devices."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import re
+import struct
+import time
+from typing import TYPE_CHECKING, Any
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa, utils
+
+from homeassistant.helpers.storage import Store
+
+from .api import (
+    AddonState,
+    FrameoApiError,
+    FrameoDeviceDisconnectedError,
+    ShellResult,
+    StatusResult,
+    async_read_screen_resolution,
+)
+from .const import (
+    CONNECT_TIMEOUT,
+    DEFAULT_DEVICE_PORT,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .profiling import FrameoProfiler
+
+# ADB packets start with a 24 byte header: command, arg0, arg1, payload length,
+# payload checksum and the command XOR 0xffffffff
+ADB_HEADER = struct.Struct("<6I")
+ADB_VERSION = 0x01000000
+ADB_MAX_PAYLOAD = 4096
+ADB_CONNECT_PAYLOAD = b"host::\x00"
+
+A_CNXN = int.from_bytes(b"CNXN", "little")
+A_AUTH = int.from_bytes(b"AUTH", "little")
+A_OPEN = int.from_bytes(b"OPEN", "little")
+A_OKAY = int.from_bytes(b"OKAY", "little")
+A_WRTE = int.from_bytes(b"WRTE", "little")
+A_CLSE = int.from_bytes(b"CLSE", "little")
+
+# Types of AUTH packets
+_AUTH_TOKEN = 1
+_AUTH_SIGNATURE = 2
+_AUTH_RSAPUBLICKEY = 3
+
+# Size of the RSA key, and of its modulus in 32-bit words
+_KEY_BITS = 2048
+_KEY_WORDS = _KEY_BITS // 32
+
+# Weight of the newest sample in the smoothed command latency
+_LATENCY_SMOOTHING = 0.2
+
+# Combined command answering /state: wakefulness, then the brightness setting
+_STATE_COMMAND = "dumpsys power | grep mWakefulness=; settings get system screen_brightness"
+
+# Output of a command run in the shell session is framed by these markers,
+# followed by a sequence number. The shell is sent them split by quotes, so a
+# terminal echoing its input never prints the marker itself
+_SESSION_BEGIN = "__FRAMEO_BEGIN_"
+_SESSION_END = "__FRAMEO_END_"
+# Longer commands, and ones spanning lines, get their own shell service, as a
+# terminal limits the length of an input line
+_SESSION_MAX_COMMAND = 1024
+
+
+def build_packet(command: int, arg0: int, arg1: int, payload: bytes = b"") -> bytes:
+    """Build an ADB packet.
+
+    Args:
+        command: Packet command, e.g. A_CNXN.
+        arg0: First argument.
+        arg1: Second argument.
+        payload: Packet payload.
+
+    Returns:
+        Encoded packet.
+
+    """
+    return (
+        ADB_HEADER.pack(
+            command,
+            arg0,
+            arg1,
+            len(payload),
+            sum(payload) & 0xFFFFFFFF,
+            command ^ 0xFFFFFFFF,
+        )
+        + payload
+    )
+
+
+async def async_read_packet(reader: asyncio.StreamReader) -> tuple[int, int, int, bytes]:
+    """Read one ADB packet.
+
+    Args:
+        reader: Stream to read from.
+
+    Returns:
+        Tuple of (command, arg0, arg1, payload).
+
+    """
+    command, arg0, arg1, length, _, _ = ADB_HEADER.unpack(
+        await reader.readexactly(ADB_HEADER.size)
+    )
+    payload = await reader.readexactly(length) if length else b""
+    return command, arg0, arg1, payload
+
+
+class FrameoAdbKey:
+    """RSA key Home Assistant authenticates to devices with."""
+
+    def __init__(self, private_key: rsa.RSAPrivateKey) -> None:
+        """Initialize the key.
+
+        Args:
+            private_key: RSA private key.
+
+        """
+        self._private_key = private_key
+        self.public_key = _encode_public_key(private_key.public_key())
+
+    @classmethod
+    def generate(cls) -> FrameoAdbKey:
+        """Generate a new key. Slow, so run it in the executor."""
+        return cls(rsa.generate_private_key(public_exponent=65537, key_size=_KEY_BITS))
+
+    @classmethod
+    def from_pem(cls, pem: str) -> FrameoAdbKey:
+        """Load a key from PEM. Slow, so run it in the executor."""
+        private_key = serialization.load_pem_private_key(pem.encode(), password=None)
+        if not isinstance(private_key, rsa.RSAPrivateKey):
+            raise ValueError("ADB key is not an RSA key")
+        return cls(private_key)
+
+    def to_pem(self) -> str:
+        """Serialize the private key to PEM."""
+        return self._private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+
+    def sign(self, token: bytes) -> bytes:
+        """Sign an AUTH token, which adbd treats as a SHA-1 digest."""
+        return self._private_key.sign(
+            token, padding.PKCS1v15(), utils.Prehashed(hashes.SHA1())
+        )
+
+
+def _encode_public_key(public_key: rsa.RSAPublicKey) -> bytes:
+    """Encode a public key in the format adbd expects in an AUTH packet.
+
+    This is Android's RSAPublicKey struct (modulus size in words, -1/n[0]
+    mod 2^32, modulus, R^2 mod n and exponent, all little endian), base64
+    encoded and followed by a key name.
+    """
+    numbers = public_key.public_numbers()
+    modulus = numbers.n
+    n0inv = -pow(modulus, -1, 1 << 32) % (1 << 32)
+    rr = pow(2, 2 * _KEY_BITS, modulus)
+    data = (
+        struct.pack("<II", _KEY_WORDS, n0inv)
+        + modulus.to_bytes(_KEY_BITS // 8, "little")
+        + rr.to_bytes(_KEY_BITS // 8, "little")
+        + struct.pack("<I", numbers.e)
+    )
+    return base64.b64encode(data) + b" homeassistant@frameo\x00"
+
+
+async def _async_load_adb_key(hass: HomeAssistant) -> FrameoAdbKey:
+    """Load the stored ADB key, generating and storing one on first use."""
+    store: Store[dict[str, str]] = Store(hass, 1, f"{DOMAIN}.adb_key", private=True)
+    if data := await store.async_load():
+        return await hass.async_add_executor_job(FrameoAdbKey.from_pem, data["private_key"])
+    LOGGER.info("Generating ADB key for direct connections")
+    key = await hass.async_add_executor_job(FrameoAdbKey.generate)
+    await store.async_save({"private_key": key.to_pem()})
+    return key
+
+
+async def async_get_adb_key(hass: HomeAssistant) -> FrameoAdbKey:
+    """Get the integration-wide ADB key.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        The shared key.
+
+    """
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if "adb_key" not in domain_data:
+        # Store the task, so entries set up together share one key
+        domain_data["adb_key"] = hass.async_create_task(_async_load_adb_key(hass))
+    return await domain_data["adb_key"]
+
+
+class _AdbStream:
+    """One ADB service stream multiplexed over the connection."""
+
+    __slots__ = ("remote_id", "data", "closed", "acked", "received")
+
+    def __init__(self) -> None:
+        """Initialize the stream."""
+        self.remote_id = 0
+        self.data: list[bytes] = []
+        self.closed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        # Set when the device acknowledges the stream or a write to it
+        self.acked = asyncio.Event()
+        # Set when the device writes to the stream or it is closed
+        self.received = asyncio.Event()
+
+    def finish(self, error: Exception | None = None) -> None:
+        """Mark the stream closed, waking up anything waiting on it."""
+        if not self.closed.done():
+            if error is None:
+                self.closed.set_result(None)
+            else:
+                self.closed.set_exception(error)
+        self.acked.set()
+        self.received.set()
+
+
+class _AdbShellSession:
+    """A long-lived interactive shell on the device.
+
+    Opening a shell service makes adbd fork a new shell, which costs more
+    than short commands such as `input tap` take to run. The session keeps
+    one shell open and writes each command to it, reading the output back
+    between sentinel lines. It runs one command at a time.
+    """
+
+    def __init__(
+        self, writer: asyncio.StreamWriter, local_id: int, stream: _AdbStream
+    ) -> None:
+        """Initialize the session on an open shell stream.
+
+        Args:
+            writer: Connection to the device.
+            local_id: Local ID of the stream.
+            stream: Stream of the interactive shell.
+
+        """
+        self.local_id = local_id
+        self._writer = writer
+        self._stream = stream
+        self._buffer = bytearray()
+        self._sequence = 0
+        # An idle shell may fail with the connection while nothing awaits it
+        stream.closed.add_done_callback(lambda closed: closed.exception())
+
+    @property
+    def alive(self) -> bool:
+        """Return whether the shell is still open."""
+        return not self._stream.closed.done()
+
+    def close(self) -> None:
+        """Close the shell."""
+        if self.alive:
+            self._writer.write(
+                build_packet(A_CLSE, self.local_id, self._stream.remote_id)
+            )
+            self._stream.finish()
+
+    async def _async_read_until(self, marker: bytes) -> bytes:
+        """Read up to and including the line containing a marker.
+
+        Args:
+            marker: Bytes to look for.
+
+        Returns:
+            Everything before the marker.
+
+        Raises:
+            FrameoDeviceDisconnectedError: If the shell closes first.
+
+        """
+        stream = self._stream
+        while True:
+            if stream.data:
+                self._buffer += b"".join(stream.data)
+                stream.data.clear()
+            if (index := self._buffer.find(marker)) != -1 and (
+                end := self._buffer.find(b"\n", index)
+            ) != -1:
+                data = bytes(self._buffer[:index])
+                del self._buffer[: end + 1]
+                return data
+            if stream.closed.done():
+                # Raises if the connection dropped
+                stream.closed.result()
+                raise FrameoDeviceDisconnectedError("Shell session closed")
+            stream.received.clear()
+            await stream.received.wait()
+
+    async def async_run(self, command: str) -> bytes:
+        """Run a command in the shell and return its output.
+
+        Args:
+            command: Shell command, on one line.
+
+        Returns:
+            Output of the command.
+
+        Raises:
+            FrameoDeviceDisconnectedError: If the shell closed before the
+                command started.
+            FrameoApiError: If the shell closed while the command ran.
+
+        """
+        self._sequence += 1
+        sequence = self._sequence
+        # Commands run in a subshell, so `exit` or `cd` do not affect the
+        # session, and get no stdin, so they cannot swallow what follows
+        script = (
+            f'echo "{_SESSION_BEGIN}"{sequence}_; ( {command}\n) </dev/null 2>&1; '
+            f'echo "{_SESSION_END}"{sequence}_\n'
+        )
+        self._stream.acked.clear()
+        self._writer.write(
+            build_packet(A_WRTE, self.local_id, self._stream.remote_id, script.encode())
+        )
+        await self._writer.drain()
+        await self._stream.acked.wait()
+        await self._async_read_until(f"{_SESSION_BEGIN}{sequence}_".encode())
+        try:
+            output = await self._async_read_until(f"{_SESSION_END}{sequence}_".encode())
+        except FrameoDeviceDisconnectedError as err:
+            raise FrameoApiError("Shell session closed while running command") from err
+        # A terminal ends lines with CRLF
+        return output.replace(b"\r\n", b"\n")
+
+
+class FrameoAdbClient:
+    """Talks ADB straight to a network device, without the addon.
+
+    A single persistent connection is kept to the device. Shell commands
+    are written to a long-lived shell session on it, which is reopened when
+    it dies; while the session is busy, commands open a stream of their own,
+    so they still run concurrently. The client has the same interface as
+    FrameoAddonApiClient, so the coordinator can use either.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        port: int = DEFAULT_DEVICE_PORT,
+        key: FrameoAdbKey | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            hass: Home Assistant instance.
+            host: Device address.
+            port: Device ADB port.
+            key: Key to authenticate with.
+
+        """
+        self._hass = hass
+        self._key = key
+        self.host = host
+        self.port = port
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._streams: dict[int, _AdbStream] = {}
+        self._next_id = 1
+        self._connect_lock = asyncio.Lock()
+        self._session: _AdbShellSession | None = None
+        self._session_lock = asyncio.Lock()
+        # Load and health of the link as seen by this client
+        self.in_flight = 0
+        self.latency: float | None = None
+        self.healthy = True
+        self.requests = 0
+        self.new_connections = 0
+        self.shell_sessions = 0
+        self.profiler: FrameoProfiler | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the address of the device."""
+        return f"adb://{self.host}:{self.port}"
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the connection to the device is open."""
+        return self._writer is not None
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return how many commands reused the connection vs opened a new one."""
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.requests - self.new_connections,
+            "shell_sessions": self.shell_sessions,
+        }
+
+    def _record_latency(self, latency: float) -> None:
+        """Fold a command latency sample into the smoothed value."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += _LATENCY_SMOOTHING * (latency - self.latency)
+
+    async def async_connect(self, conn_details: dict[str, Any]) -> StatusResult:
+        """Connect to the device, unless already connected.
+
+        Args:
+            conn_details: Connection details; the client's own address is used.
+
+        Returns:
+            Connection result with status.
+
+        """
+        async with self._connect_lock:
+            if self.connected:
+                return StatusResult(status="already_connected")
+            try:
+                await self._async_open()
+            except (OSError, TimeoutError, asyncio.IncompleteReadError) as err:
+                self.healthy = False
+                return StatusResult(status="error", message=str(err) or repr(err))
+            except FrameoApiError as err:
+                return StatusResult(status="error", message=str(err))
+        return StatusResult(status="connected")
+
+    async def _async_open(self) -> None:
+        """Open the connection and authenticate."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), DEFAULT_TIMEOUT
+        )
+        self.healthy = True
+        self.new_connections += 1
+        try:
+            writer.write(build_packet(A_CNXN, ADB_VERSION, ADB_MAX_PAYLOAD, ADB_CONNECT_PAYLOAD))
+            signed = False
+            while True:
+                # Waiting for the user to allow debugging can take a while
+                command, arg0, _, payload = await asyncio.wait_for(
+                    async_read_packet(reader), CONNECT_TIMEOUT
+                )
+                if command == A_CNXN:
+                    break
+                if command != A_AUTH or arg0 != _AUTH_TOKEN or self._key is None:
+                    raise FrameoApiError("Device rejected the ADB connection")
+                if not signed:
+                    writer.write(build_packet(A_AUTH, _AUTH_SIGNATURE, 0, self._key.sign(payload)))
+                    signed = True
+                else:
+                    LOGGER.warning(
+                        "Allow USB debugging on %s to finish connecting", self.host
+                    )
+                    writer.write(build_packet(A_AUTH, _AUTH_RSAPUBLICKEY, 0, self._key.public_key))
+        except BaseException:
+            writer.close()
+            raise
+        LOGGER.info("Connected to %s over ADB", self.host)
+        self._writer = writer
+        self._reader_task = self._hass.async_create_background_task(
+            self._async_read_loop(reader, writer), f"{DOMAIN} adb {self.host}"
+        )
+
+    async def _async_read_loop(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Dispatch packets from the device to their streams."""
+        try:
+            while True:
+                command, arg0, arg1, payload = await async_read_packet(reader)
+                if (stream := self._streams.get(arg1)) is None:
+                    # A stream given up on before the device opened it
+                    if command in (A_OKAY, A_WRTE):
+                        writer.write(build_packet(A_CLSE, arg1, arg0))
+                    continue
+                if command == A_OKAY:
+                    stream.remote_id = arg0
+                    stream.acked.set()
+                elif command == A_WRTE:
+                    stream.data.append(payload)
+                    stream.received.set()
+                    writer.write(build_packet(A_OKAY, arg1, arg0))
+                elif command == A_CLSE:
+                    del self._streams[arg1]
+                    if stream.remote_id:
+                        writer.write(build_packet(A_CLSE, arg1, arg0))
+                    stream.finish()
+        except (OSError, asyncio.IncompleteReadError) as err:
+            LOGGER.warning("ADB connection to %s lost: %s", self.host, err)
+        finally:
+            self._close(writer)
+
+    def _close(self, writer: asyncio.StreamWriter) -> None:
+        """Close the connection and fail every open stream."""
+        writer.close()
+        if self._writer is writer:
+            self._writer = None
+        for stream in self._streams.values():
+            stream.finish(FrameoDeviceDisconnectedError("Device disconnected"))
+        self._streams.clear()
+        self._session = None
+
+    async def async_close(self) -> None:
+        """Close the connection to the device."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._close(self._writer)
+
+    async def _async_service(self, service: str) -> bytes:
+        """Open an ADB service stream and read it until the device closes it.
+
+        Args:
+            service: Service name, e.g. "shell:ls".
+
+        Returns:
+            Everything the service wrote.
+
+        Raises:
+            FrameoDeviceDisconnectedError: If the device is not connected.
+            FrameoApiError: If the service is refused or times out.
+
+        """
+        if (writer := self._writer) is None:
+            raise FrameoDeviceDisconnectedError("Device disconnected")
+        local_id, stream = self._add_stream()
+        profiler = self.profiler
+        timing = profiler.start(f"{service.partition(':')[0]}:") if profiler else None
+        self.in_flight += 1
+        self.requests += 1
+        start = time.monotonic()
+        try:
+            writer.write(build_packet(A_OPEN, local_id, 0, service.encode() + b"\x00"))
+            await writer.drain()
+            await asyncio.wait_for(stream.closed, DEFAULT_TIMEOUT)
+        except TimeoutError as err:
+            # Caught first, as TimeoutError is an OSError
+            raise FrameoApiError(f"ADB service '{service}' timed out") from err
+        except OSError as err:
+            self._close(writer)
+            raise FrameoDeviceDisconnectedError("Device disconnected") from err
+        finally:
+            self.in_flight -= 1
+            # Still registered if it timed out or was cancelled; close it on
+            # the device too, so its end of the stream does not leak
+            if (
+                self._streams.pop(local_id, None) is not None
+                and stream.remote_id
+                and self._writer is writer
+            ):
+                writer.write(build_packet(A_CLSE, local_id, stream.remote_id))
+        if not stream.remote_id:
+            raise FrameoApiError(f"Device refused ADB service '{service}'")
+        self._record_latency(time.monotonic() - start)
+        output = b"".join(stream.data)
+        if timing is not None:
+            timing.mark("parsed")
+            profiler.record(timing)
+        return output
+
+    def _add_stream(self) -> tuple[int, _AdbStream]:
+        """Register a new stream under the next local ID."""
+        local_id = self._next_id
+        self._next_id = self._next_id % 0xFFFFFFFF + 1
+        stream = self._streams[local_id] = _AdbStream()
+        return local_id, stream
+
+    async def _async_open_session(self) -> _AdbShellSession:
+        """Open an interactive shell session.
+
+        Returns:
+            The new session.
+
+        Raises:
+            FrameoDeviceDisconnectedError: If the device is not connected.
+            FrameoApiError: If the device refuses the shell or times out.
+
+        """
+        if (writer := self._writer) is None:
+            raise FrameoDeviceDisconnectedError("Device disconnected")
+        local_id, stream = self._add_stream()
+        opened = False
+        try:
+            writer.write(build_packet(A_OPEN, local_id, 0, b"shell:\x00"))
+            await writer.drain()
+            await asyncio.wait_for(stream.acked.wait(), DEFAULT_TIMEOUT)
+            opened = True
+        except TimeoutError as err:
+            raise FrameoApiError("Opening a shell session timed out") from err
+        except OSError as err:
+            self._close(writer)
+            raise FrameoDeviceDisconnectedError("Device disconnected") from err
+        finally:
+            # Given up on if it timed out or was cancelled; a stream left
+            # registered would fail unobserved when the connection drops
+            if (
+                not opened
+                and self._streams.pop(local_id, None) is not None
+                and stream.remote_id
+                and self._writer is writer
+            ):
+                writer.write(build_packet(A_CLSE, local_id, stream.remote_id))
+        if stream.closed.done():
+            # Raises if the connection dropped
+            stream.closed.result()
+            raise FrameoApiError("Device refused a shell session")
+        self.shell_sessions += 1
+        LOGGER.debug("Opened shell session to %s", self.host)
+        return _AdbShellSession(writer, local_id, stream)
+
+    async def _async_session_shell(self, session: _AdbShellSession, command: str) -> bytes:
+        """Run a command in the shell session, closing it if it gets stuck.
+
+        Args:
+            session: Session to run the command in.
+            command: Shell command, on one line.
+
+        Returns:
+            Output of the command.
+
+        """
+        profiler = self.profiler
+        timing = profiler.start("session") if profiler else None
+        self.in_flight += 1
+        self.requests += 1
+        start = time.monotonic()
+        try:
+            output = await asyncio.wait_for(session.async_run(command), DEFAULT_TIMEOUT)
+        except TimeoutError as err:
+            # The command may still be running; a new shell is opened next time
+            session.close()
+            self._streams.pop(session.local_id, None)
+            raise FrameoApiError(f"Shell command '{command}' timed out") from err
+        except OSError as err:
+            if self._writer is not None:
+                self._close(self._writer)
+            raise FrameoDeviceDisconnectedError("Device disconnected") from err
+        finally:
+            self.in_flight -= 1
+        self._record_latency(time.monotonic() - start)
+        if timing is not None:
+            timing.mark("parsed")
+            profiler.record(timing)
+        return output
+
+    async def async_shell(self, command: str) -> ShellResult:
+        """Execute a shell command on the device.
+
+        The command runs in the shell session unless it is busy, or the
+        command is too long or spans lines for a terminal. A session that
+        died is reopened, and a command is retried on a new session if the
+        old one closed before the command started.
+
+        Args:
+            command: Shell command to execute.
+
+        Returns:
+            Command result with the command's output.
+
+        """
+        if (
+            len(command) > _SESSION_MAX_COMMAND
+            or not command.isprintable()
+            or self._session_lock.locked()
+        ):
+            output = await self._async_service(f"shell:{command}")
+            return ShellResult(output=output.decode(errors="replace").strip())
+
+        async with self._session_lock:
+            for attempt in range(2):
+                if self._session is None or not self._session.alive:
+                    self._session = await self._async_open_session()
+                try:
+                    output = await self._async_session_shell(self._session, command)
+                    break
+                except FrameoDeviceDisconnectedError:
+                    # Closed before the command started; retry once on a new shell
+                    if attempt or self._writer is None:
+                        raise
+                    LOGGER.debug("Shell session to %s closed, reopening", self.host)
+        return ShellResult(output=output.decode(errors="replace").strip())
+
+    async def async_exec(self, command: str) -> bytes:
+        """Execute a command without a terminal, returning its raw output.
+
+        Unlike shell commands, the output is binary safe, as no terminal
+        rewrites line endings.
+
+        Args:
+            command: Shell command to execute.
+
+        Returns:
+            Everything the command wrote.
+
+        """
+        return await self._async_service(f"exec:{command}")
+
+    async def async_get_state(self) -> AddonState:
+        """Get the current device state (screen on/off, brightness).
+
+        Returns:
+            Device state.
+
+        """
+        output = (await self.async_shell(_STATE_COMMAND)).output
+        brightness = re.search(r"^(\d+)\s*$", output, re.MULTILINE)
+        return AddonState(
+            is_on="mWakefulness=Awake" in output,
+            brightness=int(brightness.group(1)) if brightness else 0,
+        )
+
+    async def async_enable_tcpip(self) -> StatusResult:
+        """Restart adbd listening on TCP, which it already is.
+
+        Returns:
+            Result of the operation.
+
+        """
+        output = await self._async_service(f"tcpip:{self.port}")
+        return StatusResult(status="success", message=output.decode(errors="replace").strip())
+
+    async def async_get_usb_devices(self) -> list[str]:
+        """Return no USB devices, as there is no addon to list them."""
+        return []
+
+    async def async_get_screen_resolution(self) -> tuple[int, int] | None:
+        """Get the device's current screen resolution accounting for rotation.
+
+        Returns:
+            Tuple of (width, height) or None if detection fails.
+
+        """
+        return await async_read_screen_resolution(self)
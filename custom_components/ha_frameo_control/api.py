@@ -1,14 +1,20 @@
 """API client for the Frameo Control Backend Add-on."""
 from __future__ import annotations
 
+import asyncio
 import re
+import time
+from dataclasses import dataclass
 from typing import Any, TYPE_CHECKING
 
 import httpx
 
 from homeassistant.helpers.httpx_client import get_async_client
+from homeassistant.util.json import json_loads
 
 from .const import (
+    ADDON_MAX_CONCURRENT_REQUESTS,
+    ADDON_PING_TIMEOUT,
     CONNECT_TIMEOUT,
     DEFAULT_ADDON_HOST,
     DEFAULT_ADDON_PORT,
@@ -20,6 +26,8 @@ from .const import (
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
+    from .profiling import FrameoProfiler
+
 
 class FrameoApiError(Exception):
     """Exception raised when API communication fails."""
@@ -29,6 +37,117 @@ class FrameoDeviceDisconnectedError(FrameoApiError):
     """Exception raised when the device is disconnected."""
 
 
+class FrameoSchemaError(FrameoApiError):
+    """Exception raised when an addon response does not match its schema."""
+
+
+# Valid connection statuses from the addon
+CONNECTED_STATUSES = frozenset({"connected", "already_connected"})
+
+_MISSING = object()
+
+
+def _expect_object(data: Any, endpoint: str) -> dict[str, Any]:
+    """Check that a response body is a JSON object."""
+    if not isinstance(data, dict):
+        raise FrameoSchemaError(
+            f"'{endpoint}': expected an object, got {type(data).__name__}"
+        )
+    return data
+
+
+def _field(
+    data: dict[str, Any],
+    key: str,
+    expected: type,
+    endpoint: str,
+    default: Any = _MISSING,
+) -> Any:
+    """Get a field from a response object, checking its type.
+
+    Raises:
+        FrameoSchemaError: If the field is missing without a default, or has
+            the wrong type.
+
+    """
+    if key not in data:
+        if default is _MISSING:
+            raise FrameoSchemaError(f"'{endpoint}': missing field '{key}'")
+        return default
+    value = data[key]
+    # bool is a subclass of int, but never a valid int field
+    if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+        raise FrameoSchemaError(
+            f"'{endpoint}': field '{key}' should be {expected.__name__}, got {value!r}"
+        )
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class AddonState:
+    """Response of the /state endpoint."""
+
+    is_on: bool
+    brightness: int
+
+    @classmethod
+    def decode(cls, data: Any) -> AddonState:
+        """Decode and validate a /state response."""
+        obj = _expect_object(data, "/state")
+        return cls(
+            is_on=_field(obj, "is_on", bool, "/state"),
+            brightness=_field(obj, "brightness", int, "/state", 0),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ShellResult:
+    """Response of the /shell endpoint."""
+
+    output: str
+    # Set when the device was offline and the command was queued instead
+    queued: bool = False
+
+    @classmethod
+    def decode(cls, data: Any) -> ShellResult:
+        """Decode and validate a /shell response."""
+        obj = _expect_object(data, "/shell")
+        return cls(output=_field(obj, "result", str, "/shell", ""))
+
+
+@dataclass(frozen=True, slots=True)
+class StatusResult:
+    """Response of the /connect and /tcpip endpoints."""
+
+    status: str
+    message: str | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the status reports a live connection."""
+        return self.status in CONNECTED_STATUSES
+
+    @classmethod
+    def decode(cls, data: Any, endpoint: str) -> StatusResult:
+        """Decode and validate a status response."""
+        obj = _expect_object(data, endpoint)
+        return cls(
+            status=_field(obj, "status", str, endpoint),
+            message=_field(obj, "message", str, endpoint, None),
+        )
+
+
+def _decode_serials(data: Any) -> list[str]:
+    """Decode and validate a /devices/usb response."""
+    if not isinstance(data, list) or not all(isinstance(item, str) for item in data):
+        raise FrameoSchemaError(f"'/devices/usb': expected a list of serials, got {data!r}")
+    return data
+
+
+# Weight of the newest sample in the smoothed request latency
+_LATENCY_SMOOTHING = 0.2
+
+
 class FrameoAddonApiClient:
     """API Client for the Frameo Add-on."""
 
@@ -37,6 +156,8 @@ class FrameoAddonApiClient:
         hass: HomeAssistant,
         host: str = DEFAULT_ADDON_HOST,
         port: int = DEFAULT_ADDON_PORT,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = ADDON_MAX_CONCURRENT_REQUESTS,
     ) -> None:
         """Initialize the API client.
 
@@ -44,10 +165,53 @@ class FrameoAddonApiClient:
             hass: Home Assistant instance.
             host: Addon host address.
             port: Addon port number.
+            http_client: Dedicated HTTP client, or None to use Home
+                Assistant's shared one.
+            max_concurrency: Maximum number of requests sent to the addon at
+                once; further requests wait their turn.
 
         """
-        self._client = get_async_client(hass, verify_ssl=False)
+        self._client = http_client or get_async_client(hass, verify_ssl=False)
         self._base_url = f"http://{host}:{port}"
+        self.host = host
+        self.port = port
+        self.max_concurrency = max_concurrency
+        self._limit = asyncio.Semaphore(max_concurrency)
+        # Load and health of the addon as seen by this client
+        self.in_flight = 0
+        self.waiting = 0
+        self.latency: float | None = None
+        self.healthy = True
+        self.requests = 0
+        self.new_connections = 0
+        # Set while a profile is being taken
+        self.profiler: FrameoProfiler | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the base URL of the addon."""
+        return self._base_url
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return how many requests reused a connection vs opened a new one."""
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.requests - self.new_connections,
+        }
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """Count new TCP connections from httpcore trace events."""
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+
+    def _record_latency(self, latency: float) -> None:
+        """Fold a request latency sample into the smoothed value."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += _LATENCY_SMOOTHING * (latency - self.latency)
 
     async def _request(
         self,
@@ -55,7 +219,7 @@ class FrameoAddonApiClient:
         endpoint: str,
         payload: dict[str, Any] | None = None,
         timeout: int = DEFAULT_TIMEOUT,
-    ) -> dict[str, Any] | list[str] | None:
+    ) -> Any:
         """Make an HTTP request to the addon API.
 
         Args:
@@ -65,22 +229,46 @@ class FrameoAddonApiClient:
             timeout: Request timeout in seconds.
 
         Returns:
-            JSON response data or None on error.
+            Decoded JSON response body.
 
         Raises:
             FrameoApiError: When the request fails.
 
         """
         url = f"{self._base_url}{endpoint}"
+        profiler = self.profiler
+        timing = profiler.start(endpoint, self._trace) if profiler else None
+        self.in_flight += 1
+        self.requests += 1
         try:
-            response = await self._client.request(
-                method,
-                url,
-                json=payload or {},
-                timeout=timeout,
-            )
+            self.waiting += 1
+            try:
+                await self._limit.acquire()
+            finally:
+                self.waiting -= 1
+            start = time.monotonic()
+            try:
+                response = await self._client.request(
+                    method,
+                    url,
+                    json=payload or {},
+                    timeout=timeout,
+                    extensions={"trace": timing.trace if timing else self._trace},
+                )
+            finally:
+                self._limit.release()
+            # Any response at all means the addon itself is up
+            self.healthy = True
+            self._record_latency(time.monotonic() - start)
             response.raise_for_status()
-            return response.json()
+            if timing is None:
+                return json_loads(response.content)
+            timing.mark("response")
+            timing.set_server_timing(response.headers.get("server-timing"))
+            data = json_loads(response.content)
+            timing.mark("parsed")
+            profiler.record(timing)
+            return data
         except httpx.HTTPStatusError as err:
             status = err.response.status_code
             if status == 503:
@@ -96,12 +284,40 @@ class FrameoAddonApiClient:
                 err.response.text,
             )
             raise FrameoApiError(f"HTTP {status}") from err
+        except ValueError as err:
+            LOGGER.error("Invalid JSON from '%s': %s", endpoint, err)
+            raise FrameoSchemaError(f"'{endpoint}': invalid JSON") from err
         except httpx.RequestError as err:
+            self.healthy = False
             LOGGER.error("Request error for '%s': %s", endpoint, err)
             raise FrameoApiError(str(err)) from err
         except Exception as err:
             LOGGER.exception("Unexpected error for '%s'", endpoint)
             raise FrameoApiError(str(err)) from err
+        finally:
+            self.in_flight -= 1
+
+    async def async_ping(self) -> bool:
+        """Check that the addon answers, without touching any device.
+
+        The addon has no health endpoint, so any HTTP response counts, even
+        an error status. The request skips the concurrency limit, so a busy
+        addon is not mistaken for a dead one.
+
+        Returns:
+            True if the addon answered within the ping timeout.
+
+        """
+        start = time.monotonic()
+        try:
+            await self._client.get(f"{self._base_url}/", timeout=ADDON_PING_TIMEOUT)
+        except httpx.RequestError as err:
+            LOGGER.debug("Addon %s did not answer: %s", self._base_url, err)
+            self.healthy = False
+            return False
+        self.healthy = True
+        self._record_latency(time.monotonic() - start)
+        return True
 
     async def async_get_usb_devices(self) -> list[str]:
         """Scan for available USB ADB devices.
@@ -110,10 +326,11 @@ class FrameoAddonApiClient:
             List of device serial numbers.
 
         """
-        result = await self._request("GET", "/devices/usb", timeout=USB_SCAN_TIMEOUT)
-        return result if isinstance(result, list) else []
+        return _decode_serials(
+            await self._request("GET", "/devices/usb", timeout=USB_SCAN_TIMEOUT)
+        )
 
-    async def async_connect(self, conn_details: dict[str, Any]) -> dict[str, Any]:
+    async def async_connect(self, conn_details: dict[str, Any]) -> StatusResult:
         """Establish connection to a Frameo device.
 
         Args:
@@ -126,37 +343,39 @@ class FrameoAddonApiClient:
         result = await self._request(
             "POST", "/connect", payload=conn_details, timeout=CONNECT_TIMEOUT
         )
-        return result if isinstance(result, dict) else {"status": "error"}
+        return StatusResult.decode(result, "/connect")
 
-    async def async_shell(self, command: str) -> dict[str, Any] | None:
+    async def async_shell(self, command: str) -> ShellResult:
         """Execute an ADB shell command on the device.
 
         Args:
             command: Shell command to execute.
 
         Returns:
-            Command result with 'result' key containing output.
+            Command result with the command's output.
 
         """
-        return await self._request("POST", "/shell", {"command": command})
+        return ShellResult.decode(
+            await self._request("POST", "/shell", {"command": command})
+        )
 
-    async def async_get_state(self) -> dict[str, Any] | None:
+    async def async_get_state(self) -> AddonState:
         """Get the current device state (screen on/off, brightness).
 
         Returns:
-            Device state dictionary.
+            Device state.
 
         """
-        return await self._request("POST", "/state")
+        return AddonState.decode(await self._request("POST", "/state"))
 
-    async def async_enable_tcpip(self) -> dict[str, Any] | None:
+    async def async_enable_tcpip(self) -> StatusResult:
         """Enable wireless ADB debugging on the device.
 
         Returns:
             Result of the operation.
 
         """
-        return await self._request("POST", "/tcpip")
+        return StatusResult.decode(await self._request("POST", "/tcpip"), "/tcpip")
 
     async def async_get_screen_resolution(self) -> tuple[int, int] | None:
         """Get the device's current screen resolution accounting for rotation.
@@ -165,39 +384,51 @@ class FrameoAddonApiClient:
             Tuple of (width, height) or None if detection fails.
 
         """
-        try:
-            # First try dumpsys display which shows actual viewport dimensions
-            result = await self._request(
-                "POST", "/shell", 
-                {"command": "dumpsys display | grep -E 'mViewport|mCurrentDisplayRect'"}
-            )
-            if result and "result" in result:
-                output = result["result"]
-                # Look for viewport or display rect like "deviceWidth=800, deviceHeight=1280"
-                # or "mCurrentDisplayRect=Rect(0, 0 - 800, 1280)"
-                match = re.search(r"deviceWidth=(\d+),\s*deviceHeight=(\d+)", output)
-                if match:
-                    width, height = int(match.group(1)), int(match.group(2))
-                    LOGGER.debug("Detected screen resolution from viewport: %dx%d", width, height)
-                    return (width, height)
-                
-                # Alternative pattern: mCurrentDisplayRect=Rect(0, 0 - 800, 1280)
-                match = re.search(r"Rect\(\d+,\s*\d+\s*-\s*(\d+),\s*(\d+)\)", output)
-                if match:
-                    width, height = int(match.group(1)), int(match.group(2))
-                    LOGGER.debug("Detected screen resolution from DisplayRect: %dx%d", width, height)
-                    return (width, height)
-
-            # Fallback to wm size
-            result = await self._request("POST", "/shell", {"command": "wm size"})
-            if result and "result" in result:
-                output = result["result"]
-                # wm size output can have multiple lines - take the last resolution
-                matches = re.findall(r"(\d+)x(\d+)", output)
-                if matches:
-                    width, height = int(matches[-1][0]), int(matches[-1][1])
-                    LOGGER.debug("Detected screen resolution from wm size: %dx%d", width, height)
-                    return (width, height)
-        except FrameoApiError:
-            LOGGER.warning("Failed to detect screen resolution")
-        return None
\ No newline at end of file
+        return await async_read_screen_resolution(self)
+
+
+async def async_read_screen_resolution(client: Any) -> tuple[int, int] | None:
+    """Get a device's current screen resolution accounting for rotation.
+
+    Args:
+        client: Client with an async_shell method for the device.
+
+    Returns:
+        Tuple of (width, height) or None if detection fails.
+
+    """
+    try:
+        # First try dumpsys display which shows actual viewport dimensions
+        result = await client.async_shell(
+            "dumpsys display | grep -E 'mViewport|mCurrentDisplayRect'"
+        )
+        if result.output:
+            output = result.output
+            # Look for viewport or display rect like "deviceWidth=800, deviceHeight=1280"
+            # or "mCurrentDisplayRect=Rect(0, 0 - 800, 1280)"
+            match = re.search(r"deviceWidth=(\d+),\s*deviceHeight=(\d+)", output)
+            if match:
+                width, height = int(match.group(1)), int(match.group(2))
+                LOGGER.debug("Detected screen resolution from viewport: %dx%d", width, height)
+                return (width, height)
+            
+            # Alternative pattern: mCurrentDisplayRect=Rect(0, 0 - 800, 1280)
+            match = re.search(r"Rect\(\d+,\s*\d+\s*-\s*(\d+),\s*(\d+)\)", output)
+            if match:
+                width, height = int(match.group(1)), int(match.group(2))
+                LOGGER.debug("Detected screen resolution from DisplayRect: %dx%d", width, height)
+                return (width, height)
+
+        # Fallback to wm size
+        result = await client.async_shell("wm size")
+        if result.output:
+            output = result.output
+            # wm size output can have multiple lines - take the last resolution
+            matches = re.findall(r"(\d+)x(\d+)", output)
+            if matches:
+                width, height = int(matches[-1][0]), int(matches[-1][1])
+                LOGGER.debug("Detected screen resolution from wm size: %dx%d", width, height)
+                return (width, height)
+    except FrameoApiError:
+        LOGGER.warning("Failed to detect screen resolution")
+    return None
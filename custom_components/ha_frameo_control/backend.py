@@ -0,0 +1,214 @@
+"""Placement of Frameo devices across several addon backends."""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from homeassistant.util.ssl import create_no_verify_ssl_context
+
+from .api import FrameoAddonApiClient, FrameoApiError
+from .const import (
+    ADDON_KEEPALIVE_EXPIRY,
+    ADDON_MAX_CONNECTIONS,
+    ADDON_MAX_KEEPALIVE_CONNECTIONS,
+    CONF_CONN_TYPE,
+    CONF_SERIAL,
+    DOMAIN,
+    LOGGER,
+    ConnectionType,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Latency assumed for a backend before any request has been timed
+_DEFAULT_LATENCY = 0.1
+
+
+class FrameoBackendPool:
+    """Tracks every addon backend known to the integration.
+
+    Each backend gets one client with its own HTTP connection pool, shared by
+    all config entries that use it, so its in-flight count and latency reflect
+    the backend's total load. The client also caps how many requests are sent
+    to the backend at once, whichever device they are for. Clients are
+    reference-counted by the devices placed on them and closed when the last
+    one is released.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the backend pool.
+
+        Args:
+            hass: Home Assistant instance.
+
+        """
+        self._hass = hass
+        self._clients: dict[str, FrameoAddonApiClient] = {}
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+        self._devices: dict[str, int] = {}
+
+    def get_client(self, host: str, port: int) -> FrameoAddonApiClient:
+        """Get the shared client for an addon, creating it if needed.
+
+        Args:
+            host: Addon host address.
+            port: Addon port number.
+
+        Returns:
+            API client for the addon.
+
+        """
+        url = f"http://{host}:{port}"
+        if url not in self._clients:
+            # Built here rather than with Home Assistant's helper, which sets
+            # its own limits and turns aclose() into a warning, so the pool
+            # could neither be sized nor closed with its last device
+            self._http_clients[url] = httpx.AsyncClient(
+                verify=create_no_verify_ssl_context(),
+                limits=httpx.Limits(
+                    max_connections=ADDON_MAX_CONNECTIONS,
+                    max_keepalive_connections=ADDON_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=ADDON_KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._clients[url] = FrameoAddonApiClient(
+                self._hass, host=host, port=port, http_client=self._http_clients[url]
+            )
+        return self._clients[url]
+
+    def backend_stats(self, client: FrameoAddonApiClient) -> dict[str, Any]:
+        """Return the shared state of a backend.
+
+        Args:
+            client: Client of the backend.
+
+        Returns:
+            Devices placed on the backend, its health and its request load.
+
+        """
+        return {
+            "devices": self._devices.get(client.base_url, 0),
+            "healthy": client.healthy,
+            "in_flight": client.in_flight,
+            "waiting": client.waiting,
+            "max_concurrency": client.max_concurrency,
+            "latency": client.latency,
+        }
+
+    def acquire(self, client: FrameoAddonApiClient) -> None:
+        """Record that a device is placed on a backend.
+
+        Args:
+            client: Backend the device is placed on.
+
+        """
+        self._devices[client.base_url] = self._devices.get(client.base_url, 0) + 1
+
+    async def async_release(self, client: FrameoAddonApiClient) -> None:
+        """Record that a device no longer uses a backend.
+
+        Args:
+            client: Backend the device was placed on.
+
+        """
+        if self._devices.get(client.base_url):
+            self._devices[client.base_url] -= 1
+        await self._async_close_unused()
+
+    async def _async_close_unused(self) -> None:
+        """Close the clients of backends no device is placed on."""
+        for url, client in list(self._clients.items()):
+            if self._devices.get(url) or client.in_flight:
+                continue
+            LOGGER.debug("Closing HTTP client for addon backend %s", url)
+            del self._clients[url]
+            self._devices.pop(url, None)
+            await self._http_clients.pop(url).aclose()
+
+    def _score(self, client: FrameoAddonApiClient) -> float:
+        """Estimate how long a new request would wait on a backend."""
+        load = client.in_flight + self._devices.get(client.base_url, 0) + 1
+        return load * (client.latency or _DEFAULT_LATENCY)
+
+    async def _async_can_serve(
+        self, client: FrameoAddonApiClient, conn_details: dict[str, Any]
+    ) -> bool:
+        """Check that a backend is up and can reach the device.
+
+        Every backend is pinged first, which is cheap and bounded by a short
+        timeout. Network devices can be reached from any backend that
+        answers. USB devices are only reachable from the backend they are
+        plugged into, so only for them is the slower USB scan run to find
+        the serial.
+        """
+        if not await client.async_ping():
+            return False
+        if conn_details.get(CONF_CONN_TYPE) != ConnectionType.USB:
+            return True
+        try:
+            serials = await client.async_get_usb_devices()
+        except FrameoApiError:
+            return False
+        return conn_details.get(CONF_SERIAL) in serials
+
+    async def async_place(
+        self,
+        conn_details: dict[str, Any],
+        addresses: list[tuple[str, int]],
+        current: FrameoAddonApiClient | None = None,
+    ) -> FrameoAddonApiClient | None:
+        """Pick the least-loaded backend that can serve a device.
+
+        With a single address no probing is done. The chosen backend is
+        acquired for the device and the current one, if different, released.
+
+        Args:
+            conn_details: Connection details of the device.
+            addresses: Candidate backends as (host, port) pairs.
+            current: Backend the device is currently placed on, if any.
+
+        Returns:
+            Chosen backend client, or None if no backend can serve the device.
+
+        """
+        clients = [self.get_client(host, port) for host, port in addresses]
+        if len(clients) == 1:
+            candidates = clients
+        else:
+            usable = await asyncio.gather(
+                *(self._async_can_serve(client, conn_details) for client in clients)
+            )
+            candidates = [client for client, ok in zip(clients, usable) if ok]
+
+        chosen = min(candidates, key=self._score) if candidates else None
+        if chosen is not None and chosen is not current:
+            self.acquire(chosen)
+            if current is not None:
+                await self.async_release(current)
+            LOGGER.info(
+                "Placed device on addon backend %s (%d device(s))",
+                chosen.base_url,
+                self._devices[chosen.base_url],
+            )
+        # Drop clients that were only created to probe unchosen backends
+        await self._async_close_unused()
+        return chosen
+
+
+def get_backend_pool(hass: HomeAssistant) -> FrameoBackendPool:
+    """Get the integration-wide backend pool.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        The shared backend pool.
+
+    """
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if "backends" not in domain_data:
+        domain_data["backends"] = FrameoBackendPool(hass)
+    return domain_data["backends"]
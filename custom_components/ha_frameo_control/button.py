@@ -12,11 +12,13 @@ from homeassistant.components.button import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
-from . import FrameoConfigEntry
+from . import FrameoConfigEntry, async_move_entry_to_network
 from .api import FrameoApiError
-from .const import DOMAIN, LOGGER
+from .const import CONF_GESTURES, DOMAIN, LOGGER
 from .coordinator import FrameoDataUpdateCoordinator
+from .gestures import FrameoGesture, FrameoGestureTable, GestureKind, parse_gesture
 
 
 class ButtonAction(StrEnum):
@@ -42,43 +44,37 @@ class FrameoButtonEntityDescription(ButtonEntityDescription):
 
     command: str | None = None
     action: ButtonAction = ButtonAction.SHELL
-    gesture: GestureType | None = None
+    gesture: str | None = None
+    # App launchers: the app's package and the arguments to `am start`
+    package: str | None = None
+    intent: str | None = None
 
 
-def _build_gesture_command(
-    gesture: GestureType, screen_width: int, screen_height: int
-) -> str:
-    """Build an ADB input command for a gesture based on screen dimensions.
-
-    Args:
-        gesture: Type of gesture to perform.
-        screen_width: Screen width in pixels.
-        screen_height: Screen height in pixels.
-
-    Returns:
-        ADB shell command string.
-
-    """
-    # Swipe coordinates
-    swipe_y = screen_height // 2 + screen_height // 8  # Slightly below center
-    swipe_start_x = int(screen_width * 0.625)
-    swipe_end_x = int(screen_width * 0.078)
-
-    # Tap coordinates (screen divided into thirds)
-    tap_y = screen_height // 2
-    left_third_x = screen_width // 6
-    center_x = screen_width // 2
-    right_third_x = int(screen_width * 5 / 6)
-
-    commands = {
-        GestureType.SWIPE_LEFT: f"input swipe {swipe_start_x} {swipe_y} {swipe_end_x} {swipe_y}",
-        GestureType.SWIPE_RIGHT: f"input swipe {swipe_end_x} {swipe_y} {swipe_start_x} {swipe_y}",
-        GestureType.TAP_LEFT: f"input tap {left_third_x} {tap_y}",
-        GestureType.TAP_CENTER: f"input tap {center_x} {tap_y}",
-        GestureType.TAP_RIGHT: f"input tap {right_third_x} {tap_y}",
-    }
+# Built-in gestures, as fractions of the screen size
+BUILTIN_GESTURES: dict[str, FrameoGesture] = {
+    GestureType.SWIPE_LEFT: FrameoGesture(
+        name="Swipe left", kind=GestureKind.SWIPE, x=0.625, y=0.625, x2=0.078, y2=0.625
+    ),
+    GestureType.SWIPE_RIGHT: FrameoGesture(
+        name="Swipe right", kind=GestureKind.SWIPE, x=0.078, y=0.625, x2=0.625, y2=0.625
+    ),
+    GestureType.TAP_LEFT: FrameoGesture(
+        name="Tap left", kind=GestureKind.TAP, x=1 / 6, y=0.5
+    ),
+    GestureType.TAP_CENTER: FrameoGesture(
+        name="Tap center", kind=GestureKind.TAP, x=0.5, y=0.5
+    ),
+    GestureType.TAP_RIGHT: FrameoGesture(
+        name="Tap right", kind=GestureKind.TAP, x=5 / 6, y=0.5
+    ),
+}
 
-    return commands[gesture]
+# Icons of buttons for user-defined gestures
+_GESTURE_ICONS = {
+    GestureKind.TAP: "mdi:gesture-tap",
+    GestureKind.SWIPE: "mdi:gesture-swipe",
+    GestureKind.LONG_PRESS: "mdi:gesture-tap-hold",
+}
 
 
 # --- Button Definitions ---
@@ -121,19 +117,22 @@ BUTTON_DESCRIPTIONS: tuple[FrameoButtonEntityDescription, ...] = (
         key="start_frameo",
         name="Start Frameo App",
         icon="mdi:image-multiple",
-        command="am start net.frameo.frame/.MainActivity",
+        package="net.frameo.frame",
+        intent="net.frameo.frame/.MainActivity",
     ),
     FrameoButtonEntityDescription(
         key="start_immich",
         name="Start ImmichFrame",
         icon="mdi:image-album",
-        command="am start com.immichframe.immichframe/.MainActivity",
+        package="com.immichframe.immichframe",
+        intent="com.immichframe.immichframe/.MainActivity",
     ),
     FrameoButtonEntityDescription(
         key="open_settings",
         name="Open Settings",
         icon="mdi:cog",
-        command="am start -a android.settings.SETTINGS",
+        package="com.android.settings",
+        intent="-a android.settings.SETTINGS",
     ),
     # Utility Buttons
     FrameoButtonEntityDescription(
@@ -153,6 +152,8 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Frameo button platform.
 
+    A button is added for every user-defined gesture in the options.
+
     Args:
         hass: Home Assistant instance.
         entry: Config entry for this integration.
@@ -160,9 +161,29 @@ async def async_setup_entry(
 
     """
     coordinator: FrameoDataUpdateCoordinator = entry.runtime_data
+
+    gestures = dict(BUILTIN_GESTURES)
+    descriptions = list(BUTTON_DESCRIPTIONS)
+    for definition in entry.options.get(CONF_GESTURES, []):
+        gesture = parse_gesture(definition)
+        key = f"gesture_{slugify(gesture.name)}"
+        if key in gestures:
+            LOGGER.warning("Ignoring duplicate gesture '%s'", gesture.name)
+            continue
+        gestures[key] = gesture
+        descriptions.append(
+            FrameoButtonEntityDescription(
+                key=key,
+                name=gesture.name,
+                icon=_GESTURE_ICONS[gesture.kind],
+                gesture=key,
+            )
+        )
+
+    table = FrameoGestureTable(gestures)
     async_add_entities(
-        FrameoButton(coordinator, entry, description)
-        for description in BUTTON_DESCRIPTIONS
+        FrameoButton(coordinator, entry, description, table)
+        for description in descriptions
     )
 
 
@@ -177,6 +198,7 @@ class FrameoButton(CoordinatorEntity[FrameoDataUpdateCoordinator], ButtonEntity)
         coordinator: FrameoDataUpdateCoordinator,
         entry: FrameoConfigEntry,
         description: FrameoButtonEntityDescription,
+        gestures: FrameoGestureTable,
     ) -> None:
         """Initialize the button entity.
 
@@ -184,11 +206,13 @@ class FrameoButton(CoordinatorEntity[FrameoDataUpdateCoordinator], ButtonEntity)
             coordinator: Data update coordinator.
             entry: Config entry for this integration.
             description: Entity description.
+            gestures: Gesture commands shared by the device's buttons.
 
         """
         super().__init__(coordinator)
         self.entity_description = description
-        self._client = coordinator.client
+        self._entry = entry
+        self._gestures = gestures
         self._attr_unique_id = f"{entry.entry_id}_{description.key}"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.entry_id)},
@@ -196,10 +220,10 @@ class FrameoButton(CoordinatorEntity[FrameoDataUpdateCoordinator], ButtonEntity)
         }
 
     async def _async_get_command(self) -> str | None:
-        """Get the command for this button, calculating gestures dynamically.
+        """Get the command for this button, scaling gestures to the screen.
 
-        For gesture-based commands, this refreshes the screen resolution first
-        to handle orientation changes.
+        Gestures use the screen geometry the coordinator last detected, which
+        it checks again only when the geometry may have changed.
 
         Returns:
             ADB shell command or None.
@@ -208,9 +232,8 @@ class FrameoButton(CoordinatorEntity[FrameoDataUpdateCoordinator], ButtonEntity)
         description = self.entity_description
 
         if description.gesture:
-            # Refresh screen resolution to handle orientation changes
-            width, height = await self.coordinator.async_refresh_screen_resolution()
-            return _build_gesture_command(description.gesture, width, height)
+            width, height = await self.coordinator.async_get_screen_resolution()
+            return self._gestures.command(description.gesture, width, height)
 
         return description.command
 
@@ -221,11 +244,19 @@ class FrameoButton(CoordinatorEntity[FrameoDataUpdateCoordinator], ButtonEntity)
 
         try:
             if description.action == ButtonAction.TCPIP:
-                await self._client.async_enable_tcpip()
+                conn_details = await self.coordinator.async_upgrade_to_network()
+                async_move_entry_to_network(self.hass, self._entry, conn_details)
+            elif description.package and description.intent:
+                await self.coordinator.async_launch_app(
+                    description.package, description.intent
+                )
             else:
                 command = await self._async_get_command()
                 if command:
                     LOGGER.info("Button '%s' executing command: %s", description.name, command)
                     await self.coordinator.async_execute_command(command)
         except FrameoApiError as err:
-            LOGGER.error("Button '%s' failed: %s", description.name, err)
\ No newline at end of file
+            LOGGER.error("Button '%s' failed: %s", description.name, err)
+            if description.gesture:
+                # Check the geometry again in case the screen was rotated
+                self.coordinator.async_invalidate_screen_resolution()
\ No newline at end of file
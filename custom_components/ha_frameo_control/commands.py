@@ -0,0 +1,347 @@
+"""Classification of ADB shell commands for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import re
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .const import (
+    ADB_CMD_POWER_OFF_GUARDED,
+    ADB_CMD_POWER_ON_GUARDED,
+    COMMAND_CACHE_SIZE,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    HEDGE_WINDOW,
+    LOGGER,
+    OFFLINE_QUEUE_SIZE,
+)
+
+if TYPE_CHECKING:
+    from .api import ShellResult
+
+
+class CommandKind(StrEnum):
+    """How safe a command is to send more than once."""
+
+    READ = "read"  # No side effects
+    WRITE = "write"  # Side effects, but repeating gives the same end state
+    ACTION = "action"  # Repeating changes the outcome (e.g. a power key toggle)
+
+
+# Number of times a command is retried after a reconnect, per kind
+COMMAND_RETRIES: dict[CommandKind, int] = {
+    CommandKind.READ: 2,
+    CommandKind.WRITE: 1,
+    CommandKind.ACTION: 0,
+}
+
+# Shell syntax that can chain arbitrary commands or redirect output. A line
+# break separates commands just like a semicolon
+_UNSAFE_SYNTAX_RE = re.compile(r"[;&>`\n\r]|\$\(")
+
+# Arguments that make otherwise read-only commands change the device, such
+# as `dumpsys battery set level 5` or `logcat -d -c`
+_DUMPSYS_WRITE_ARGS = r"(?:set|reset|unplug|enable|disable|step|whitelist|force-\S*)"
+_LOGCAT_WRITE_ARGS = r"(?:-[cGP]\S*|--(?:clear|buffer-size|prune)\S*)"
+
+_READ_RE = re.compile(
+    r"^(?:getprop(?:\s+\S+)?|cat\s.*|ls\b.*|echo\b.*|df\b.*"
+    rf"|dumpsys(?:\s+(?!{_DUMPSYS_WRITE_ARGS}(?:\s|$))\S+)*"
+    # Only printing the time, never setting it
+    r"|date(?:\s+-u)?(?:\s+(?:'\+[^']*'|\"\+[^\"]*\"|\+(?:'[^']*'|\"[^\"]*\"|[^\s'\"])+))?"
+    rf"|logcat -d(?:\s+(?!{_LOGCAT_WRITE_ARGS}(?:\s|$))\S+)*"
+    r"|uptime|ps\b.*|pm (?:list|path)\b.*|wm (?:size|density)|settings (?:get|list)\b.*"
+    r"|grep\b.*|head\b.*|tail\b.*|id|uname\b.*)$"
+)
+
+_WRITE_RE = re.compile(
+    r"^(?:settings (?:put|delete)\b.*|setprop\b.*|wm (?:size|density) \S+"
+    r"|svc \w+ \w+.*|am force-stop\b.*|pm (?:enable|disable)\b.*"
+    r"|input keyevent (?:223|224|KEYCODE_SLEEP|KEYCODE_WAKEUP))$"
+)
+
+
+# Commands that can change the screen geometry gestures are scaled to
+_GEOMETRY_RE = re.compile(r"\b(?:user_rotation|accelerometer_rotation|wm size)\b")
+
+
+def changes_geometry(command: str) -> bool:
+    """Return whether a command may rotate or resize the screen.
+
+    Args:
+        command: ADB shell command that is not read-only.
+
+    Returns:
+        True if the screen geometry should be detected again.
+
+    """
+    return bool(_GEOMETRY_RE.search(command))
+
+
+def classify_command(command: str) -> CommandKind:
+    """Classify a shell command by how safe it is to repeat.
+
+    Pipelines are read-only only if every stage is. Anything not recognised
+    is treated as an action, so it is never sent twice.
+
+    Args:
+        command: ADB shell command.
+
+    Returns:
+        Kind of the command.
+
+    """
+    command = command.strip()
+    if _UNSAFE_SYNTAX_RE.search(command):
+        return CommandKind.ACTION
+    stages = [stage.strip() for stage in command.split("|")]
+    if all(_READ_RE.match(stage) for stage in stages):
+        return CommandKind.READ
+    if len(stages) == 1 and _WRITE_RE.match(command):
+        return CommandKind.WRITE
+    return CommandKind.ACTION
+
+
+class LatencyWindow:
+    """Keeps recent read latencies to decide when to hedge a request."""
+
+    def __init__(self) -> None:
+        """Initialize an empty window."""
+        self._samples: deque[float] = deque(maxlen=HEDGE_WINDOW)
+
+    def add(self, latency: float) -> None:
+        """Record a latency sample.
+
+        Args:
+            latency: Request latency in seconds.
+
+        """
+        self._samples.append(latency)
+
+    def hedge_delay(self) -> float | None:
+        """Return how long to wait before sending a hedged request.
+
+        Returns:
+            Delay in seconds, or None until enough samples are collected.
+
+        """
+        if len(self._samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, len(ordered) * HEDGE_PERCENTILE // 100)
+        return max(ordered[index], HEDGE_MIN_DELAY)
+
+
+def normalize_command(command: str) -> str:
+    """Collapse whitespace so equivalent commands share a cache key.
+
+    Args:
+        command: ADB shell command.
+
+    Returns:
+        Normalized command.
+
+    """
+    return " ".join(command.split())
+
+
+class CommandCache:
+    """Size-bounded LRU of recent read-only command results for one device."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: OrderedDict[str, tuple[float, ShellResult]] = OrderedDict()
+
+    def get(self, command: str, ttl: float) -> ShellResult | None:
+        """Get a cached result if it is no older than the given TTL.
+
+        Args:
+            command: ADB shell command.
+            ttl: Maximum acceptable age in seconds.
+
+        Returns:
+            Cached result, or None on a miss.
+
+        """
+        key = normalize_command(command)
+        if (entry := self._entries.get(key)) is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > ttl:
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, command: str, result: ShellResult) -> None:
+        """Store a result, evicting the least recently used one if full.
+
+        Args:
+            command: ADB shell command.
+            result: Command result.
+
+        """
+        key = normalize_command(command)
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > COMMAND_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+
+
+# Intents of queued commands. A later command with the same intent replaces an
+# earlier one, except power key toggles, which cancel out in pairs
+_INTENT_RES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"^settings (?:put|delete) (\w+) (\S+)"), "settings {0} {1}"),
+    (re.compile(r"^setprop (\S+)"), "setprop {0}"),
+    (re.compile(r"^wm (size|density) \S+"), "wm {0}"),
+    (re.compile(r"^svc (\w+) "), "svc {0}"),
+    (re.compile(r"^input keyevent (?:26|KEYCODE_POWER)$"), "power_toggle"),
+    (re.compile(r"^input keyevent (?:223|224|KEYCODE_SLEEP|KEYCODE_WAKEUP)$"), "power"),
+    # Power key guarded by a check of the screen state on the device
+    (
+        re.compile(
+            "^(?:"
+            + "|".join(
+                re.escape(normalize_command(command))
+                for command in (ADB_CMD_POWER_ON_GUARDED, ADB_CMD_POWER_OFF_GUARDED)
+            )
+            + ")$"
+        ),
+        "power",
+    ),
+)
+_TOGGLE_INTENTS = frozenset({"power_toggle"})
+# Intents that also drop queued commands of other intents
+_SUPERSEDES: dict[str, frozenset[str]] = {"power": frozenset({"power_toggle"})}
+
+
+def command_intent(command: str) -> str | None:
+    """Return what a command changes on the device, if it can be merged.
+
+    Args:
+        command: ADB shell command.
+
+    Returns:
+        Intent key, or None if the command must be kept as is.
+
+    """
+    command = normalize_command(command)
+    for pattern, intent in _INTENT_RES:
+        if match := pattern.match(command):
+            return intent.format(*match.groups())
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class QueuedCommand:
+    """A command held while the device is offline."""
+
+    command: str
+    kind: CommandKind
+    intent: str | None
+    expires: float
+
+
+class OfflineCommandQueue:
+    """Commands held for one device while it is offline.
+
+    Commands with the same intent are merged as they are added, so a burst
+    of brightness changes leaves only the last one and two power key
+    toggles leave none. Commands expire after the TTL; those still valid are
+    sent in order when the device reconnects.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize an empty queue.
+
+        Args:
+            ttl: Seconds a queued command stays valid.
+
+        """
+        self.ttl = ttl
+        self._entries: list[QueuedCommand] = []
+
+    def __len__(self) -> int:
+        """Return the number of queued commands, including expired ones."""
+        return len(self._entries)
+
+    def add(self, command: str, kind: CommandKind) -> None:
+        """Queue a command, merging it with earlier ones of the same intent.
+
+        Args:
+            command: ADB shell command.
+            kind: Kind of the command.
+
+        """
+        self._insert(
+            QueuedCommand(
+                command=command,
+                kind=kind,
+                intent=command_intent(command),
+                expires=time.monotonic() + self.ttl,
+            )
+        )
+
+    def _insert(self, entry: QueuedCommand) -> None:
+        """Append an entry, applying the merge rules."""
+        if (intent := entry.intent) is not None:
+            replaced = {intent, *_SUPERSEDES.get(intent, ())}
+            earlier = [queued for queued in self._entries if queued.intent in replaced]
+            self._entries = [
+                queued for queued in self._entries if queued.intent not in replaced
+            ]
+            if intent in _TOGGLE_INTENTS and earlier:
+                # Toggling twice is the same as not toggling
+                return
+        self._entries.append(entry)
+        if len(self._entries) > OFFLINE_QUEUE_SIZE:
+            dropped = self._entries.pop(0)
+            LOGGER.warning("Offline queue is full, dropping: %s", dropped.command)
+
+    def prune(self) -> int:
+        """Drop expired commands.
+
+        Returns:
+            Number of commands still queued.
+
+        """
+        now = time.monotonic()
+        self._entries = [entry for entry in self._entries if entry.expires > now]
+        return len(self._entries)
+
+    def pop_all(self) -> list[QueuedCommand]:
+        """Remove and return every queued command that has not expired.
+
+        Returns:
+            Commands in the order they should run.
+
+        """
+        now = time.monotonic()
+        entries, self._entries = self._entries, []
+        valid = [entry for entry in entries if entry.expires > now]
+        if len(valid) < len(entries):
+            LOGGER.info(
+                "Dropping %d queued command(s) that expired while offline",
+                len(entries) - len(valid),
+            )
+        return valid
+
+    def restore(self, entries: Iterable[QueuedCommand]) -> None:
+        """Put back commands that could not be sent, ahead of newer ones.
+
+        Args:
+            entries: Commands returned by pop_all().
+
+        """
+        newer, self._entries = self._entries, []
+        for entry in (*entries, *newer):
+            self._insert(entry)
+
@@ -1,6 +1,8 @@
 """Config flow for HA Frameo Control."""
 from __future__ import annotations
 
+import asyncio
+import re
 from typing import Any
 
 import voluptuous as vol
@@ -10,34 +12,58 @@ from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.selector import (
+    BooleanSelector,
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
     TextSelector,
+    TextSelectorConfig,
 )
 
 from .api import FrameoAddonApiClient, FrameoApiError
+from .discovery import get_usb_discovery
+from .gestures import parse_gesture
+from .scan import async_scan_for_devices
 from .const import (
+    CONF_ADDON_BACKENDS,
     CONF_ADDON_HOST,
     CONF_ADDON_PORT,
     CONF_CONN_TYPE,
+    CONF_DIRECT_ADB,
+    CONF_FALLBACK_HOST,
+    CONF_FALLBACK_SERIAL,
+    CONF_GESTURES,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_OFFLINE_QUEUE_TTL,
     CONF_SCREEN_HEIGHT,
     CONF_SCREEN_WIDTH,
     CONF_SERIAL,
     DEFAULT_ADDON_HOST,
     DEFAULT_ADDON_PORT,
     DEFAULT_DEVICE_PORT,
+    DEFAULT_HEARTBEAT_INTERVAL,
     DEFAULT_SCREEN_HEIGHT,
     DEFAULT_SCREEN_WIDTH,
     DOMAIN,
     LOGGER,
+    MAX_HEARTBEAT_INTERVAL,
+    MAX_OFFLINE_QUEUE_TTL,
     ConnectionType,
 )
 
-# Valid connection statuses from the addon
-_CONNECTED_STATUSES = frozenset({"connected", "already_connected"})
+# Additional addon backend address, "host" or "host:port"
+_BACKEND_ADDRESS_RE = re.compile(r"^[^\s:]+(:\d{1,5})?$")
+
+
+def _is_valid_gesture(definition: str) -> bool:
+    """Check that a user-defined gesture can be parsed."""
+    try:
+        parse_gesture(definition)
+    except ValueError:
+        return False
+    return True
 
 
 class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -49,9 +75,13 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._api_client: FrameoAddonApiClient | None = None
         self._discovered_serials: list[str] = []
+        self._scanned_hosts: list[str] = []
         self._conn_details: dict[str, Any] = {}
         self._addon_host: str = DEFAULT_ADDON_HOST
         self._addon_port: int = DEFAULT_ADDON_PORT
+        self._connect_task: asyncio.Task[bool] | None = None
+        self._connect_title = ""
+        self._connect_error: str | None = None
 
     def _get_api_client(self) -> FrameoAddonApiClient:
         """Get or create the API client with current addon settings."""
@@ -76,11 +106,62 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """
         try:
             result = await self._get_api_client().async_connect(self._conn_details)
-            return result.get("status") in _CONNECTED_STATUSES
+            return result.connected
         except FrameoApiError as err:
             LOGGER.error("Connection failed: %s", err)
             return False
 
+    def _pop_connect_errors(self) -> dict[str, str]:
+        """Return the error of a failed connection attempt, clearing it."""
+        error, self._connect_error = self._connect_error, None
+        return {"base": error} if error else {}
+
+    async def async_step_connect(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Connect to the device in the background, showing progress.
+
+        The addon answers as soon as the device allows Home Assistant to
+        connect, so the flow moves on the moment the user taps Allow. Closing
+        the dialog cancels the attempt.
+        """
+        if self._connect_task is None:
+            self._connect_task = self.hass.async_create_task(
+                self._async_try_connect(), f"{DOMAIN} config flow connect"
+            )
+        if not self._connect_task.done():
+            usb = self._conn_details[CONF_CONN_TYPE] == ConnectionType.USB
+            return self.async_show_progress(
+                step_id="connect",
+                progress_action="usb_authorization" if usb else "connect",
+                progress_task=self._connect_task,
+            )
+        connected = self._connect_task.result()
+        self._connect_task = None
+        return self.async_show_progress_done(
+            next_step_id="finish" if connected else "connect_failed"
+        )
+
+    async def async_step_finish(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Create the config entry once the device is connected."""
+        LOGGER.info("Connection successful, creating config entry")
+        return self.async_create_entry(
+            title=self._connect_title,
+            data=self._conn_details,
+        )
+
+    async def async_step_connect_failed(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show the device form again with the connection error."""
+        if self._conn_details[CONF_CONN_TYPE] == ConnectionType.USB:
+            self._connect_error = "cannot_connect_usb"
+            return await self.async_step_usb_select()
+        self._connect_error = "cannot_connect"
+        return await self.async_step_Network()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -92,9 +173,17 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._addon_port = int(user_input[CONF_ADDON_PORT])
             self._reset_api_client()
 
-            # Test connection to the addon
+            # Test connection to the addon. A recent background scan proves it is
+            # reachable; otherwise scan now and keep the result for the USB step
+            cached = get_usb_discovery(self.hass).cached_serials(
+                self._get_api_client().base_url
+            )
             try:
-                await self._get_api_client().async_get_usb_devices()
+                self._discovered_serials = (
+                    cached
+                    if cached is not None
+                    else await self._get_api_client().async_get_usb_devices()
+                )
                 # Connection successful, proceed to connection type selection
                 return await self.async_step_connection_type()
             except FrameoApiError:
@@ -123,14 +212,21 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the step where the user chooses the connection type."""
         return self.async_show_menu(
             step_id="connection_type",
-            menu_options=[ConnectionType.USB, ConnectionType.NETWORK],
+            menu_options=[ConnectionType.USB, ConnectionType.NETWORK, "network_scan"],
         )
 
+    async def async_step_network_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan the local network, then offer the devices found."""
+        self._scanned_hosts = await async_scan_for_devices(self.hass)
+        return await self.async_step_Network()
+
     async def async_step_Network(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the network connection setup."""
-        errors: dict[str, str] = {}
+        errors = self._pop_connect_errors()
 
         if user_input is not None:
             host = user_input[CONF_HOST]
@@ -149,20 +245,21 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._abort_if_unique_id_configured()
 
             LOGGER.info("Connecting to network device: %s:%s", host, port)
-
-            if await self._async_try_connect():
-                return self.async_create_entry(
-                    title=f"Frameo ({host})",
-                    data=self._conn_details,
-                )
-
-            errors["base"] = "cannot_connect"
+            self._connect_title = f"Frameo ({host})"
+            return await self.async_step_connect()
+
+        # After a scan, offer the devices found but still allow typing an address
+        host_field: Any = str
+        if self._scanned_hosts:
+            host_field = SelectSelector(
+                SelectSelectorConfig(options=self._scanned_hosts, custom_value=True)
+            )
 
         return self.async_show_form(
             step_id="Network",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_HOST): str,
+                    vol.Required(CONF_HOST): host_field,
                     vol.Required(CONF_PORT, default=DEFAULT_DEVICE_PORT): int,
                 }
             ),
@@ -178,10 +275,17 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_USB(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Scan for available USB devices before showing the selection form."""
+        """Scan for available USB devices before showing the selection form.
+
+        Serials found by the addon check in the user step are reused, so the
+        scan only runs again if that found nothing.
+        """
         try:
-            LOGGER.info("Scanning for USB devices")
-            self._discovered_serials = await self._get_api_client().async_get_usb_devices()
+            if not self._discovered_serials:
+                LOGGER.info("Scanning for USB devices")
+                self._discovered_serials = (
+                    await self._get_api_client().async_get_usb_devices()
+                )
 
             if not self._discovered_serials:
                 return self.async_abort(reason="no_devices_found")
@@ -196,11 +300,37 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return await self.async_step_usb_select()
 
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> FlowResult:
+        """Handle a USB device found by the background discovery."""
+        serial = discovery_info[CONF_SERIAL]
+        await self.async_set_unique_id(serial)
+        self._abort_if_unique_id_configured()
+
+        self._addon_host = discovery_info[CONF_ADDON_HOST]
+        self._addon_port = discovery_info[CONF_ADDON_PORT]
+        self._discovered_serials = [serial]
+        self.context["title_placeholders"] = {"serial": serial}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Confirm setting up a discovered USB device."""
+        if user_input is not None:
+            return await self.async_step_usb_select({CONF_SERIAL: self.unique_id})
+
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={"serial": self.unique_id},
+        )
+
     async def async_step_usb_select(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the USB device selection and trigger the connection."""
-        errors: dict[str, str] = {}
+        errors = self._pop_connect_errors()
 
         if user_input is not None:
             serial = user_input[CONF_SERIAL]
@@ -219,15 +349,8 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "Connecting to USB device: %s (check device screen for approval)",
                 serial,
             )
-
-            if await self._async_try_connect():
-                LOGGER.info("Connection successful, creating config entry")
-                return self.async_create_entry(
-                    title=f"Frameo (USB: {serial})",
-                    data=self._conn_details,
-                )
-
-            errors["base"] = "cannot_connect_usb"
+            self._connect_title = f"Frameo (USB: {serial})"
+            return await self.async_step_connect()
 
         return self.async_show_form(
             step_id="usb_select",
@@ -243,7 +366,7 @@ class FrameoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "message": (
                     "Select your device from the list. After clicking Submit, "
                     "check the Frameo device's screen to 'Allow USB Debugging'. "
-                    "You have 1 minute to approve it."
+                    "Setup continues as soon as you approve it."
                 )
             },
         )
@@ -267,14 +390,35 @@ class FrameoOptionsFlowHandler(config_entries.OptionsFlow):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Convert numeric values to proper types (NumberSelector returns floats)
-            processed_input = {
-                **user_input,
-                CONF_ADDON_PORT: int(user_input.get(CONF_ADDON_PORT, DEFAULT_ADDON_PORT)),
-                CONF_SCREEN_WIDTH: int(user_input.get(CONF_SCREEN_WIDTH, DEFAULT_SCREEN_WIDTH)),
-                CONF_SCREEN_HEIGHT: int(user_input.get(CONF_SCREEN_HEIGHT, DEFAULT_SCREEN_HEIGHT)),
-            }
-            return self.async_create_entry(title="", data=processed_input)
+            backends = [
+                address.strip()
+                for address in user_input.get(CONF_ADDON_BACKENDS, [])
+                if address.strip()
+            ]
+            gestures = [
+                definition.strip()
+                for definition in user_input.get(CONF_GESTURES, [])
+                if definition.strip()
+            ]
+            if not all(_BACKEND_ADDRESS_RE.match(address) for address in backends):
+                errors[CONF_ADDON_BACKENDS] = "invalid_backend"
+            if not all(_is_valid_gesture(definition) for definition in gestures):
+                errors[CONF_GESTURES] = "invalid_gesture"
+            if not errors:
+                # Convert numeric values to proper types (NumberSelector returns floats)
+                processed_input = {
+                    **user_input,
+                    CONF_ADDON_PORT: int(user_input.get(CONF_ADDON_PORT, DEFAULT_ADDON_PORT)),
+                    CONF_SCREEN_WIDTH: int(user_input.get(CONF_SCREEN_WIDTH, DEFAULT_SCREEN_WIDTH)),
+                    CONF_SCREEN_HEIGHT: int(user_input.get(CONF_SCREEN_HEIGHT, DEFAULT_SCREEN_HEIGHT)),
+                    CONF_HEARTBEAT_INTERVAL: int(
+                        user_input.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+                    ),
+                    CONF_OFFLINE_QUEUE_TTL: int(user_input.get(CONF_OFFLINE_QUEUE_TTL, 0)),
+                    CONF_ADDON_BACKENDS: backends,
+                    CONF_GESTURES: gestures,
+                }
+                return self.async_create_entry(title="", data=processed_input)
 
         # Get current values - check options first, then data (from initial config), then defaults
         current_options = self.config_entry.options
@@ -284,45 +428,97 @@ class FrameoOptionsFlowHandler(config_entries.OptionsFlow):
             """Get value from options, then data, then default."""
             return current_options.get(key, current_data.get(key, default))
 
+        fields: dict[Any, Any] = {
+            vol.Optional(
+                CONF_ADDON_HOST,
+                default=get_value(CONF_ADDON_HOST, DEFAULT_ADDON_HOST),
+            ): TextSelector(),
+            vol.Optional(
+                CONF_ADDON_PORT,
+                default=get_value(CONF_ADDON_PORT, DEFAULT_ADDON_PORT),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=1,
+                    max=65535,
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_ADDON_BACKENDS,
+                default=current_options.get(CONF_ADDON_BACKENDS, []),
+            ): TextSelector(TextSelectorConfig(multiple=True)),
+            vol.Optional(
+                CONF_SCREEN_WIDTH,
+                default=current_options.get(CONF_SCREEN_WIDTH, DEFAULT_SCREEN_WIDTH),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=100,
+                    max=4096,
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_SCREEN_HEIGHT,
+                default=current_options.get(CONF_SCREEN_HEIGHT, DEFAULT_SCREEN_HEIGHT),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=100,
+                    max=4096,
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_HEARTBEAT_INTERVAL,
+                default=current_options.get(
+                    CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                ),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=0,
+                    max=MAX_HEARTBEAT_INTERVAL,
+                    unit_of_measurement="s",
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_OFFLINE_QUEUE_TTL,
+                default=current_options.get(CONF_OFFLINE_QUEUE_TTL, 0),
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=0,
+                    max=MAX_OFFLINE_QUEUE_TTL,
+                    unit_of_measurement="s",
+                    mode=NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_GESTURES,
+                default=current_options.get(CONF_GESTURES, []),
+            ): TextSelector(TextSelectorConfig(multiple=True)),
+        }
+
+        # A USB entry can fall back to the network and vice versa
+        fallback_key = (
+            CONF_FALLBACK_HOST
+            if current_data.get(CONF_CONN_TYPE) == ConnectionType.USB
+            else CONF_FALLBACK_SERIAL
+        )
+        fields[
+            vol.Optional(
+                fallback_key,
+                description={"suggested_value": current_options.get(fallback_key)},
+            )
+        ] = TextSelector()
+        if current_data.get(CONF_CONN_TYPE) == ConnectionType.NETWORK:
+            fields[
+                vol.Optional(
+                    CONF_DIRECT_ADB,
+                    default=current_options.get(CONF_DIRECT_ADB, False),
+                )
+            ] = BooleanSelector()
+
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Optional(
-                        CONF_ADDON_HOST,
-                        default=get_value(CONF_ADDON_HOST, DEFAULT_ADDON_HOST),
-                    ): TextSelector(),
-                    vol.Optional(
-                        CONF_ADDON_PORT,
-                        default=get_value(CONF_ADDON_PORT, DEFAULT_ADDON_PORT),
-                    ): NumberSelector(
-                        NumberSelectorConfig(
-                            min=1,
-                            max=65535,
-                            mode=NumberSelectorMode.BOX,
-                        )
-                    ),
-                    vol.Optional(
-                        CONF_SCREEN_WIDTH,
-                        default=current_options.get(CONF_SCREEN_WIDTH, DEFAULT_SCREEN_WIDTH),
-                    ): NumberSelector(
-                        NumberSelectorConfig(
-                            min=100,
-                            max=4096,
-                            mode=NumberSelectorMode.BOX,
-                        )
-                    ),
-                    vol.Optional(
-                        CONF_SCREEN_HEIGHT,
-                        default=current_options.get(CONF_SCREEN_HEIGHT, DEFAULT_SCREEN_HEIGHT),
-                    ): NumberSelector(
-                        NumberSelectorConfig(
-                            min=100,
-                            max=4096,
-                            mode=NumberSelectorMode.BOX,
-                        )
-                    ),
-                }
-            ),
+            data_schema=vol.Schema(fields),
             errors=errors,
-        )
\ No newline at end of file
+        )
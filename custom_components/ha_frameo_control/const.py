@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 from enum import StrEnum
 from typing import Final
 
@@ -13,7 +14,7 @@ LOGGER: Final = logging.getLogger(__package__)
 DOMAIN: Final = "ha_frameo_control"
 
 # Platforms supported by this integration
-PLATFORMS: Final[list[Platform]] = [Platform.LIGHT, Platform.BUTTON]
+PLATFORMS: Final[list[Platform]] = [Platform.LIGHT, Platform.BUTTON, Platform.SENSOR]
 
 
 class ConnectionType(StrEnum):
@@ -28,24 +29,119 @@ CONF_CONN_TYPE: Final = "connection_type"
 CONF_SERIAL: Final = "serial"
 CONF_ADDON_HOST: Final = "addon_host"
 CONF_ADDON_PORT: Final = "addon_port"
+CONF_ADDON_BACKENDS: Final = "addon_backends"
 CONF_SCREEN_WIDTH: Final = "screen_width"
 CONF_SCREEN_HEIGHT: Final = "screen_height"
+CONF_FALLBACK_HOST: Final = "fallback_host"
+CONF_FALLBACK_SERIAL: Final = "fallback_serial"
+CONF_HEARTBEAT_INTERVAL: Final = "heartbeat_interval"
+CONF_GESTURES: Final = "gestures"
+CONF_DIRECT_ADB: Final = "direct_adb"
+CONF_OFFLINE_QUEUE_TTL: Final = "offline_queue_ttl"
 
 # Default configuration values
 DEFAULT_DEVICE_PORT: Final = 5555
 DEFAULT_ADDON_HOST: Final = "127.0.0.1"
 DEFAULT_ADDON_PORT: Final = 5000
+DEFAULT_HEARTBEAT_INTERVAL: Final = 60
+MAX_HEARTBEAT_INTERVAL: Final = 3600
+
+# Brightness changes arriving within this many seconds of each other, e.g.
+# while a slider is dragged, are sent to the device as one write
+BRIGHTNESS_DEBOUNCE: Final = 0.4
+
+# After wireless ADB is enabled, the network link is tried this many times,
+# this many seconds apart, while adbd restarts on the device
+TCPIP_CONNECT_ATTEMPTS: Final = 5
+TCPIP_CONNECT_DELAY: Final = 2
+
+# KEYCODE_WAKEUP and KEYCODE_SLEEP exist from this Android API level on
+WAKE_SLEEP_MIN_SDK: Final = 20
 
 # Timeouts (in seconds)
 DEFAULT_TIMEOUT: Final = 20
 CONNECT_TIMEOUT: Final = 130
 USB_SCAN_TIMEOUT: Final = 15
+ADDON_PING_TIMEOUT: Final = 2
+
+# Local network scan for wireless ADB devices. Networks larger than a /24 are
+# narrowed to the /24 around Home Assistant's address
+LAN_SCAN_CONCURRENCY: Final = 64
+LAN_SCAN_TIMEOUT: Final = 0.5
+LAN_SCAN_MIN_PREFIX: Final = 24
+
+# Profiling window when neither a duration nor a number of operations is given
+DEFAULT_PROFILE_DURATION: Final = 60
+MAX_PROFILE_DURATION: Final = 3600
+
+# Read-only command results cached per device
+COMMAND_CACHE_SIZE: Final = 64
+MAX_CACHE_TTL: Final = 3600
+
+# Commands held while the device is offline, when the queue is enabled
+OFFLINE_QUEUE_SIZE: Final = 32
+MAX_OFFLINE_QUEUE_TTL: Final = 3600
+# Seconds between background reconnect attempts while commands are queued
+OFFLINE_RECONNECT_INTERVAL: Final = 15
+
+# Background USB discovery: the cached serials are refreshed on this interval,
+# and this many seconds after a USB hotplug event
+USB_DISCOVERY_INTERVAL: Final = timedelta(minutes=5)
+USB_HOTPLUG_COOLDOWN: Final = 2
+
+# Dedicated HTTP connection pool per addon. The addon is on the LAN or
+# loopback, so idle connections are kept open long enough to span interactions
+ADDON_MAX_CONNECTIONS: Final = 10
+ADDON_MAX_KEEPALIVE_CONNECTIONS: Final = 5
+ADDON_KEEPALIVE_EXPIRY: Final = 120
+# Requests sent to one addon at once, across all of its devices. Kept below
+# the connection limit so excess requests queue here instead of timing out
+# while waiting for a pooled connection
+ADDON_MAX_CONCURRENT_REQUESTS: Final = 8
+
+# Hedged reads: a second request is sent once a read takes longer than this
+# percentile of recent read latencies (but never sooner than the minimum delay)
+HEDGE_PERCENTILE: Final = 95
+HEDGE_WINDOW: Final = 100
+HEDGE_MIN_SAMPLES: Final = 20
+HEDGE_MIN_DELAY: Final = 0.5
+
+# Health sensors are checked on this tick; each metric has its own interval
+HEALTH_UPDATE_INTERVAL: Final = timedelta(minutes=1)
+# Delay before a requested health refresh, so sensors added together share one fetch
+HEALTH_REFRESH_COOLDOWN: Final = 1
+# A cached foreground app younger than this lets launcher buttons skip the device
+LAUNCH_FOREGROUND_MAX_AGE: Final = 30
+# Gestures reuse the detected screen geometry until a change is seen or it is
+# this old, in case the frame was turned while auto-rotate is on
+SCREEN_GEOMETRY_MAX_AGE: Final = 300
 
 # ADB shell commands
 ADB_CMD_POWER_KEY: Final = "input keyevent 26"
+ADB_CMD_WAKEUP: Final = "input keyevent 224"
+ADB_CMD_SLEEP: Final = "input keyevent 223"
+# Power commands for devices without wake and sleep keys: the power key is
+# only pressed if the screen is not already in the wanted state, as checked on
+# the device by the same command
+ADB_CMD_POWER_ON_GUARDED: Final = (
+    f"dumpsys power | grep -q mWakefulness=Awake || {ADB_CMD_POWER_KEY}"
+)
+ADB_CMD_POWER_OFF_GUARDED: Final = (
+    f"! dumpsys power | grep -q mWakefulness=Awake || {ADB_CMD_POWER_KEY}"
+)
+ADB_CMD_SDK_VERSION: Final = "getprop ro.build.version.sdk"
 ADB_CMD_BRIGHTNESS: Final = "settings put system screen_brightness {brightness}"
 ADB_CMD_POWER_STATE: Final = "dumpsys power"
 ADB_CMD_SCREEN_SIZE: Final = "wm size"
+ADB_CMD_ECHO: Final = "echo ok"
+ADB_CMD_DEVICE_TIME: Final = "date +'%m-%d %H:%M:%S.000'"
+ADB_CMD_WLAN_ADDRESS: Final = "ip -f inet addr show wlan0"
+ADB_CMD_HAS_GZIP: Final = "command -v gzip"
+
+# Logcat subscriptions
+DEFAULT_LOGCAT_INTERVAL: Final = 5
+MIN_LOGCAT_INTERVAL: Final = 1
+LOGCAT_QUEUE_SIZE: Final = 256
 
 # Default screen dimensions for gestures (1280x800 landscape)
 DEFAULT_SCREEN_WIDTH: Final = 1280
@@ -53,10 +149,28 @@ DEFAULT_SCREEN_HEIGHT: Final = 800
 
 # Service names
 SERVICE_RUN_ADB_COMMAND: Final = "run_adb_command"
+SERVICE_SUBSCRIBE_LOGCAT: Final = "subscribe_logcat"
+SERVICE_UNSUBSCRIBE_LOGCAT: Final = "unsubscribe_logcat"
+SERVICE_PROFILE: Final = "profile"
+SERVICE_SNAPSHOT_STATE: Final = "snapshot_state"
+SERVICE_RESTORE_STATE: Final = "restore_state"
+SERVICE_CAPTURE_SCREEN: Final = "capture_screen"
 
 # Attributes
 ATTR_COMMAND: Final = "command"
 ATTR_RESULT: Final = "result"
+ATTR_NAME: Final = "name"
+ATTR_TAGS: Final = "tags"
+ATTR_PATTERN: Final = "pattern"
+ATTR_INTERVAL: Final = "interval"
+ATTR_CACHE_TTL: Final = "cache_ttl"
+ATTR_DURATION: Final = "duration"
+ATTR_OPERATIONS: Final = "operations"
+ATTR_CPROFILE: Final = "cprofile"
+ATTR_FILENAME: Final = "filename"
+ATTR_MAX_WIDTH: Final = "max_width"
 
 # Events
-EVENT_ADB_RESPONSE: Final = f"{DOMAIN}_adb_response"
\ No newline at end of file
+EVENT_ADB_RESPONSE: Final = f"{DOMAIN}_adb_response"
+EVENT_LOGCAT: Final = f"{DOMAIN}_logcat"
+EVENT_PROFILE: Final = f"{DOMAIN}_profile"
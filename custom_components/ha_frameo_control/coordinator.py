@@ -1,19 +1,79 @@
 """Data update coordinator for the HA Frameo Control integration."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+import math
+import re
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import FrameoAddonApiClient, FrameoApiError, FrameoDeviceDisconnectedError
+from .adb import FrameoAdbClient
+from .api import (
+    AddonState,
+    FrameoAddonApiClient,
+    FrameoApiError,
+    FrameoDeviceDisconnectedError,
+    ShellResult,
+)
+from .backend import FrameoBackendPool
+from .commands import (
+    COMMAND_RETRIES,
+    CommandCache,
+    CommandKind,
+    LatencyWindow,
+    OfflineCommandQueue,
+    changes_geometry,
+    classify_command,
+)
 from .const import (
+    ADB_CMD_ECHO,
+    ADB_CMD_HAS_GZIP,
+    ADB_CMD_POWER_KEY,
+    ADB_CMD_POWER_OFF_GUARDED,
+    ADB_CMD_POWER_ON_GUARDED,
+    ADB_CMD_SDK_VERSION,
+    ADB_CMD_SLEEP,
+    ADB_CMD_WAKEUP,
+    ADB_CMD_WLAN_ADDRESS,
+    CONF_CONN_TYPE,
+    DEFAULT_DEVICE_PORT,
+    DEFAULT_LOGCAT_INTERVAL,
     DEFAULT_SCREEN_HEIGHT,
     DEFAULT_SCREEN_WIDTH,
     DOMAIN,
+    HEALTH_REFRESH_COOLDOWN,
+    HEALTH_UPDATE_INTERVAL,
+    LAUNCH_FOREGROUND_MAX_AGE,
     LOGGER,
+    OFFLINE_RECONNECT_INTERVAL,
+    SCREEN_GEOMETRY_MAX_AGE,
+    TCPIP_CONNECT_ATTEMPTS,
+    TCPIP_CONNECT_DELAY,
+    WAKE_SLEEP_MIN_SDK,
+    ConnectionType,
+)
+from .health import (
+    HEALTH_METRICS,
+    FrameoStateSnapshot,
+    build_health_command,
+    build_launch_command,
+    build_restore_command,
+    build_snapshot_command,
+    parse_health_output,
+    parse_launch_output,
+    parse_snapshot_output,
 )
+from .logcat import FrameoLogcatSubscription
+from .profiling import FrameoProfiler
+from .screencap import FrameoScreenshot, build_capture_command, decode_screencap
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -21,8 +81,40 @@ if TYPE_CHECKING:
 # Maximum number of reconnection attempts
 MAX_RECONNECT_ATTEMPTS = 3
 
+# Weight of the newest sample in the smoothed round-trip time
+_RTT_SMOOTHING = 0.3
+
+# IPv4 address in the output of `ip addr`
+_INET_RE = re.compile(r"\binet (\d{1,3}(?:\.\d{1,3}){3})/")
+
 
 @dataclass
+class FrameoTransport:
+    """A way of reaching the device (USB or network) and its health."""
+
+    conn_details: dict[str, Any]
+    rtt: float | None = None
+    healthy: bool = True
+
+    @property
+    def name(self) -> str:
+        """Return the connection type of this transport."""
+        return self.conn_details.get(CONF_CONN_TYPE, "unknown")
+
+    def record_rtt(self, rtt: float) -> None:
+        """Fold a round-trip time sample into the smoothed value.
+
+        Args:
+            rtt: Measured round-trip time in seconds.
+
+        """
+        if self.rtt is None:
+            self.rtt = rtt
+        else:
+            self.rtt += _RTT_SMOOTHING * (rtt - self.rtt)
+
+
+@dataclass(slots=True)
 class FrameoDeviceState:
     """Represents the current state of a Frameo device."""
 
@@ -34,14 +126,14 @@ class FrameoDeviceState:
     @classmethod
     def from_api_response(
         cls,
-        data: dict,
+        data: AddonState,
         screen_width: int = DEFAULT_SCREEN_WIDTH,
         screen_height: int = DEFAULT_SCREEN_HEIGHT,
     ) -> "FrameoDeviceState":
         """Create a FrameoDeviceState from API response data.
 
         Args:
-            data: API response dictionary.
+            data: Decoded /state response.
             screen_width: Screen width (auto-detected or configured).
             screen_height: Screen height (auto-detected or configured).
 
@@ -50,8 +142,8 @@ class FrameoDeviceState:
 
         """
         return cls(
-            is_on=data.get("is_on", False),
-            brightness=data.get("brightness", 0),
+            is_on=data.is_on,
+            brightness=data.brightness,
             screen_width=screen_width,
             screen_height=screen_height,
         )
@@ -67,19 +159,31 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
     def __init__(
         self,
         hass: HomeAssistant,
-        client: FrameoAddonApiClient,
+        client: FrameoAddonApiClient | FrameoAdbClient,
         conn_details: dict[str, Any],
         configured_width: int = DEFAULT_SCREEN_WIDTH,
         configured_height: int = DEFAULT_SCREEN_HEIGHT,
+        fallback_details: dict[str, Any] | None = None,
+        backend_pool: FrameoBackendPool | None = None,
+        backend_addresses: list[tuple[str, int]] | None = None,
+        offline_queue_ttl: float = 0,
     ) -> None:
         """Initialize the data update coordinator.
 
         Args:
             hass: Home Assistant instance.
-            client: API client for the Frameo addon.
+            client: API client for the Frameo addon, or a direct ADB client.
             conn_details: Connection details for reconnection.
             configured_width: Fallback screen width from config.
             configured_height: Fallback screen height from config.
+            fallback_details: Connection details of a second transport to
+                fail over to.
+            backend_pool: Pool the client was placed from, used to move the
+                device to another addon backend when its current one becomes
+                unhealthy and to release the client on shutdown.
+            backend_addresses: Addon backends the device may be placed on.
+            offline_queue_ttl: Seconds to hold commands sent while the device
+                is offline, or 0 to fail them right away.
 
         """
         super().__init__(
@@ -90,13 +194,36 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
             update_interval=None,
         )
         self.client = client
-        self._conn_details = conn_details
+        self._transports = [FrameoTransport(conn_details)]
+        if fallback_details:
+            self._transports.append(FrameoTransport(fallback_details))
+        self._active = self._transports[0]
+        self._backend_pool = backend_pool
+        self._backend_addresses = backend_addresses or []
         self._configured_width = configured_width
         self._configured_height = configured_height
         self._detected_width: int | None = None
         self._detected_height: int | None = None
         self._resolution_detected = False
+        # When gestures last checked the geometry, or None to check on the next
+        self._geometry_checked: float | None = None
         self._is_connected = True
+        self._last_seen = time.monotonic()
+        self._heartbeat_interval = 0.0
+        self._heartbeat_lock = asyncio.Lock()
+        self._heartbeat_unsub: CALLBACK_TYPE | None = None
+        self._read_latency = LatencyWindow()
+        self._command_cache = CommandCache()
+        self._offline_queue = (
+            OfflineCommandQueue(offline_queue_ttl) if offline_queue_ttl > 0 else None
+        )
+        self._offline_reconnect_task: asyncio.Task[None] | None = None
+        self.logcat_subscriptions: dict[str, FrameoLogcatSubscription] = {}
+        self._profiler: FrameoProfiler | None = None
+        self.snapshots: dict[str, FrameoStateSnapshot] = {}
+        self._wake_sleep_keys: bool | None = None
+        self._screencap_gzip: bool | None = None
+        self.health = FrameoHealthCoordinator(hass, self)
 
     @property
     def screen_width(self) -> int:
@@ -113,26 +240,613 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
         """Return whether the device is currently connected."""
         return self._is_connected
 
-    async def async_reconnect(self) -> bool:
-        """Attempt to reconnect to the device.
+    @property
+    def transports(self) -> list[FrameoTransport]:
+        """Return every transport the device can be reached over."""
+        return self._transports
+
+    @property
+    def active_transport(self) -> FrameoTransport:
+        """Return the transport commands are currently routed over."""
+        return self._active
+
+    @property
+    def queued_commands(self) -> int:
+        """Return the number of commands waiting for the device to reconnect."""
+        return len(self._offline_queue) if self._offline_queue is not None else 0
+
+    def _mark_disconnected(self) -> None:
+        """Record that the active transport reported the device as gone."""
+        self._is_connected = False
+        self._active.healthy = False
+
+    def async_subscribe_logcat(
+        self,
+        entry_id: str,
+        name: str,
+        tags: list[str],
+        pattern: str | None = None,
+        interval: float = DEFAULT_LOGCAT_INTERVAL,
+    ) -> None:
+        """Start a logcat subscription, replacing any with the same name.
+
+        Args:
+            entry_id: Config entry ID, included in fired events.
+            name: Subscription name.
+            tags: Tag filters applied on the device.
+            pattern: Extended regex applied on the device.
+            interval: Seconds between polls.
+
+        """
+        self.async_unsubscribe_logcat(name)
+        subscription = FrameoLogcatSubscription(
+            self.hass, self, entry_id, name, tags, pattern, interval
+        )
+        subscription.start()
+        self.logcat_subscriptions[name] = subscription
+
+    def async_unsubscribe_logcat(self, name: str) -> bool:
+        """Stop a logcat subscription.
+
+        Args:
+            name: Subscription name.
 
         Returns:
-            True if reconnection was successful.
+            True if a subscription with this name existed.
 
         """
-        LOGGER.info("Attempting to reconnect to device...")
+        subscription = self.logcat_subscriptions.pop(name, None)
+        if subscription is None:
+            return False
+        subscription.stop()
+        return True
+
+    @callback
+    def async_start_heartbeat(self, interval: float) -> None:
+        """Check the connection periodically between interactions.
+
+        A dropped connection is then noticed and re-established in the
+        background instead of on the next button press.
+
+        Args:
+            interval: Seconds between heartbeats, or 0 to disable them.
+
+        """
+        if interval <= 0:
+            return
+        self._heartbeat_interval = interval
+        self._heartbeat_unsub = async_track_time_interval(
+            self.hass,
+            self._async_heartbeat,
+            timedelta(seconds=interval),
+            name=f"{DOMAIN} heartbeat",
+        )
+
+    async def _async_heartbeat(self, now: datetime) -> None:
+        """Send a trivial command, reconnecting if the link has dropped."""
+        if self._heartbeat_lock.locked():
+            return
+        async with self._heartbeat_lock:
+            if self._is_connected:
+                # Any recent command already proved the link is up
+                if time.monotonic() - self._last_seen < self._heartbeat_interval:
+                    return
+                start = time.monotonic()
+                try:
+                    await self.client.async_shell(ADB_CMD_ECHO)
+                except FrameoApiError as err:
+                    LOGGER.info("Heartbeat failed, reconnecting: %s", err)
+                    self._mark_disconnected()
+                else:
+                    self._last_seen = time.monotonic()
+                    self._active.record_rtt(self._last_seen - start)
+                    return
+            await self.async_reconnect()
+
+    async def async_start_profile(
+        self,
+        duration: float | None = None,
+        operations: int | None = None,
+        cprofile: bool = False,
+    ) -> None:
+        """Profile requests to the device, replacing any running profile.
+
+        A profile of another device sharing the same add-on client is stopped
+        too, as only one profiler can be attached to a client.
+
+        Args:
+            duration: Seconds to profile for.
+            operations: Number of requests to profile.
+            cprofile: Whether to also run cProfile.
+
+        """
+        if self._profiler is not None:
+            await self._profiler.async_stop()
+        if (running := self.client.profiler) is not None:
+            await running.async_stop()
+        self._profiler = FrameoProfiler(
+            self.hass, self.client, duration, operations, cprofile
+        )
+        self._profiler.async_start()
+
+    async def async_launch_app(self, package: str, intent: str) -> bool:
+        """Launch an app unless it is already in the foreground.
+
+        If the cached foreground app is recent and matches, nothing is sent.
+        Otherwise a single command checks the foreground on the device and
+        only then runs `am start -W`, whose launch timing is recorded in the
+        "launch" health metric.
+
+        Args:
+            package: Package of the app.
+            intent: Arguments to `am start` that launch it.
+
+        Returns:
+            True if the app was launched, False if it was already in front.
+
+        """
+        foreground = self.health.fresh_value("foreground", LAUNCH_FOREGROUND_MAX_AGE)
+        if foreground and foreground["package"] == package:
+            LOGGER.debug("%s is already in the foreground, not launching", package)
+            return False
+
+        result = await self.async_execute_command(
+            build_launch_command(package, intent), CommandKind.ACTION
+        )
+        launch = parse_launch_output(result.output)
+        self.health.async_set_metric("foreground", {"package": package, "activity": None})
+        if launch is None:
+            LOGGER.debug("%s was already in the foreground, not launched", package)
+            return False
+        LOGGER.info("Launched %s: %s", package, launch)
+        self.health.async_set_metric("launch", {"package": package, **launch})
+        return True
+
+    async def async_set_power(self, on: bool) -> None:
+        """Turn the screen on or off, whatever state it is in now.
+
+        Devices that have wake and sleep keys get one of those; others get
+        the power key toggle, guarded by a check of the screen state in the
+        same command. Either way the command is safe to send on stale state
+        and to repeat.
+
+        Args:
+            on: Whether the screen should be on.
+
+        """
+        if self._wake_sleep_keys is None:
+            self._wake_sleep_keys = await self._async_detect_wake_sleep_keys()
+        if self._wake_sleep_keys:
+            command = ADB_CMD_WAKEUP if on else ADB_CMD_SLEEP
+        else:
+            command = ADB_CMD_POWER_ON_GUARDED if on else ADB_CMD_POWER_OFF_GUARDED
+        LOGGER.debug("Turning Frameo screen %s", "on" if on else "off")
+        await self.async_execute_command(command, CommandKind.WRITE)
+        if self.data is not None:
+            self.async_set_updated_data(replace(self.data, is_on=on))
+
+    async def _async_detect_wake_sleep_keys(self) -> bool:
+        """Check whether the device's Android version has wake and sleep keys.
+
+        Returns:
+            True if KEYCODE_WAKEUP and KEYCODE_SLEEP are supported.
+
+        """
+        result = await self.async_execute_command(ADB_CMD_SDK_VERSION, CommandKind.READ)
         try:
-            result = await self.client.async_connect(self._conn_details)
-            if result and result.get("status") in ("connected", "already_connected"):
-                LOGGER.info("Reconnection successful")
+            sdk = int(result.output.strip())
+        except ValueError:
+            LOGGER.debug("Unknown SDK version %r, using the power key", result.output)
+            return False
+        LOGGER.debug(
+            "Android SDK %d, %s wake and sleep keys",
+            sdk,
+            "using" if sdk >= WAKE_SLEEP_MIN_SDK else "no",
+        )
+        return sdk >= WAKE_SLEEP_MIN_SDK
+
+    async def async_snapshot_state(self, name: str) -> FrameoStateSnapshot:
+        """Capture the device state in one command and keep it under a name.
+
+        Args:
+            name: Name to store the snapshot under, replacing any earlier one.
+
+        Returns:
+            The captured state.
+
+        Raises:
+            FrameoApiError: If the state cannot be read.
+
+        """
+        result = await self.async_execute_command(
+            build_snapshot_command(), CommandKind.READ
+        )
+        try:
+            snapshot = parse_snapshot_output(result.output)
+        except ValueError as err:
+            raise FrameoApiError(f"Could not read device state: {err}") from err
+        self.snapshots[name] = snapshot
+        self.health.async_set_metric("foreground", snapshot.foreground)
+        LOGGER.debug("Saved state snapshot '%s': %s", name, snapshot)
+        return snapshot
+
+    async def async_restore_state(self, name: str) -> None:
+        """Return the device to a saved snapshot in one command.
+
+        Args:
+            name: Name of the snapshot.
+
+        Raises:
+            KeyError: If there is no snapshot with this name.
+            FrameoApiError: If the command fails.
+
+        """
+        snapshot = self.snapshots[name]
+        # Each step checks the device first, so the script is safe to repeat
+        await self.async_execute_command(
+            build_restore_command(snapshot, ADB_CMD_POWER_KEY), CommandKind.WRITE
+        )
+        if snapshot.foreground is not None:
+            self.health.async_set_metric("foreground", snapshot.foreground)
+        LOGGER.debug("Restored state snapshot '%s'", name)
+        await self.async_request_refresh()
+
+    async def async_capture_screen(
+        self, max_width: int | None = None
+    ) -> FrameoScreenshot:
+        """Capture the screen from the raw framebuffer.
+
+        The device only dumps its framebuffer, gzipped if it has gzip, rather
+        than encoding a PNG on its slow CPU. Decoding and scaling run in the
+        executor.
+
+        Args:
+            max_width: Width in pixels to scale the screenshot down to fit.
+
+        Returns:
+            The captured screen.
+
+        Raises:
+            FrameoApiError: If the connection cannot carry binary output or
+                the capture fails.
+
+        """
+        if not isinstance(self.client, FrameoAdbClient):
+            raise FrameoApiError("Screen capture needs a direct ADB connection")
+        if self._screencap_gzip is None:
+            result = await self.async_execute_command(ADB_CMD_HAS_GZIP, CommandKind.READ)
+            self._screencap_gzip = bool(result.output.strip())
+        if not await self.async_ensure_connected():
+            raise FrameoApiError("Device not connected")
+        try:
+            raw = await self.client.async_exec(build_capture_command(self._screencap_gzip))
+        except FrameoDeviceDisconnectedError:
+            self._mark_disconnected()
+            raise
+        self._last_seen = time.monotonic()
+        try:
+            return await self.hass.async_add_executor_job(
+                decode_screencap, raw, max_width
+            )
+        except ValueError as err:
+            raise FrameoApiError(f"Could not decode screen capture: {err}") from err
+
+    async def async_shutdown(self) -> None:
+        """Stop background work when the config entry is unloaded."""
+        if self._profiler is not None:
+            await self._profiler.async_stop()
+        if self._heartbeat_unsub is not None:
+            self._heartbeat_unsub()
+            self._heartbeat_unsub = None
+        if self._offline_reconnect_task is not None:
+            self._offline_reconnect_task.cancel()
+            self._offline_reconnect_task = None
+        for name in list(self.logcat_subscriptions):
+            self.async_unsubscribe_logcat(name)
+        await self.health.async_shutdown()
+        if isinstance(self.client, FrameoAdbClient):
+            await self.client.async_close()
+        elif self._backend_pool is not None:
+            await self._backend_pool.async_release(self.client)
+        await super().async_shutdown()
+
+    async def _async_connect_transport(self, transport: FrameoTransport) -> bool:
+        """Connect the addon to the device over one transport.
+
+        When there is more than one transport, the round-trip time is measured
+        right after connecting so the fastest one can be preferred.
+
+        Args:
+            transport: Transport to connect over.
+
+        Returns:
+            True if the connection was successful.
+
+        """
+        try:
+            result = await self.client.async_connect(transport.conn_details)
+            transport.healthy = result.connected
+            if not transport.healthy:
+                LOGGER.warning("Connection over %s failed: %s", transport.name, result)
+            elif len(self._transports) > 1:
+                start = time.monotonic()
+                await self.client.async_shell(ADB_CMD_ECHO)
+                transport.record_rtt(time.monotonic() - start)
+        except FrameoApiError as err:
+            LOGGER.error("Connection error over %s: %s", transport.name, err)
+            transport.healthy = False
+        return transport.healthy
+
+    def _failover_order(self) -> list[FrameoTransport]:
+        """Return the transports to try, healthy and fastest first."""
+        return sorted(
+            self._transports,
+            key=lambda t: (not t.healthy, t.rtt if t.rtt is not None else math.inf),
+        )
+
+    async def async_upgrade_to_network(self) -> dict[str, Any]:
+        """Enable wireless ADB over USB and move the device to the network.
+
+        The device's address is read over USB before wireless ADB is
+        enabled, as enabling it cuts the USB link. The network link is then
+        connected and checked, and becomes the active transport with USB as
+        its fallback.
+
+        Returns:
+            Connection details of the network transport.
+
+        Raises:
+            FrameoApiError: If the device is not on USB, has no network
+                address, or the network link does not come up. The USB link
+                is restored where the device still allows it.
+
+        """
+        usb = self._active
+        if usb.name != ConnectionType.USB:
+            raise FrameoApiError("Device is not connected over USB")
+        result = await self.async_execute_command(ADB_CMD_WLAN_ADDRESS, CommandKind.READ)
+        if not (match := _INET_RE.search(result.output)):
+            raise FrameoApiError("Could not find the device's network address")
+        network = FrameoTransport(
+            {
+                CONF_CONN_TYPE: ConnectionType.NETWORK,
+                CONF_HOST: match.group(1),
+                CONF_PORT: DEFAULT_DEVICE_PORT,
+            }
+        )
+
+        LOGGER.info("Enabling wireless ADB, device address is %s", match.group(1))
+        await self.client.async_enable_tcpip()
+        self._mark_disconnected()
+        for _ in range(TCPIP_CONNECT_ATTEMPTS):
+            # adbd restarts to listen on the network
+            await asyncio.sleep(TCPIP_CONNECT_DELAY)
+            if await self._async_verify_transport(network):
+                self._transports = [network, usb]
+                self._active = network
                 self._is_connected = True
-                return True
-            LOGGER.warning("Reconnection failed: %s", result)
+                self._command_cache.clear()
+                LOGGER.info("Moved device to the network at %s", match.group(1))
+                return network.conn_details
+
+        LOGGER.warning("Wireless ADB did not come up, returning to USB")
+        self._is_connected = await self._async_connect_transport(usb)
+        raise FrameoApiError(f"Could not connect to the device at {match.group(1)}")
+
+    async def _async_verify_transport(self, transport: FrameoTransport) -> bool:
+        """Connect over a transport and check that commands get through.
+
+        Args:
+            transport: Transport to check.
+
+        Returns:
+            True if the device answered a command over the transport.
+
+        """
+        if not await self._async_connect_transport(transport):
             return False
+        start = time.monotonic()
+        try:
+            result = await self.client.async_shell(ADB_CMD_ECHO)
         except FrameoApiError as err:
-            LOGGER.error("Reconnection error: %s", err)
+            LOGGER.debug("Checking %s failed: %s", transport.name, err)
+            transport.healthy = False
+            return False
+        transport.record_rtt(time.monotonic() - start)
+        transport.healthy = result.output.strip() == ADB_CMD_ECHO.partition(" ")[2]
+        return transport.healthy
+
+    async def async_select_transport(self) -> bool:
+        """Probe every transport and route commands over the fastest one.
+
+        Returns:
+            True if at least one transport is connected.
+
+        """
+        if len(self._transports) == 1:
+            self._is_connected = await self._async_connect_transport(self._active)
+            return self._is_connected
+
+        for transport in self._transports:
+            await self._async_connect_transport(transport)
+
+        best = self._failover_order()[0]
+        if not best.healthy:
+            self._is_connected = False
             return False
 
+        # The addon holds one connection, so switch back if another was probed last
+        if best is not self._transports[-1]:
+            best.healthy = await self._async_connect_transport(best)
+        self._active = best
+        self._is_connected = best.healthy
+        LOGGER.info(
+            "Routing commands over %s (round trip: %s)",
+            best.name,
+            ", ".join(
+                f"{t.name}={t.rtt * 1000:.0f} ms" for t in self._transports if t.rtt
+            ),
+        )
+        return self._is_connected
+
+    async def _async_reconnect_transports(self) -> bool:
+        """Reconnect over the first transport that works, in failover order.
+
+        Returns:
+            True if reconnection was successful.
+
+        """
+        for transport in self._failover_order():
+            if await self._async_connect_transport(transport):
+                if transport is not self._active:
+                    LOGGER.warning(
+                        "Failed over from %s to %s", self._active.name, transport.name
+                    )
+                    self._active = transport
+                self._is_connected = True
+                return True
+        return False
+
+    async def _async_move_backend(self) -> bool:
+        """Move the device to the least-loaded healthy addon backend.
+
+        Returns:
+            True if the device was moved to a different backend.
+
+        """
+        if self._backend_pool is None or len(self._backend_addresses) < 2:
+            return False
+        client = await self._backend_pool.async_place(
+            self._active.conn_details, self._backend_addresses, current=self.client
+        )
+        if client is None or client is self.client:
+            return False
+        LOGGER.warning(
+            "Moving device from addon backend %s to %s",
+            self.client.base_url,
+            client.base_url,
+        )
+        self.client = client
+        return True
+
+    async def async_reconnect(self) -> bool:
+        """Attempt to reconnect, failing over to another transport if needed.
+
+        If the addon backend itself is unreachable, the device is moved to
+        another backend first.
+
+        Commands queued while the device was offline are sent before this
+        returns. If the device drops again while they are sent, those not
+        sent yet stay queued for the next reconnect.
+
+        Returns:
+            True if reconnection was successful.
+
+        """
+        LOGGER.info("Attempting to reconnect to device...")
+        if not (
+            await self._async_reconnect_transports()
+            or (
+                not self.client.healthy
+                and await self._async_move_backend()
+                and await self._async_reconnect_transports()
+            )
+        ):
+            LOGGER.warning("Reconnection failed on all transports")
+            return False
+        LOGGER.info("Reconnection successful")
+        # The frame may have been turned while it was offline
+        self.async_invalidate_screen_resolution()
+        if not await self._async_flush_offline_queue():
+            LOGGER.warning(
+                "Device dropped while sending commands queued while offline, "
+                "%d command(s) stay queued",
+                self.queued_commands,
+            )
+        return True
+
+    async def _async_flush_offline_queue(self) -> bool:
+        """Send the commands queued while offline, one after another.
+
+        Each command is sent on its own, so a comment, trailing & or open
+        quote in one cannot change how the others run.
+
+        Returns:
+            False if the device dropped again before every command was sent.
+
+        """
+        if self._offline_queue is None:
+            return True
+        if not (queued := self._offline_queue.pop_all()):
+            return True
+        LOGGER.info("Sending %d command(s) queued while offline", len(queued))
+        try:
+            for index, entry in enumerate(queued):
+                try:
+                    await self.client.async_shell(entry.command)
+                except FrameoDeviceDisconnectedError:
+                    self._mark_disconnected()
+                    # An action that may have run already is not sent again
+                    if entry.kind is CommandKind.ACTION:
+                        index += 1
+                    self._offline_queue.restore(queued[index:])
+                    return False
+                except FrameoApiError as err:
+                    LOGGER.warning(
+                        "Failed to send command queued while offline: %s: %s",
+                        entry.command,
+                        err,
+                    )
+                else:
+                    self._last_seen = time.monotonic()
+        finally:
+            self._command_cache.clear()
+        return True
+
+    def _queue_offline(
+        self, queue: OfflineCommandQueue, command: str, kind: CommandKind
+    ) -> ShellResult:
+        """Hold a command until the device reconnects.
+
+        Reconnecting starts in the background, unless it already has, so
+        the command is sent even if nothing else touches the device.
+
+        Args:
+            queue: Offline queue of the device.
+            command: ADB shell command.
+            kind: Kind of the command.
+
+        Returns:
+            Empty result marked as queued.
+
+        """
+        queue.add(command, kind)
+        LOGGER.info("Device offline, queued command: %s", command)
+        if self._offline_reconnect_task is None or self._offline_reconnect_task.done():
+            self._offline_reconnect_task = self.hass.async_create_background_task(
+                self._async_reconnect_for_queue(queue),
+                f"{DOMAIN} offline queue reconnect",
+            )
+        return ShellResult(output="", queued=True)
+
+    async def _async_reconnect_for_queue(self, queue: OfflineCommandQueue) -> None:
+        """Reconnect until the queued commands are sent or have expired.
+
+        Args:
+            queue: Offline queue of the device.
+
+        """
+        while queue.prune() > 0:
+            if self._is_connected:
+                # Reconnected by a heartbeat or another command meanwhile
+                await self._async_flush_offline_queue()
+            else:
+                # Sends the queue once the device is back
+                await self.async_reconnect()
+            if not len(queue):
+                return
+            await asyncio.sleep(OFFLINE_RECONNECT_INTERVAL)
+
     async def async_ensure_connected(self) -> bool:
         """Ensure the device is connected, attempting reconnection if needed.
 
@@ -178,22 +892,35 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
         )
         return False
 
-    async def async_refresh_screen_resolution(self) -> tuple[int, int]:
-        """Refresh and return the current screen resolution.
+    @callback
+    def async_invalidate_screen_resolution(self) -> None:
+        """Detect the screen resolution again before the next gesture."""
+        self._geometry_checked = None
+
+    async def async_get_screen_resolution(self) -> tuple[int, int]:
+        """Return the screen resolution to scale gestures to.
 
-        This should be called before gesture-based commands to handle
-        orientation changes.
+        The device is only asked again after something may have changed the
+        geometry (a rotation or resize command, a reconnect or a failed
+        gesture) or once the last check is too old, so a burst of gestures
+        costs no round trips.
 
         Returns:
             Tuple of (width, height).
 
         """
-        await self.async_detect_screen_resolution()
-        LOGGER.info(
-            "Using screen resolution for gesture: %dx%d",
-            self.screen_width,
-            self.screen_height,
-        )
+        now = time.monotonic()
+        if (
+            self._geometry_checked is None
+            or now - self._geometry_checked > SCREEN_GEOMETRY_MAX_AGE
+        ):
+            self._geometry_checked = now
+            await self.async_detect_screen_resolution()
+            LOGGER.debug(
+                "Using screen resolution for gestures: %dx%d",
+                self.screen_width,
+                self.screen_height,
+            )
         return (self.screen_width, self.screen_height)
 
     async def _async_update_data(self) -> FrameoDeviceState:
@@ -220,9 +947,6 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
 
             state = await self.client.async_get_state()
 
-            if not state or "is_on" not in state:
-                raise UpdateFailed("Invalid or empty state response from add-on")
-
             return FrameoDeviceState.from_api_response(
                 state,
                 screen_width=self.screen_width,
@@ -230,18 +954,17 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
             )
 
         except FrameoDeviceDisconnectedError:
-            self._is_connected = False
+            self._mark_disconnected()
             # Try to reconnect
             if await self.async_ensure_connected():
                 # Retry the state fetch after reconnection
                 try:
                     state = await self.client.async_get_state()
-                    if state and "is_on" in state:
-                        return FrameoDeviceState.from_api_response(
-                            state,
-                            screen_width=self.screen_width,
-                            screen_height=self.screen_height,
-                        )
+                    return FrameoDeviceState.from_api_response(
+                        state,
+                        screen_width=self.screen_width,
+                        screen_height=self.screen_height,
+                    )
                 except FrameoApiError:
                     pass
             raise UpdateFailed(
@@ -252,28 +975,296 @@ class FrameoDataUpdateCoordinator(DataUpdateCoordinator[FrameoDeviceState]):
         except Exception as err:
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
-    async def async_execute_command(self, command: str) -> dict[str, Any] | None:
+    async def _async_hedged_shell(self, command: str) -> ShellResult:
+        """Execute a read-only command, hedging it if it runs slow.
+
+        If no response arrives within the recent latency percentile, the same
+        command is sent again and whichever response comes first is used.
+        Only the direct ADB client runs commands in parallel; the addon runs
+        one command per device at a time, so a hedged request would only
+        queue behind the slow one and reads through it are sent once.
+
+        Args:
+            command: Read-only ADB shell command.
+
+        Returns:
+            Command result.
+
+        """
+        if not isinstance(self.client, FrameoAdbClient):
+            return await self.client.async_shell(command)
+        start = time.monotonic()
+        delay = self._read_latency.hedge_delay()
+        pending = {asyncio.ensure_future(self.client.async_shell(command))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                LOGGER.debug("Hedging slow read after %.2fs: %s", delay, command)
+                pending.add(asyncio.ensure_future(self.client.async_shell(command)))
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # If the first response is an error, give the other request a chance
+                if pending and all(task.exception() for task in done):
+                    done, pending = await asyncio.wait(pending)
+
+            for task in done:
+                if task.exception() is None:
+                    self._read_latency.add(time.monotonic() - start)
+                    return task.result()
+            return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def async_execute_command(
+        self,
+        command: str,
+        kind: CommandKind | None = None,
+        cache_ttl: float | None = None,
+    ) -> ShellResult:
         """Execute an ADB command with automatic reconnection.
 
+        After a reconnect the command is only retried if repeating it is
+        safe: reads and idempotent writes are retried, actions such as the
+        power key toggle are not.
+
+        With the offline queue enabled, commands other than reads that cannot
+        reach the device are queued and sent once it reconnects, instead of
+        failing.
+
+        Results of reads are cached, and a read with a cache_ttl is answered
+        from the cache when an equivalent read is no older than that. Any
+        other command clears the cache, as it may change what reads return.
+
+        Args:
+            command: ADB shell command to execute.
+            kind: Kind of the command, classified from the command if omitted.
+            cache_ttl: Maximum age in seconds of a cached result to accept.
+
+        Returns:
+            Command result.
+
+        Raises:
+            FrameoApiError: If command fails after reconnection attempts.
+
+        """
+        kind = kind or classify_command(command)
+
+        if kind is not CommandKind.READ:
+            if changes_geometry(command):
+                self.async_invalidate_screen_resolution()
+            try:
+                return await self._async_execute_uncached(command, kind)
+            finally:
+                self._command_cache.clear()
+
+        if cache_ttl and (cached := self._command_cache.get(command, cache_ttl)):
+            LOGGER.debug("Answering read from cache: %s", command)
+            return cached
+
+        result = await self._async_execute_uncached(command, kind)
+        self._command_cache.put(command, result)
+        return result
+
+    async def async_poll_command(self, command: str) -> ShellResult:
+        """Run a read the integration polls on its own.
+
+        Polled reads differ on every call, so caching them would only evict
+        the results of other reads, and they are not retried after a
+        reconnect as the next poll follows soon anyway.
+
+        Args:
+            command: Read-only ADB shell command.
+
+        Returns:
+            Command result.
+
+        Raises:
+            FrameoApiError: If the command fails.
+
+        """
+        return await self._async_execute_uncached(command, CommandKind.READ, retries=0)
+
+    async def _async_execute_uncached(
+        self, command: str, kind: CommandKind, retries: int | None = None
+    ) -> ShellResult:
+        """Execute an ADB command on the device, retrying by its kind.
+
         Args:
             command: ADB shell command to execute.
+            kind: Kind of the command.
+            retries: Retries after a reconnect, instead of those of the kind.
 
         Returns:
-            Command result or None.
+            Command result.
 
         Raises:
             FrameoApiError: If command fails after reconnection attempts.
 
         """
+        queue = self._offline_queue if kind is not CommandKind.READ else None
+        if queue is not None and len(queue) > 0 and not self._is_connected:
+            # Already waiting for the device; the background reconnect sends
+            # this along, so queued writes do not each retry on their own
+            return self._queue_offline(queue, command, kind)
+
         # Ensure connected before executing
         if not await self.async_ensure_connected():
+            if queue is not None:
+                return self._queue_offline(queue, command, kind)
             raise FrameoApiError("Device not connected")
 
+        if retries is None:
+            retries = COMMAND_RETRIES[kind]
+        attempt = 0
+        while True:
+            try:
+                if kind is CommandKind.READ:
+                    result = await self._async_hedged_shell(command)
+                else:
+                    result = await self.client.async_shell(command)
+            except FrameoDeviceDisconnectedError:
+                self._mark_disconnected()
+                # Reconnect even when not retrying, so the next command finds a live link
+                if not await self.async_reconnect():
+                    if queue is not None:
+                        return self._queue_offline(queue, command, kind)
+                    raise
+                if attempt == retries:
+                    raise
+                attempt += 1
+                LOGGER.debug("Retrying %s command after reconnect: %s", kind, command)
+            else:
+                self._last_seen = time.monotonic()
+                return result
+
+
+class FrameoHealthCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Polls device health metrics, each on its own interval.
+
+    Every tick, the metrics that are due and have an entity listening are
+    gathered with a single shell command. Values of metrics that are not due
+    are carried over from the previous update.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: FrameoDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the health coordinator.
+
+        Args:
+            hass: Home Assistant instance.
+            coordinator: Device coordinator used to run commands.
+
+        """
+        super().__init__(
+            hass,
+            LOGGER,
+            name=f"{DOMAIN}_health",
+            update_interval=HEALTH_UPDATE_INTERVAL,
+            request_refresh_debouncer=Debouncer(
+                hass, LOGGER, cooldown=HEALTH_REFRESH_COOLDOWN, immediate=False
+            ),
+        )
+        self._coordinator = coordinator
+        self._tracked: dict[str, int] = {}
+        self._last_fetched: dict[str, float] = {}
+
+    @callback
+    def async_track_metric(self, key: str) -> CALLBACK_TYPE:
+        """Start fetching a metric until the returned callback is called.
+
+        Args:
+            key: Metric key from HEALTH_METRICS.
+
+        Returns:
+            Callback that stops tracking the metric.
+
+        """
+        self._tracked[key] = self._tracked.get(key, 0) + 1
+        if key not in self._last_fetched:
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def _untrack() -> None:
+            self._tracked[key] -= 1
+            if not self._tracked[key]:
+                del self._tracked[key]
+
+        return _untrack
+
+    def fresh_value(self, key: str, max_age: float) -> Any:
+        """Return a metric's value if it was fetched recently enough.
+
+        Args:
+            key: Metric key.
+            max_age: Maximum age in seconds.
+
+        Returns:
+            The metric's value, or None if it is missing or too old.
+
+        """
+        fetched = self._last_fetched.get(key)
+        if fetched is None or self.data is None or time.monotonic() - fetched > max_age:
+            return None
+        return self.data.get(key)
+
+    @callback
+    def async_set_metric(self, key: str, value: Any) -> None:
+        """Store a value learned outside of polling, e.g. after a command.
+
+        Args:
+            key: Metric key.
+            value: New value.
+
+        """
+        self._last_fetched[key] = time.monotonic()
+        self.async_set_updated_data({**(self.data or {}), key: value})
+
+    def _due_metrics(self, now: float) -> list[str]:
+        """Return the tracked metrics whose interval has elapsed."""
+        # Allow half a tick of slack so a metric is not pushed back a whole tick
+        slack = HEALTH_UPDATE_INTERVAL.total_seconds() / 2
+        return [
+            key
+            for key in self._tracked
+            if key not in self._last_fetched
+            or now - self._last_fetched[key]
+            >= HEALTH_METRICS[key].interval.total_seconds() - slack
+        ]
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch all due metrics in one shell command.
+
+        Nothing is fetched while the device is offline: reconnecting is left
+        to the device coordinator, rather than repeated on every tick.
+
+        Returns:
+            Latest value of every metric fetched so far.
+
+        Raises:
+            UpdateFailed: When the device is offline or communication fails.
+
+        """
+        data = dict(self.data or {})
+        now = time.monotonic()
+        due = self._due_metrics(now)
+        if not due:
+            return data
+        if not self._coordinator.is_connected:
+            raise UpdateFailed("Device is offline")
+
         try:
-            return await self.client.async_shell(command)
-        except FrameoDeviceDisconnectedError:
-            self._is_connected = False
-            # Try to reconnect and retry once
-            if await self.async_reconnect():
-                return await self.client.async_shell(command)
-            raise
\ No newline at end of file
+            result = await self._coordinator.async_poll_command(
+                build_health_command(due)
+            )
+        except FrameoApiError as err:
+            raise UpdateFailed(f"Error fetching health metrics: {err}") from err
+
+        data.update(parse_health_output(result.output))
+        for key in due:
+            self._last_fetched[key] = now
+        return data
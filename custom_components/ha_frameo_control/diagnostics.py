@@ -0,0 +1,52 @@
+"""Diagnostics support for the HA Frameo Control integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import FrameoConfigEntry
+from .api import FrameoAddonApiClient
+from .backend import get_backend_pool
+from .coordinator import FrameoDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: FrameoConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Args:
+        hass: Home Assistant instance.
+        entry: Config entry.
+
+    Returns:
+        Connection and addon client state.
+
+    """
+    coordinator: FrameoDataUpdateCoordinator = entry.runtime_data
+    client = coordinator.client
+    if isinstance(client, FrameoAddonApiClient):
+        client_stats = get_backend_pool(hass).backend_stats(client)
+    else:
+        # Direct ADB connection, not placed on an addon backend
+        client_stats = {
+            "healthy": client.healthy,
+            "in_flight": client.in_flight,
+            "latency": client.latency,
+        }
+
+    return {
+        "connected": coordinator.is_connected,
+        "active_transport": coordinator.active_transport.name,
+        "queued_commands": coordinator.queued_commands,
+        "transports": [
+            {"type": transport.name, "rtt": transport.rtt, "healthy": transport.healthy}
+            for transport in coordinator.transports
+        ],
+        "addon": {
+            "base_url": client.base_url,
+            **client_stats,
+            **client.connection_stats,
+        },
+    }
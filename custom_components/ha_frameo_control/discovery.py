@@ -0,0 +1,198 @@
+"""Background USB discovery for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import FrameoAddonApiClient, FrameoApiError
+from .const import (
+    CONF_ADDON_HOST,
+    CONF_ADDON_PORT,
+    CONF_FALLBACK_SERIAL,
+    CONF_SERIAL,
+    DOMAIN,
+    LOGGER,
+    USB_DISCOVERY_INTERVAL,
+    USB_HOTPLUG_COOLDOWN,
+)
+
+try:
+    from homeassistant.components.usb import async_register_port_event_callback
+except ImportError:  # Home Assistant versions without USB port events
+    async_register_port_event_callback = None
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class FrameoUsbDiscovery:
+    """Keeps a periodically refreshed list of USB serials per addon backend.
+
+    The list is refreshed straight away when Home Assistant reports a USB
+    hotplug event, and a discovery config flow is started for every serial
+    that is not configured yet.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the discovery service.
+
+        Args:
+            hass: Home Assistant instance.
+
+        """
+        self._hass = hass
+        self._entry_ids: set[str] = set()
+        self._serials: dict[str, list[str]] = {}
+        self._scanned_at: dict[str, float] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=USB_HOTPLUG_COOLDOWN,
+            immediate=False,
+            function=self.async_refresh,
+        )
+
+    def cached_serials(self, base_url: str) -> list[str] | None:
+        """Return the serials last seen on a backend, if recent enough.
+
+        Args:
+            base_url: Base URL of the addon backend.
+
+        Returns:
+            Cached serials, or None if the backend was not scanned recently.
+
+        """
+        scanned_at = self._scanned_at.get(base_url)
+        if (
+            scanned_at is None
+            or time.monotonic() - scanned_at > USB_DISCOVERY_INTERVAL.total_seconds()
+        ):
+            return None
+        return self._serials[base_url]
+
+    @callback
+    def async_add_entry(self, entry_id: str) -> None:
+        """Scan the backend used by a config entry.
+
+        Args:
+            entry_id: Config entry ID.
+
+        """
+        self._entry_ids.add(entry_id)
+        if not self._unsubs:
+            self._async_start()
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Stop scanning for a config entry, stopping the service if unused.
+
+        Args:
+            entry_id: Config entry ID.
+
+        """
+        self._entry_ids.discard(entry_id)
+        if not self._entry_ids:
+            self._async_stop()
+
+    @callback
+    def _async_start(self) -> None:
+        """Start periodic and hotplug-triggered refreshes."""
+        self._hass.async_create_task(self._debouncer.async_call())
+        self._unsubs.append(
+            async_track_time_interval(
+                self._hass, self._async_refresh_interval, USB_DISCOVERY_INTERVAL
+            )
+        )
+        if (
+            async_register_port_event_callback is not None
+            and "usb" in self._hass.config.components
+        ):
+            self._unsubs.append(
+                async_register_port_event_callback(self._hass, self._async_port_event)
+            )
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop all refreshes."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        self._debouncer.async_cancel()
+
+    @callback
+    def _async_port_event(self, added: set[Any], removed: set[Any]) -> None:
+        """Refresh soon after a USB device is plugged in."""
+        if added:
+            self._hass.async_create_task(self._debouncer.async_call())
+
+    async def _async_refresh_interval(self, now: datetime) -> None:
+        """Refresh on the periodic timer."""
+        await self.async_refresh()
+
+    async def async_refresh(self) -> None:
+        """Scan every backend and start flows for unconfigured serials."""
+        # Look the clients up each time, as devices can move between backends
+        clients: dict[str, FrameoAddonApiClient] = {}
+        for entry_id in self._entry_ids:
+            if entry := self._hass.config_entries.async_get_entry(entry_id):
+                client = entry.runtime_data.client
+                clients[client.base_url] = client
+        results = await asyncio.gather(
+            *(client.async_get_usb_devices() for client in clients.values()),
+            return_exceptions=True,
+        )
+
+        configured = {
+            serial
+            for entry in self._hass.config_entries.async_entries(DOMAIN)
+            for serial in (entry.unique_id, entry.options.get(CONF_FALLBACK_SERIAL))
+            if serial
+        }
+        for (url, client), result in zip(clients.items(), results):
+            if isinstance(result, FrameoApiError):
+                LOGGER.debug("USB discovery on %s failed: %s", url, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            known = set(self._serials.get(url, []))
+            self._serials[url] = result
+            self._scanned_at[url] = time.monotonic()
+            for serial in result:
+                if serial in known or serial in configured:
+                    continue
+                LOGGER.info("Discovered new USB device %s on %s", serial, url)
+                discovery_flow.async_create_flow(
+                    self._hass,
+                    DOMAIN,
+                    context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                    data={
+                        CONF_SERIAL: serial,
+                        CONF_ADDON_HOST: client.host,
+                        CONF_ADDON_PORT: client.port,
+                    },
+                )
+
+
+def get_usb_discovery(hass: HomeAssistant) -> FrameoUsbDiscovery:
+    """Get the integration-wide USB discovery service.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        The shared discovery service.
+
+    """
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if "discovery" not in domain_data:
+        domain_data["discovery"] = FrameoUsbDiscovery(hass)
+    return domain_data["discovery"]
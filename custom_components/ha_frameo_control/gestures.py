@@ -0,0 +1,144 @@
+"""Screen gestures for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class GestureKind(StrEnum):
+    """Kinds of touch input a gesture can send."""
+
+    TAP = "tap"
+    SWIPE = "swipe"
+    LONG_PRESS = "long_press"
+
+
+# Hold time of a long press when none is given, in milliseconds
+DEFAULT_LONG_PRESS_DURATION = 1000
+
+# "<name>: <kind> <x> <y> [<x2> <y2>] [<duration ms>]" with coordinates in 0..1
+_GESTURE_RE = re.compile(
+    r"^\s*(?P<name>[^:]+?)\s*:\s*(?P<kind>tap|swipe|long_press)"
+    r"(?P<args>(?:\s+[\d.]+)+)\s*$"
+)
+
+# Number of coordinates each kind takes
+_COORDINATES = {GestureKind.TAP: 2, GestureKind.SWIPE: 4, GestureKind.LONG_PRESS: 2}
+
+
+@dataclass(frozen=True, kw_only=True)
+class FrameoGesture:
+    """A touch gesture in coordinates normalized to the screen size."""
+
+    name: str
+    kind: GestureKind
+    x: float
+    y: float
+    x2: float | None = None
+    y2: float | None = None
+    duration: int | None = None
+
+    def build_command(self, width: int, height: int) -> str:
+        """Build the ADB input command for a screen size.
+
+        Args:
+            width: Screen width in pixels.
+            height: Screen height in pixels.
+
+        Returns:
+            ADB shell command.
+
+        """
+        x, y = int(width * self.x), int(height * self.y)
+        if self.kind is GestureKind.TAP:
+            return f"input tap {x} {y}"
+        if self.kind is GestureKind.LONG_PRESS:
+            # A swipe that does not move is a long press
+            duration = self.duration or DEFAULT_LONG_PRESS_DURATION
+            return f"input swipe {x} {y} {x} {y} {duration}"
+        command = f"input swipe {x} {y} {int(width * self.x2)} {int(height * self.y2)}"
+        return f"{command} {self.duration}" if self.duration else command
+
+
+def parse_gesture(definition: str) -> FrameoGesture:
+    """Parse a user-defined gesture.
+
+    Definitions look like "Next: swipe 0.6 0.6 0.1 0.6 300" or
+    "Menu: long_press 0.5 0.5". Coordinates are fractions of the screen
+    width and height, and an optional last number is a duration in ms.
+
+    Args:
+        definition: Gesture definition.
+
+    Returns:
+        The parsed gesture.
+
+    Raises:
+        ValueError: If the definition is malformed.
+
+    """
+    if not (match := _GESTURE_RE.match(definition)):
+        raise ValueError(f"Invalid gesture definition: {definition!r}")
+    kind = GestureKind(match["kind"])
+    args = [float(arg) for arg in match["args"].split()]
+    count = _COORDINATES[kind]
+    coordinates, extra = args[:count], args[count:]
+    if (
+        len(coordinates) < count
+        or len(extra) > (0 if kind is GestureKind.TAP else 1)
+        or not all(0 <= value <= 1 for value in coordinates)
+        # slugify() falls back to "unknown", so check for a usable name here
+        or not any(char.isalnum() for char in match["name"])
+    ):
+        raise ValueError(f"Invalid gesture definition: {definition!r}")
+    return FrameoGesture(
+        name=match["name"],
+        kind=kind,
+        x=coordinates[0],
+        y=coordinates[1],
+        x2=coordinates[2] if kind is GestureKind.SWIPE else None,
+        y2=coordinates[3] if kind is GestureKind.SWIPE else None,
+        duration=int(extra[0]) if extra else None,
+    )
+
+
+class FrameoGestureTable:
+    """Gesture commands compiled for the current screen geometry.
+
+    All commands are built at once the first time a geometry is seen and
+    rebuilt only when the resolution or rotation changes, so a button press
+    is a dictionary lookup.
+    """
+
+    def __init__(self, gestures: Mapping[str, FrameoGesture]) -> None:
+        """Initialize the table.
+
+        Args:
+            gestures: Gestures to compile, by key.
+
+        """
+        self._gestures = dict(gestures)
+        self._geometry: tuple[int, int] | None = None
+        self._commands: dict[str, str] = {}
+
+    def command(self, key: str, width: int, height: int) -> str:
+        """Get the command of a gesture for a screen size.
+
+        Args:
+            key: Gesture key.
+            width: Screen width in pixels.
+            height: Screen height in pixels.
+
+        Returns:
+            ADB shell command.
+
+        """
+        if self._geometry != (width, height):
+            self._geometry = (width, height)
+            self._commands = {
+                gesture_key: gesture.build_command(width, height)
+                for gesture_key, gesture in self._gestures.items()
+            }
+        return self._commands[key]
@@ -0,0 +1,351 @@
+"""Device health metrics for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Printed before each metric's output in the combined shell command
+_SECTION_MARKER = "@@frameo:"
+
+# Multipliers from df size suffixes to megabytes
+_SIZE_UNITS = {"K": 1 / 1024, "M": 1, "G": 1024, "T": 1024 * 1024}
+
+# RSSI reported by Android when Wi-Fi is not associated
+_RSSI_DISCONNECTED = -127
+
+
+@dataclass(frozen=True, kw_only=True)
+class FrameoHealthMetric:
+    """Describes how to fetch and parse one health metric."""
+
+    key: str
+    command: str
+    interval: timedelta
+    parse: Callable[[str], Any]
+
+
+def _parse_battery(output: str) -> dict[str, Any] | None:
+    """Parse `dumpsys battery` into level (%) and temperature (°C)."""
+    values = dict(re.findall(r"^\s*([\w ]+):\s*(.+?)\s*$", output, re.MULTILINE))
+    if values.get("present") == "false":
+        return None
+    return {
+        "level": int(values["level"]) if "level" in values else None,
+        "temperature": (
+            int(values["temperature"]) / 10 if "temperature" in values else None
+        ),
+    }
+
+
+def _parse_size_mb(value: str) -> float:
+    """Convert a df size (e.g. "10.2G", or 1K blocks) to megabytes."""
+    unit = value[-1].upper()
+    if unit in _SIZE_UNITS:
+        return float(value[:-1]) * _SIZE_UNITS[unit]
+    return int(value) / 1024
+
+
+def _parse_free_storage(output: str) -> float:
+    """Parse `df /data` into free megabytes.
+
+    Android 6 toolbox prints a "Free" column, toybox an "Available" one.
+    """
+    rows = [line.split() for line in output.splitlines() if line.strip()]
+    header, row = rows[0], rows[-1]
+    column = header.index("Free" if "Free" in header else "Available")
+    return round(_parse_size_mb(row[column]), 1)
+
+
+def _parse_free_memory(output: str) -> float:
+    """Parse /proc/meminfo into available megabytes."""
+    values = {
+        key: int(value)
+        for key, value in re.findall(r"^(\w+):\s+(\d+) kB", output, re.MULTILINE)
+    }
+    # MemAvailable is missing on older kernels
+    free_kb = values.get("MemAvailable", values.get("MemFree"))
+    if free_kb is None:
+        raise ValueError("No free memory in /proc/meminfo")
+    return round(free_kb / 1024, 1)
+
+
+def _parse_uptime(output: str) -> datetime:
+    """Parse /proc/uptime into the time the device booted."""
+    uptime = timedelta(seconds=float(output.split()[0]))
+    return (dt_util.utcnow() - uptime).replace(microsecond=0)
+
+
+def _parse_wifi_rssi(output: str) -> int | None:
+    """Parse the RSSI (dBm) from `dumpsys wifi`."""
+    match = re.search(r"RSSI: (-?\d+)", output)
+    if match is None or int(match.group(1)) <= _RSSI_DISCONNECTED:
+        return None
+    return int(match.group(1))
+
+
+def _parse_foreground(output: str) -> dict[str, str] | None:
+    """Parse the focused window from `dumpsys window windows`.
+
+    Returns None when no app window has focus (e.g. while the screen is off).
+    """
+    match = re.search(r"mCurrentFocus=.*?\s([\w.]+)/([\w.$]+)", output)
+    if match is None:
+        return None
+    return {"package": match.group(1), "activity": match.group(2)}
+
+
+HEALTH_METRICS: dict[str, FrameoHealthMetric] = {
+    metric.key: metric
+    for metric in (
+        FrameoHealthMetric(
+            key="foreground",
+            command="dumpsys window windows | grep mCurrentFocus",
+            interval=timedelta(minutes=1),
+            parse=_parse_foreground,
+        ),
+        FrameoHealthMetric(
+            key="wifi",
+            command="dumpsys wifi | grep -m 1 mWifiInfo",
+            interval=timedelta(minutes=2),
+            parse=_parse_wifi_rssi,
+        ),
+        FrameoHealthMetric(
+            key="memory",
+            command="grep -E '^(MemAvailable|MemFree):' /proc/meminfo",
+            interval=timedelta(minutes=5),
+            parse=_parse_free_memory,
+        ),
+        FrameoHealthMetric(
+            key="battery",
+            command="dumpsys battery",
+            interval=timedelta(minutes=10),
+            parse=_parse_battery,
+        ),
+        FrameoHealthMetric(
+            key="uptime",
+            command="cat /proc/uptime",
+            interval=timedelta(minutes=30),
+            parse=_parse_uptime,
+        ),
+        FrameoHealthMetric(
+            key="storage",
+            command="df /data",
+            interval=timedelta(hours=1),
+            parse=_parse_free_storage,
+        ),
+    )
+}
+
+
+def build_launch_command(package: str, intent: str) -> str:
+    """Build a command that launches an app only if it is not in front.
+
+    The check runs on the device, so it costs no extra round trip. `-W`
+    makes `am start` wait for the launch and report its timing.
+
+    Args:
+        package: Package of the app.
+        intent: Arguments to `am start` that launch it.
+
+    Returns:
+        ADB shell command string.
+
+    """
+    return (
+        f"dumpsys window windows | grep -q 'mCurrentFocus=.* {package}/'"
+        f" || am start -W {intent}"
+    )
+
+
+def parse_launch_output(output: str) -> dict[str, Any] | None:
+    """Parse the timing reported by `am start -W`.
+
+    Args:
+        output: Output of the command built by build_launch_command.
+
+    Returns:
+        Launch state (COLD, WARM or HOT where reported) and total and wait
+        times in ms, or None if nothing was launched.
+
+    """
+    if not output.strip():
+        return None
+    values = dict(re.findall(r"^(\w+): (\S+)", output, re.MULTILINE))
+    return {
+        "state": values.get("LaunchState"),
+        "total_time": int(values["TotalTime"]) if "TotalTime" in values else None,
+        "wait_time": int(values["WaitTime"]) if "WaitTime" in values else None,
+    }
+
+
+def build_health_command(keys: Iterable[str]) -> str:
+    """Build one shell command that gathers all the given metrics.
+
+    Args:
+        keys: Metric keys to gather.
+
+    Returns:
+        ADB shell command string.
+
+    """
+    return "; ".join(
+        f"echo {_SECTION_MARKER}{key}; {HEALTH_METRICS[key].command}" for key in keys
+    )
+
+
+def parse_health_output(output: str) -> dict[str, Any]:
+    """Split the combined command output and parse each metric.
+
+    Metrics whose output cannot be parsed are reported as None.
+
+    Args:
+        output: Output of the command built by build_health_command.
+
+    Returns:
+        Parsed value for each metric found in the output.
+
+    """
+    results: dict[str, Any] = {}
+    for key, section in _split_sections(output).items():
+        if (metric := HEALTH_METRICS.get(key)) is None:
+            continue
+        try:
+            results[key] = metric.parse(section)
+        except (ValueError, IndexError, KeyError):
+            results[key] = None
+    return results
+
+
+def _split_sections(output: str) -> dict[str, str]:
+    """Split the output of a combined command into its sections, by key."""
+    sections: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for line in output.splitlines():
+        if line.startswith(_SECTION_MARKER):
+            current = sections.setdefault(line[len(_SECTION_MARKER):].strip(), [])
+        elif current is not None:
+            current.append(line)
+    return {key: "\n".join(lines) for key, lines in sections.items()}
+
+
+# Commands whose output makes up a state snapshot, by field
+_SNAPSHOT_COMMANDS = {
+    "power": "dumpsys power | grep -m 1 mWakefulness=",
+    "brightness": "settings get system screen_brightness",
+    "auto_rotate": "settings get system accelerometer_rotation",
+    "rotation": "settings get system user_rotation",
+    "foreground": HEALTH_METRICS["foreground"].command,
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class FrameoStateSnapshot:
+    """User-visible state of a device, as captured by one probe."""
+
+    is_on: bool
+    brightness: int | None
+    auto_rotate: bool | None
+    rotation: int | None
+    foreground: dict[str, str] | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as a dictionary, e.g. for a service response."""
+        return asdict(self)
+
+
+def build_snapshot_command() -> str:
+    """Build one shell command that reads everything a snapshot holds.
+
+    Returns:
+        ADB shell command string.
+
+    """
+    return "; ".join(
+        f"echo {_SECTION_MARKER}{key}; {command}"
+        for key, command in _SNAPSHOT_COMMANDS.items()
+    )
+
+
+def _parse_setting(value: str | None) -> int | None:
+    """Parse an integer setting, which reads "null" when it was never set."""
+    try:
+        return int(value.strip()) if value is not None else None
+    except ValueError:
+        return None
+
+
+def parse_snapshot_output(output: str) -> FrameoStateSnapshot:
+    """Parse the output of the snapshot command.
+
+    Args:
+        output: Output of the command built by build_snapshot_command.
+
+    Returns:
+        The captured state.
+
+    Raises:
+        ValueError: If the output does not contain the power state.
+
+    """
+    sections = _split_sections(output)
+    if "mWakefulness=" not in sections.get("power", ""):
+        raise ValueError("No power state in snapshot output")
+    auto_rotate = _parse_setting(sections.get("auto_rotate"))
+    return FrameoStateSnapshot(
+        is_on="mWakefulness=Awake" in sections["power"],
+        brightness=_parse_setting(sections.get("brightness")),
+        auto_rotate=bool(auto_rotate) if auto_rotate is not None else None,
+        rotation=_parse_setting(sections.get("rotation")),
+        foreground=_parse_foreground(sections.get("foreground", "")),
+    )
+
+
+def _set_if_changed(key: str, value: int) -> str:
+    """Build a command that writes a system setting unless it already matches."""
+    return (
+        f'[ "$(settings get system {key})" = {value} ]'
+        f" || settings put system {key} {value}"
+    )
+
+
+def build_restore_command(snapshot: FrameoStateSnapshot, power_key: str) -> str:
+    """Build one shell command that returns the device to a snapshot.
+
+    Every step checks the current value on the device first, so fields that
+    already match are left alone and the command is safe to repeat. The
+    screen is turned on before and off after everything else, so the
+    foreground app can be launched.
+
+    Args:
+        snapshot: State to restore.
+        power_key: Command that toggles the screen.
+
+    Returns:
+        ADB shell command string.
+
+    """
+    is_awake = "dumpsys power | grep -q mWakefulness=Awake"
+    steps = []
+    if snapshot.is_on:
+        steps.append(f"{is_awake} || {power_key}")
+    if snapshot.brightness is not None:
+        steps.append(_set_if_changed("screen_brightness", snapshot.brightness))
+    if snapshot.auto_rotate is not None:
+        steps.append(_set_if_changed("accelerometer_rotation", int(snapshot.auto_rotate)))
+    if snapshot.rotation is not None and not snapshot.auto_rotate:
+        steps.append(_set_if_changed("user_rotation", snapshot.rotation))
+    if snapshot.foreground is not None:
+        package, activity = snapshot.foreground["package"], snapshot.foreground["activity"]
+        steps.append(
+            f"dumpsys window windows | grep -q 'mCurrentFocus=.* {package}/'"
+            f" || am start -n '{package}/{activity}'"
+        )
+    if not snapshot.is_on:
+        steps.append(f"{is_awake} && {power_key}")
+    # Always succeed, so a last step that found nothing to do is not an error
+    return "; ".join(steps) + "; true"
@@ -1,16 +1,25 @@
 """Light entity for Frameo screen control."""
 from __future__ import annotations
 
+import asyncio
+from dataclasses import replace
+from datetime import datetime
 from typing import Any
 
 from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode, LightEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import FrameoConfigEntry
 from .api import FrameoApiError
-from .const import ADB_CMD_BRIGHTNESS, ADB_CMD_POWER_KEY, DOMAIN, LOGGER
+from .const import (
+    ADB_CMD_BRIGHTNESS,
+    BRIGHTNESS_DEBOUNCE,
+    DOMAIN,
+    LOGGER,
+)
 from .coordinator import FrameoDataUpdateCoordinator, FrameoDeviceState
 
 
@@ -32,7 +41,12 @@ async def async_setup_entry(
 
 
 class FrameoScreenLight(CoordinatorEntity[FrameoDataUpdateCoordinator], LightEntity):
-    """Represents the Frameo device screen as a dimmable light."""
+    """Represents the Frameo device screen as a dimmable light.
+
+    Brightness changes are debounced: the requested brightness is shown
+    right away, and only the last value of a burst is written to the device.
+    A write still in flight when a newer value is due is cancelled.
+    """
 
     _attr_has_entity_name = True
     _attr_name = "Screen"
@@ -52,12 +66,14 @@ class FrameoScreenLight(CoordinatorEntity[FrameoDataUpdateCoordinator], LightEnt
 
         """
         super().__init__(coordinator)
-        self._client = coordinator.client
         self._attr_unique_id = f"{entry.entry_id}_screen"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.entry_id)},
             "name": entry.title,
         }
+        self._target_brightness: int | None = None
+        self._brightness_unsub: CALLBACK_TYPE | None = None
+        self._brightness_task: asyncio.Task[None] | None = None
 
     @property
     def _state(self) -> FrameoDeviceState | None:
@@ -67,6 +83,9 @@ class FrameoScreenLight(CoordinatorEntity[FrameoDataUpdateCoordinator], LightEnt
     @property
     def is_on(self) -> bool | None:
         """Return true if the screen is on."""
+        if self._target_brightness is not None:
+            # Setting a brightness also turns the screen on
+            return True
         if self._state is None:
             return None
         return self._state.is_on
@@ -74,10 +93,17 @@ class FrameoScreenLight(CoordinatorEntity[FrameoDataUpdateCoordinator], LightEnt
     @property
     def brightness(self) -> int | None:
         """Return the brightness of the screen (0-255)."""
+        if self._target_brightness is not None:
+            return self._target_brightness
         if self._state is None:
             return None
         return self._state.brightness
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop a pending brightness write when the entity is removed."""
+        self._cancel_brightness_write()
+        await super().async_will_remove_from_hass()
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the screen on and/or set brightness.
 
@@ -85,25 +111,77 @@ class FrameoScreenLight(CoordinatorEntity[FrameoDataUpdateCoordinator], LightEnt
             **kwargs: Optional parameters including ATTR_BRIGHTNESS.
 
         """
-        # Refresh state before action to ensure we have current state
-        await self.coordinator.async_request_refresh()
+        if ATTR_BRIGHTNESS in kwargs:
+            self._schedule_brightness_write(kwargs[ATTR_BRIGHTNESS])
+            return
 
+        # The command does not depend on the current state, so no refresh first
         try:
-            if ATTR_BRIGHTNESS in kwargs:
-                new_brightness = kwargs[ATTR_BRIGHTNESS]
-                LOGGER.debug("Setting Frameo brightness to %s", new_brightness)
-                await self.coordinator.async_execute_command(
-                    ADB_CMD_BRIGHTNESS.format(brightness=new_brightness)
-                )
+            await self.coordinator.async_set_power(True)
+        except FrameoApiError as err:
+            LOGGER.error("Failed to turn on screen: %s", err)
+
+    @callback
+    def _schedule_brightness_write(self, brightness: int) -> None:
+        """Show a new brightness now and write it once changes settle.
 
-            if not self.is_on:
-                LOGGER.debug("Turning on Frameo screen")
-                await self.coordinator.async_execute_command(ADB_CMD_POWER_KEY)
+        Args:
+            brightness: Requested brightness (0-255).
+
+        """
+        self._cancel_brightness_write()
+        self._target_brightness = brightness
+        self.async_write_ha_state()
+        self._brightness_unsub = async_call_later(
+            self.hass, BRIGHTNESS_DEBOUNCE, self._start_brightness_write
+        )
+
+    @callback
+    def _cancel_brightness_write(self) -> None:
+        """Cancel a scheduled or in-flight brightness write."""
+        if self._brightness_unsub is not None:
+            self._brightness_unsub()
+            self._brightness_unsub = None
+        if self._brightness_task is not None:
+            LOGGER.debug("Cancelling superseded brightness write")
+            self._brightness_task.cancel()
+            self._brightness_task = None
+
+    @callback
+    def _start_brightness_write(self, now: datetime) -> None:
+        """Write the latest requested brightness once the debounce window ends."""
+        self._brightness_unsub = None
+        if self._target_brightness is None:
+            return
+        self._brightness_task = self.hass.async_create_task(
+            self._async_write_brightness(self._target_brightness),
+            f"{DOMAIN} brightness write",
+        )
+
+    async def _async_write_brightness(self, brightness: int) -> None:
+        """Set the brightness on the device, turning the screen on if needed.
 
-            # Refresh state after action
-            await self.coordinator.async_request_refresh()
+        Args:
+            brightness: Brightness to set (0-255).
+
+        """
+        try:
+            LOGGER.debug("Setting Frameo brightness to %s", brightness)
+            await self.coordinator.async_execute_command(
+                ADB_CMD_BRIGHTNESS.format(brightness=brightness)
+            )
+            await self.coordinator.async_set_power(True)
+            if (state := self.coordinator.data) is not None:
+                self.coordinator.async_set_updated_data(
+                    replace(state, brightness=brightness)
+                )
         except FrameoApiError as err:
-            LOGGER.error("Failed to turn on screen: %s", err)
+            LOGGER.error("Failed to set screen brightness: %s", err)
+
+        # Show the state reported by the device again
+        self._brightness_task = None
+        self._target_brightness = None
+        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the screen off.
@@ -112,17 +190,13 @@ class FrameoScreenLight(CoordinatorEntity[FrameoDataUpdateCoordinator], LightEnt
             **kwargs: Optional parameters (unused).
 
         """
-        # Refresh state before action
-        await self.coordinator.async_request_refresh()
+        # Turning off supersedes a brightness change that has not been written
+        if self._target_brightness is not None:
+            self._cancel_brightness_write()
+            self._target_brightness = None
 
+        # The command does not depend on the current state, so no refresh first
         try:
-            if self.is_on:
-                LOGGER.debug("Turning off Frameo screen")
-                await self.coordinator.async_execute_command(ADB_CMD_POWER_KEY)
-
-            # Refresh state after action
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_power(False)
         except FrameoApiError as err:
-            LOGGER.error("Failed to turn off screen: %s", err)
-
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+            LOGGER.error("Failed to turn off screen: %s", err)
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""Logcat subscriptions for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import asyncio
+import re
+import shlex
+from typing import TYPE_CHECKING, Any
+
+from .api import FrameoApiError
+from .const import (
+    ADB_CMD_DEVICE_TIME,
+    DEFAULT_LOGCAT_INTERVAL,
+    EVENT_LOGCAT,
+    LOGCAT_QUEUE_SIZE,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import FrameoDataUpdateCoordinator
+
+# Matches a line printed with `logcat -v time`, e.g.
+# "10-19 12:34:56.789 E/AndroidRuntime( 1234): FATAL EXCEPTION: main"
+_LINE_RE = re.compile(
+    r"^(?P<time>\d\d-\d\d \d\d:\d\d:\d\d\.\d{3})\s+"
+    r"(?P<level>[VDIWEFA])/(?P<tag>.*?)\(\s*(?P<pid>\d+)\):\s?(?P<message>.*)$"
+)
+
+
+def build_logcat_command(
+    tags: list[str], pattern: str | None, since: str
+) -> str:
+    """Build a logcat command that filters on the device.
+
+    Only lines logged at or after `since` are printed, so each poll transfers
+    the new lines instead of the whole log buffer.
+
+    Args:
+        tags: Tag filters (e.g. "AndroidRuntime:E"), empty for all tags.
+        pattern: Extended regex the message line must match.
+        since: Device timestamp in logcat's "MM-DD hh:mm:ss.mmm" format.
+
+    Returns:
+        ADB shell command string.
+
+    """
+    command = f"logcat -d -v time -T {shlex.quote(since)}"
+    if tags:
+        command += " -s " + " ".join(shlex.quote(tag) for tag in tags)
+    if pattern:
+        command += f" | grep -E {shlex.quote(pattern)}"
+    return command
+
+
+class FrameoLogcatSubscription:
+    """Tails the device log and fires an event for every matching line.
+
+    A poller task fetches new lines into a bounded queue and a consumer task
+    turns them into events. When the queue is full the poller waits before
+    fetching more, so a slow consumer throttles traffic to the device.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: FrameoDataUpdateCoordinator,
+        entry_id: str,
+        name: str,
+        tags: list[str],
+        pattern: str | None = None,
+        interval: float = DEFAULT_LOGCAT_INTERVAL,
+    ) -> None:
+        """Initialize the subscription.
+
+        Args:
+            hass: Home Assistant instance.
+            coordinator: Coordinator used to run commands on the device.
+            entry_id: Config entry ID, included in fired events.
+            name: Subscription name, included in fired events.
+            tags: Tag filters applied by logcat on the device.
+            pattern: Extended regex applied by grep on the device.
+            interval: Seconds between polls.
+
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry_id = entry_id
+        self.name = name
+        self.tags = tags
+        self.pattern = pattern
+        self.interval = interval
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=LOGCAT_QUEUE_SIZE
+        )
+        self._since: str | None = None
+        self._seen_at_since: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the poller and consumer tasks."""
+        self._tasks = [
+            self._hass.async_create_background_task(
+                self._async_poll_loop(), f"frameo logcat poller {self.name}"
+            ),
+            self._hass.async_create_background_task(
+                self._async_consume_loop(), f"frameo logcat consumer {self.name}"
+            ),
+        ]
+
+    def stop(self) -> None:
+        """Stop the subscription and drop any queued lines."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _async_fetch(self) -> list[dict[str, Any]]:
+        """Fetch the lines logged since the previous poll.
+
+        Returns:
+            Parsed log lines, oldest first.
+
+        """
+        if self._since is None:
+            # Start from the device's current time so the backlog is skipped
+            result = await self._coordinator.async_poll_command(ADB_CMD_DEVICE_TIME)
+            self._since = result.output.strip() or None
+            return []
+
+        result = await self._coordinator.async_poll_command(
+            build_logcat_command(self.tags, self.pattern, self._since)
+        )
+        output = result.output
+
+        lines: list[dict[str, Any]] = []
+        for raw in output.splitlines():
+            match = _LINE_RE.match(raw)
+            if match is None:
+                continue
+            # -T is inclusive, so lines at the last timestamp come back again
+            if match["time"] == self._since and raw in self._seen_at_since:
+                continue
+            if match["time"] != self._since:
+                self._since = match["time"]
+                self._seen_at_since = set()
+            self._seen_at_since.add(raw)
+            lines.append(
+                {
+                    "time": match["time"],
+                    "level": match["level"],
+                    "tag": match["tag"].strip(),
+                    "pid": int(match["pid"]),
+                    "message": match["message"],
+                }
+            )
+        return lines
+
+    async def _async_poll_loop(self) -> None:
+        """Poll the device and feed new lines into the queue."""
+        while True:
+            try:
+                lines = await self._async_fetch()
+            except FrameoApiError as err:
+                LOGGER.debug("Logcat poll '%s' failed: %s", self.name, err)
+                lines = []
+            for line in lines:
+                # Blocks while the queue is full
+                await self._queue.put(line)
+            await asyncio.sleep(self.interval)
+
+    async def _async_consume_loop(self) -> None:
+        """Fire an event for each queued line."""
+        while True:
+            line = await self._queue.get()
+            self._hass.bus.async_fire(
+                EVENT_LOGCAT,
+                {
+                    "entry_id": self._entry_id,
+                    "subscription": self.name,
+                    **line,
+                },
+            )
+            self._queue.task_done()
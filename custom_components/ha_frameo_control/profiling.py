@@ -0,0 +1,262 @@
+"""On-demand profiling of device requests for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EVENT_PROFILE, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .adb import FrameoAdbClient
+    from .api import FrameoAddonApiClient
+
+type TraceCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+# httpcore trace events that end each phase of a request
+_SENT = "http11.send_request_body.complete"
+_SENDING = "http11.send_request_headers.started"
+_HEADERS = "http11.receive_response_headers.complete"
+_BODY = "http11.receive_response_body.complete"
+
+# A metric of a Server-Timing header, e.g. "adb;dur=12.5"
+_SERVER_TIMING_RE = re.compile(r"dur=([\d.]+)")
+
+
+class FrameoRequestTiming:
+    """Timestamps of the phases of one addon request."""
+
+    __slots__ = ("endpoint", "start", "marks", "addon", "_forward")
+
+    def __init__(self, endpoint: str, forward: TraceCallback | None) -> None:
+        """Start timing a request.
+
+        Args:
+            endpoint: Addon endpoint or ADB service of the request.
+            forward: Trace callback the client would otherwise have used.
+
+        """
+        self.endpoint = endpoint
+        self.start = time.monotonic()
+        self.marks: dict[str, float] = {}
+        self.addon: float | None = None
+        self._forward = forward
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """Record an httpcore trace event."""
+        self.marks[event_name] = time.monotonic()
+        if self._forward is not None:
+            await self._forward(event_name, info)
+
+    def mark(self, name: str) -> None:
+        """Record the end of a phase measured by the client."""
+        self.marks[name] = time.monotonic()
+
+    def set_server_timing(self, header: str | None) -> None:
+        """Record the addon's own processing time from a Server-Timing header.
+
+        The addon may report several metrics; the longest is taken as its
+        total processing time.
+        """
+        if header and (durations := _SERVER_TIMING_RE.findall(header)):
+            self.addon = max(float(duration) for duration in durations) / 1000
+
+    def phases(self) -> dict[str, float]:
+        """Return the duration of each phase that was observed, in seconds.
+
+        The phases are waiting for a pooled connection (queue), sending the
+        request (send), waiting for the response headers (wait, which
+        includes the addon's processing), reading the body (receive),
+        decoding it (parse) and the total.
+        """
+        marks = self.marks
+        bounds = [
+            ("queue", self.start, marks.get(_SENDING)),
+            ("send", marks.get(_SENDING), marks.get(_SENT)),
+            ("wait", marks.get(_SENT), marks.get(_HEADERS)),
+            ("receive", marks.get(_HEADERS), marks.get(_BODY)),
+            ("parse", marks.get("response"), marks.get("parsed")),
+            ("total", self.start, marks.get("parsed")),
+        ]
+        phases = {
+            name: end - begin
+            for name, begin, end in bounds
+            if begin is not None and end is not None
+        }
+        if self.addon is not None:
+            phases["addon"] = self.addon
+        return phases
+
+
+class FrameoProfiler:
+    """Times device requests for a window of time or number of operations.
+
+    While active, the client passes every request through start() and
+    record(); when no profiler is attached the client skips all of it. An
+    add-on client is shared by every device placed on the add-on, so its
+    profile covers all of their requests. An optional cProfile of the event
+    loop thread is written to the config directory, with a text report
+    limited to this integration's code.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: FrameoAddonApiClient | FrameoAdbClient,
+        duration: float | None = None,
+        operations: int | None = None,
+        cprofile: bool = False,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            hass: Home Assistant instance.
+            client: Addon or direct ADB client whose requests are timed.
+            duration: Seconds to profile for.
+            operations: Number of requests to profile.
+            cprofile: Whether to also run cProfile.
+
+        """
+        self._hass = hass
+        self._client = client
+        self._duration = duration
+        self._operations = operations
+        self._timings: list[FrameoRequestTiming] = []
+        self._profile = cProfile.Profile() if cprofile else None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._started = time.monotonic()
+        self._stopped = False
+
+    @property
+    def active(self) -> bool:
+        """Return whether the profiler is attached to its client."""
+        return self._client.profiler is self
+
+    @callback
+    def async_start(self) -> None:
+        """Attach to the client and start profiling."""
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Python allows one profiler per thread at a time
+                LOGGER.warning("Another profiler is running, skipping cProfile")
+                self._profile = None
+        if self._duration:
+            self._unsub_timer = async_call_later(
+                self._hass, self._duration, self._async_timer_done
+            )
+        self._started = time.monotonic()
+        self._client.profiler = self
+        LOGGER.info(
+            "Profiling requests to %s for %s",
+            self._client.base_url,
+            f"{self._operations} operations" if self._operations else f"{self._duration} s",
+        )
+
+    def start(
+        self, endpoint: str, forward: TraceCallback | None = None
+    ) -> FrameoRequestTiming:
+        """Start timing a request.
+
+        Args:
+            endpoint: Addon endpoint or ADB service of the request.
+            forward: Trace callback the client would otherwise have used.
+
+        Returns:
+            Timing to pass back to record().
+
+        """
+        return FrameoRequestTiming(endpoint, forward)
+
+    def record(self, timing: FrameoRequestTiming) -> None:
+        """Record a finished request, stopping once enough were profiled.
+
+        Args:
+            timing: Timing returned by start().
+
+        """
+        self._timings.append(timing)
+        if self._operations and len(self._timings) >= self._operations:
+            self._hass.async_create_task(self.async_stop())
+
+    async def _async_timer_done(self, now: Any) -> None:
+        """Stop when the profiling window ends."""
+        self._unsub_timer = None
+        await self.async_stop()
+
+    async def async_stop(self) -> None:
+        """Stop profiling, then log and fire the summary.
+
+        The timer and cProfile are stopped even if another profiler has
+        since replaced this one on the client. Stopping again does nothing.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        if self.active:
+            self._client.profiler = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+        summary: dict[str, Any] = {
+            "addon": self._client.base_url,
+            "duration": round(time.monotonic() - self._started, 3),
+            "operations": len(self._timings),
+            "endpoints": self._summarize(),
+        }
+        if self._profile is not None:
+            self._profile.disable()
+            path = self._hass.config.path(
+                f"{DOMAIN}_{dt_util.now():%Y%m%d_%H%M%S}.prof"
+            )
+            await self._hass.async_add_executor_job(
+                _write_cprofile, self._profile, path
+            )
+            summary["cprofile"] = path
+
+        LOGGER.info("Profile of %s: %s", self._client.base_url, summary)
+        self._hass.bus.async_fire(EVENT_PROFILE, summary)
+
+    def _summarize(self) -> dict[str, dict[str, Any]]:
+        """Summarize phase durations per endpoint, in milliseconds."""
+        samples: dict[str, dict[str, list[float]]] = {}
+        for timing in self._timings:
+            phases = samples.setdefault(timing.endpoint, {})
+            for phase, duration in timing.phases().items():
+                phases.setdefault(phase, []).append(duration * 1000)
+        return {
+            endpoint: {
+                "count": len(phases.get("total", [])),
+                **{
+                    phase: {
+                        "p50": round(statistics.median(values), 2),
+                        "max": round(max(values), 2),
+                    }
+                    for phase, values in phases.items()
+                },
+            }
+            for endpoint, phases in samples.items()
+        }
+
+
+def _write_cprofile(profile: cProfile.Profile, path: str) -> None:
+    """Write a cProfile dump and a text report of this integration's functions."""
+    profile.dump_stats(path)
+    report = io.StringIO()
+    stats = pstats.Stats(profile, stream=report).sort_stats("cumulative")
+    stats.print_stats(str(Path(__file__).parent))
+    Path(path).with_suffix(".txt").write_text(report.getvalue(), encoding="utf-8")
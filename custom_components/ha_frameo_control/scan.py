@@ -0,0 +1,134 @@
+"""Local network scan for Frameo devices with wireless ADB enabled."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from ipaddress import IPv4Address, IPv4Network
+from typing import TYPE_CHECKING
+
+from homeassistant.components import network
+
+from .adb import A_CNXN, ADB_CONNECT_PAYLOAD, ADB_MAX_PAYLOAD, ADB_VERSION, build_packet
+from .const import (
+    DEFAULT_DEVICE_PORT,
+    LAN_SCAN_CONCURRENCY,
+    LAN_SCAN_MIN_PREFIX,
+    LAN_SCAN_TIMEOUT,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Replies from adbd to a connect request: AUTH if it wants a key, else CNXN
+_ADB_REPLIES = frozenset({b"AUTH", b"CNXN"})
+
+
+async def async_probe_adb(host: str, port: int, timeout: float) -> bool:
+    """Check whether an ADB daemon is listening on a host.
+
+    Opens a TCP connection, sends an ADB connect request and checks that the
+    reply is an ADB packet. No key is offered, so the device shows no prompt.
+
+    Args:
+        host: Host address.
+        port: TCP port.
+        timeout: Timeout in seconds for connecting and for the reply.
+
+    Returns:
+        True if the host answered like an ADB daemon.
+
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout
+        )
+    except (OSError, TimeoutError):
+        return False
+    try:
+        writer.write(
+            build_packet(A_CNXN, ADB_VERSION, ADB_MAX_PAYLOAD, ADB_CONNECT_PAYLOAD)
+        )
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.readexactly(4), timeout)
+        return reply in _ADB_REPLIES
+    except (OSError, TimeoutError, asyncio.IncompleteReadError):
+        return False
+    finally:
+        writer.close()
+
+
+async def async_scan_hosts(
+    hosts: Iterable[IPv4Address | str],
+    port: int = DEFAULT_DEVICE_PORT,
+    concurrency: int = LAN_SCAN_CONCURRENCY,
+    timeout: float = LAN_SCAN_TIMEOUT,
+) -> list[str]:
+    """Probe many hosts for ADB with bounded concurrency.
+
+    Args:
+        hosts: Addresses to probe.
+        port: TCP port to probe.
+        concurrency: Maximum number of probes in flight.
+        timeout: Per-host timeout in seconds.
+
+    Returns:
+        Addresses that answered like an ADB daemon, in input order.
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str) -> bool:
+        async with semaphore:
+            return await async_probe_adb(host, port, timeout)
+
+    addresses = [str(host) for host in hosts]
+    results = await asyncio.gather(*(_probe(host) for host in addresses))
+    return [host for host, found in zip(addresses, results) if found]
+
+
+async def async_get_scan_networks(hass: HomeAssistant) -> list[IPv4Network]:
+    """Get the local IPv4 networks to scan.
+
+    Networks larger than LAN_SCAN_MIN_PREFIX are narrowed to the block around
+    Home Assistant's own address, so a scan stays a few seconds long.
+
+    Args:
+        hass: Home Assistant instance.
+
+    Returns:
+        Networks of the enabled adapters.
+
+    """
+    networks: list[IPv4Network] = []
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for ipv4 in adapter["ipv4"]:
+            prefix = max(ipv4["network_prefix"], LAN_SCAN_MIN_PREFIX)
+            subnet = IPv4Network(f"{ipv4['address']}/{prefix}", strict=False)
+            if not subnet.is_loopback and subnet not in networks:
+                networks.append(subnet)
+    return networks
+
+
+async def async_scan_for_devices(
+    hass: HomeAssistant, port: int = DEFAULT_DEVICE_PORT
+) -> list[str]:
+    """Scan the local networks for devices with wireless ADB enabled.
+
+    Args:
+        hass: Home Assistant instance.
+        port: ADB port to probe.
+
+    Returns:
+        Addresses of the devices found.
+
+    """
+    networks = await async_get_scan_networks(hass)
+    LOGGER.info("Scanning %s for wireless ADB devices", ", ".join(map(str, networks)))
+    found = await async_scan_hosts(
+        (host for subnet in networks for host in subnet.hosts()), port
+    )
+    LOGGER.info("Found wireless ADB devices: %s", found)
+    return found
@@ -0,0 +1,189 @@
+"""Screen capture from the raw framebuffer for the HA Frameo Control integration."""
+from __future__ import annotations
+
+import gzip
+import math
+import struct
+import zlib
+from dataclasses import dataclass
+from enum import IntEnum
+
+# Raw screencap output starts with width, height and pixel format; Android 9
+# and later add the color space
+_HEADER = struct.Struct("<3I")
+_HEADER_SIZES = (_HEADER.size + 4, _HEADER.size)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class PixelFormat(IntEnum):
+    """Android pixel formats screencap writes."""
+
+    RGBA_8888 = 1
+    RGBX_8888 = 2
+    RGB_888 = 3
+    RGB_565 = 4
+    BGRA_8888 = 5
+
+
+# Bytes per pixel of each format
+_BYTES_PER_PIXEL = {
+    PixelFormat.RGBA_8888: 4,
+    PixelFormat.RGBX_8888: 4,
+    PixelFormat.RGB_888: 3,
+    PixelFormat.RGB_565: 2,
+    PixelFormat.BGRA_8888: 4,
+}
+
+# Byte offsets of red, green and blue in a pixel of the byte-aligned formats
+_CHANNELS = {
+    PixelFormat.RGBA_8888: (0, 1, 2),
+    PixelFormat.RGBX_8888: (0, 1, 2),
+    PixelFormat.RGB_888: (0, 1, 2),
+    PixelFormat.BGRA_8888: (2, 1, 0),
+}
+
+# Translation tables widening RGB 565 fields to 8 bits. Red and blue each sit
+# in one byte; green is split, so its two parts are shifted into a 6-bit index
+_RED_565 = bytes((hi >> 3) * 255 // 31 for hi in range(256))
+_BLUE_565 = bytes((lo & 0x1F) * 255 // 31 for lo in range(256))
+_GREEN_HIGH_565 = bytes((hi & 0x07) << 3 for hi in range(256))
+_GREEN_LOW_565 = bytes(lo >> 5 for lo in range(256))
+_GREEN_565 = bytes(g * 255 // 63 for g in range(64)) + bytes(192)
+
+
+def build_capture_command(compress: bool) -> str:
+    """Build the command writing the raw framebuffer to stdout.
+
+    Args:
+        compress: Whether to gzip the frame on the device for the transfer.
+
+    Returns:
+        ADB command, to run without a terminal so binary output is kept.
+
+    """
+    # Some devices print linker warnings to stderr, which would corrupt the frame
+    command = "screencap 2>/dev/null"
+    return f"{command} | gzip -1" if compress else command
+
+
+@dataclass(frozen=True, kw_only=True)
+class FrameoScreenshot:
+    """A captured screen as 8-bit RGB rows."""
+
+    width: int
+    height: int
+    rgb: bytes
+
+    def to_png(self) -> bytes:
+        """Encode the screenshot as a PNG image."""
+        row = self.width * 3
+        # Each scanline starts with its filter type, 0 for none
+        scanlines = b"".join(
+            b"\x00" + self.rgb[start : start + row]
+            for start in range(0, len(self.rgb), row)
+        )
+        return b"".join(
+            (
+                _PNG_SIGNATURE,
+                _png_chunk(
+                    b"IHDR", struct.pack(">2I5B", self.width, self.height, 8, 2, 0, 0, 0)
+                ),
+                _png_chunk(b"IDAT", zlib.compress(scanlines)),
+                _png_chunk(b"IEND", b""),
+            )
+        )
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    """Build a PNG chunk with its length and checksum."""
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def _parse_header(raw: bytes) -> tuple[int, int, PixelFormat, int, int]:
+    """Find the frame's geometry from its header and size.
+
+    Returns:
+        Width, height, pixel format, header size and row stride in bytes.
+
+    Raises:
+        ValueError: If the data is not a raw frame.
+
+    """
+    if len(raw) < _HEADER.size:
+        raise ValueError("Screen capture returned no frame")
+    width, height, pixel_format = _HEADER.unpack_from(raw)
+    try:
+        pixel_format = PixelFormat(pixel_format)
+    except ValueError as err:
+        raise ValueError(f"Unsupported pixel format {pixel_format}") from err
+    if not width or not height:
+        raise ValueError(f"Invalid frame size {width}x{height}")
+    bpp = _BYTES_PER_PIXEL[pixel_format]
+    # Rows may be padded, so the stride is whatever the data size allows
+    for header_size in _HEADER_SIZES:
+        size = len(raw) - header_size
+        if size >= width * height * bpp and size % (height * bpp) == 0:
+            return width, height, pixel_format, header_size, size // height
+    raise ValueError(f"Frame of {len(raw)} bytes does not match {width}x{height}")
+
+
+def decode_screencap(raw: bytes, max_width: int | None = None) -> FrameoScreenshot:
+    """Decode raw screencap output, downscaling it to fit a width.
+
+    The frame is scaled down by a whole factor by keeping every n-th pixel,
+    and converted to RGB with slicing and translation tables that work on
+    the whole buffer at once, so no pixel is touched from Python code.
+
+    Args:
+        raw: Output of the capture command, gzipped or not.
+        max_width: Width in pixels to scale the screenshot down to fit.
+
+    Returns:
+        The decoded screenshot.
+
+    Raises:
+        ValueError: If the data is not a raw frame in a supported format.
+
+    """
+    if raw[:2] == _GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    width, height, pixel_format, header_size, stride = _parse_header(raw)
+    bpp = _BYTES_PER_PIXEL[pixel_format]
+
+    step = math.ceil(width / max_width) if max_width and width > max_width else 1
+    out_width = width // step
+    out_height = math.ceil(height / step)
+    # Keep every n-th row, cut to a whole number of steps, so slicing the
+    # joined rows by pixel and step keeps every n-th column
+    row = out_width * step * bpp
+    pixels = b"".join(
+        raw[start : start + row]
+        for start in range(header_size, header_size + height * stride, stride * step)
+    )
+
+    if pixel_format is PixelFormat.RGB_565:
+        low, high = pixels[0 :: 2 * step], pixels[1 :: 2 * step]
+        green = (
+            int.from_bytes(high.translate(_GREEN_HIGH_565))
+            | int.from_bytes(low.translate(_GREEN_LOW_565))
+        ).to_bytes(len(high))
+        red, green, blue = (
+            high.translate(_RED_565),
+            green.translate(_GREEN_565),
+            low.translate(_BLUE_565),
+        )
+    else:
+        red, green, blue = (
+            pixels[offset :: bpp * step] for offset in _CHANNELS[pixel_format]
+        )
+
+    rgb = bytearray(len(red) * 3)
+    rgb[0::3], rgb[1::3], rgb[2::3] = red, green, blue
+    return FrameoScreenshot(width=out_width, height=out_height, rgb=bytes(rgb))
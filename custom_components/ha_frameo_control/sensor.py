@@ -0,0 +1,205 @@
+"""Sensor entities for Frameo device health."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import FrameoConfigEntry
+from .const import DOMAIN
+from .coordinator import FrameoDataUpdateCoordinator, FrameoHealthCoordinator
+from .health import HEALTH_METRICS
+
+
+@dataclass(frozen=True, kw_only=True)
+class FrameoSensorEntityDescription(SensorEntityDescription):
+    """Describes a Frameo health sensor entity."""
+
+    metric: str
+    value_fn: Callable[[Any], Any] = lambda value: value
+    attr_fn: Callable[[Any], dict[str, Any] | None] = lambda value: None
+
+
+# --- Sensor Definitions ---
+
+SENSOR_DESCRIPTIONS: tuple[FrameoSensorEntityDescription, ...] = (
+    FrameoSensorEntityDescription(
+        key="battery_level",
+        name="Battery",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="battery",
+        value_fn=lambda battery: battery and battery["level"],
+    ),
+    FrameoSensorEntityDescription(
+        key="battery_temperature",
+        name="Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="battery",
+        value_fn=lambda battery: battery and battery["temperature"],
+    ),
+    FrameoSensorEntityDescription(
+        key="free_storage",
+        name="Free Storage",
+        icon="mdi:harddisk",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="storage",
+    ),
+    FrameoSensorEntityDescription(
+        key="free_memory",
+        name="Free Memory",
+        icon="mdi:memory",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="memory",
+    ),
+    FrameoSensorEntityDescription(
+        key="last_boot",
+        name="Last Boot",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="uptime",
+    ),
+    FrameoSensorEntityDescription(
+        key="wifi_signal",
+        name="Wi-Fi Signal",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="wifi",
+    ),
+    FrameoSensorEntityDescription(
+        key="foreground_app",
+        name="Foreground App",
+        icon="mdi:application",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="foreground",
+        value_fn=lambda foreground: foreground and foreground["package"],
+    ),
+    FrameoSensorEntityDescription(
+        key="last_launch",
+        name="Last App Launch",
+        icon="mdi:rocket-launch",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        metric="launch",
+        value_fn=lambda launch: launch["total_time"],
+        attr_fn=lambda launch: {
+            "package": launch["package"],
+            "launch_state": launch["state"],
+            "wait_time": launch["wait_time"],
+        },
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: FrameoConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Frameo sensor platform.
+
+    Args:
+        hass: Home Assistant instance.
+        entry: Config entry for this integration.
+        async_add_entities: Callback to add entities.
+
+    """
+    coordinator: FrameoDataUpdateCoordinator = entry.runtime_data
+    async_add_entities(
+        FrameoHealthSensor(coordinator.health, entry, description)
+        for description in SENSOR_DESCRIPTIONS
+    )
+
+
+class FrameoHealthSensor(CoordinatorEntity[FrameoHealthCoordinator], SensorEntity):
+    """A sensor entity reporting one Frameo device health value."""
+
+    _attr_has_entity_name = True
+    entity_description: FrameoSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: FrameoHealthCoordinator,
+        entry: FrameoConfigEntry,
+        description: FrameoSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor entity.
+
+        Args:
+            coordinator: Health data coordinator.
+            entry: Config entry for this integration.
+            description: Entity description.
+
+        """
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Start fetching this sensor's metric while the entity exists.
+
+        Metrics that are not polled, such as launch timing, are only set
+        when the integration learns them.
+        """
+        await super().async_added_to_hass()
+        if self.entity_description.metric in HEALTH_METRICS:
+            self.async_on_remove(
+                self.coordinator.async_track_metric(self.entity_description.metric)
+            )
+
+    @property
+    def available(self) -> bool:
+        """Return true once the metric has been fetched."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.entity_description.metric in self.coordinator.data
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the sensor value."""
+        value = self.coordinator.data[self.entity_description.metric]
+        return self.entity_description.value_fn(value)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return extra details of the value."""
+        value = self.coordinator.data[self.entity_description.metric]
+        return self.entity_description.attr_fn(value)
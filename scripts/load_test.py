@@ -0,0 +1,316 @@
+"""Load test the integration against a simulated Frameo Control addon.
+
+Starts a fake addon on localhost that implements the addon HTTP API with
+configurable latency, jitter, injected 503s and periodic disconnect storms,
+then drives N devices x M operations per second through the integration's
+coordinator, the same API the entities and services use. At the end it
+prints latency percentiles, throughput, event loop lag and reconnect counts.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python scripts/load_test.py --devices 30 --rate 2 --duration 60 \\
+        --latency 0.05 --jitter 0.02 --error-rate 0.01 --storm-every 20
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.ha_frameo_control.api import (  # noqa: E402
+    FrameoAddonApiClient,
+    FrameoApiError,
+)
+from custom_components.ha_frameo_control.const import (  # noqa: E402
+    CONF_CONN_TYPE,
+    CONF_SERIAL,
+    ConnectionType,
+)
+from custom_components.ha_frameo_control.coordinator import (  # noqa: E402
+    FrameoDataUpdateCoordinator,
+)
+
+# Interval of the event loop lag probe, in seconds
+_LAG_PROBE_INTERVAL = 0.05
+
+
+@dataclass
+class FakeAddon:
+    """Simulated addon with tunable latency and failures."""
+
+    latency: float
+    jitter: float
+    error_rate: float
+    storm_every: float
+    storm_duration: float
+    serials: list[str]
+    started: float = field(default_factory=time.monotonic)
+    calls: Counter[str] = field(default_factory=Counter)
+
+    def in_storm(self) -> bool:
+        """Return whether the device link is currently down."""
+        if not self.storm_every:
+            return False
+        elapsed = time.monotonic() - self.started
+        return elapsed % self.storm_every > self.storm_every - self.storm_duration
+
+    async def _delay(self) -> None:
+        """Sleep for the configured latency plus jitter."""
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+    def _device_down(self) -> bool:
+        """Decide whether a device request fails with a 503."""
+        return self.in_storm() or random.random() < self.error_rate
+
+    async def connect(self, request: web.Request) -> web.Response:
+        """Handle POST /connect."""
+        self.calls["connect"] += 1
+        await self._delay()
+        if self.in_storm():
+            return web.json_response({"status": "error", "message": "storm"})
+        return web.json_response({"status": "connected"})
+
+    async def state(self, request: web.Request) -> web.Response:
+        """Handle POST /state."""
+        self.calls["state"] += 1
+        await self._delay()
+        if self._device_down():
+            raise web.HTTPServiceUnavailable
+        return web.json_response({"is_on": True, "brightness": 128})
+
+    async def shell(self, request: web.Request) -> web.Response:
+        """Handle POST /shell."""
+        self.calls["shell"] += 1
+        command = (await request.json()).get("command", "")
+        await self._delay()
+        if self._device_down():
+            raise web.HTTPServiceUnavailable
+        if command.startswith("echo"):
+            return web.json_response({"result": command.partition(" ")[2]})
+        if command.startswith("dumpsys display"):
+            return web.json_response({"result": "deviceWidth=1280, deviceHeight=800"})
+        return web.json_response({"result": "ok"})
+
+    async def tcpip(self, request: web.Request) -> web.Response:
+        """Handle POST /tcpip."""
+        self.calls["tcpip"] += 1
+        await self._delay()
+        return web.json_response({"status": "success"})
+
+    async def usb_devices(self, request: web.Request) -> web.Response:
+        """Handle GET /devices/usb."""
+        self.calls["devices"] += 1
+        await self._delay()
+        return web.json_response(self.serials)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application serving the addon API."""
+        app = web.Application()
+        app.router.add_post("/connect", self.connect)
+        app.router.add_post("/state", self.state)
+        app.router.add_post("/shell", self.shell)
+        app.router.add_post("/tcpip", self.tcpip)
+        app.router.add_get("/devices/usb", self.usb_devices)
+        return app
+
+
+@dataclass
+class Results:
+    """Measurements collected during a run."""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    failures: Counter[str] = field(default_factory=Counter)
+    loop_lag: list[float] = field(default_factory=list)
+
+    def record(self, op: str, latency: float) -> None:
+        """Record a successful operation."""
+        self.latencies.setdefault(op, []).append(latency)
+
+
+def _percentile(samples: list[float], percentile: int) -> float:
+    """Return a percentile of the samples (nearest rank)."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, len(ordered) * percentile // 100)]
+
+
+async def _probe_loop_lag(results: Results, stop: asyncio.Event) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    while not stop.is_set():
+        start = time.monotonic()
+        await asyncio.sleep(_LAG_PROBE_INTERVAL)
+        results.loop_lag.append(time.monotonic() - start - _LAG_PROBE_INTERVAL)
+
+
+async def _run_op(
+    coordinator: FrameoDataUpdateCoordinator, results: Results
+) -> None:
+    """Run one randomly chosen operation, as an entity or service would."""
+    roll = random.random()
+    if roll < 0.5:
+        op, call = "read", coordinator.async_execute_command("dumpsys battery")
+    elif roll < 0.7:
+        level = random.randint(1, 255)
+        op, call = "write", coordinator.async_execute_command(
+            f"settings put system screen_brightness {level}"
+        )
+    elif roll < 0.8:
+        op, call = "action", coordinator.async_execute_command("input keyevent 22")
+    else:
+        op, call = "refresh", coordinator.async_refresh()
+    start = time.monotonic()
+    try:
+        await call
+    except FrameoApiError:
+        results.failures[op] += 1
+        return
+    if op == "refresh" and not coordinator.last_update_success:
+        results.failures[op] += 1
+        return
+    results.record(op, time.monotonic() - start)
+
+
+async def _drive(
+    coordinator: FrameoDataUpdateCoordinator,
+    rate: float,
+    duration: float,
+    results: Results,
+) -> None:
+    """Start operations at a fixed rate, without waiting for earlier ones."""
+    tasks: list[asyncio.Task[None]] = []
+    deadline = time.monotonic() + duration
+    # Spread devices out so they do not all fire on the same tick
+    await asyncio.sleep(random.random() / rate)
+    while time.monotonic() < deadline:
+        tasks.append(asyncio.create_task(_run_op(coordinator, results)))
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+
+
+def _report(args: argparse.Namespace, addon: FakeAddon, results: Results, elapsed: float) -> None:
+    """Print the results of a run."""
+    completed = sum(len(samples) for samples in results.latencies.values())
+    failed = sum(results.failures.values())
+    print(f"\n{args.devices} devices x {args.rate} ops/s for {elapsed:.1f} s")
+    print(f"Throughput: {completed / elapsed:.1f} ops/s ({completed} ok, {failed} failed)")
+    print(f"{'operation':<10} {'count':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'failed':>7}")
+    for op in sorted(results.latencies.keys() | results.failures.keys()):
+        samples = results.latencies.get(op, [])
+        if samples:
+            p50 = f"{statistics.median(samples) * 1000:.1f}"
+            p99 = f"{_percentile(samples, 99) * 1000:.1f}"
+            high = f"{max(samples) * 1000:.1f}"
+        else:
+            p50 = p99 = high = "-"
+        print(f"{op:<10} {len(samples):>7} {p50:>8} {p99:>8} {high:>8} {results.failures[op]:>7}")
+    if results.loop_lag:
+        print(
+            "Event loop lag: "
+            f"p50 {statistics.median(results.loop_lag) * 1000:.1f} ms, "
+            f"p99 {_percentile(results.loop_lag, 99) * 1000:.1f} ms, "
+            f"max {max(results.loop_lag) * 1000:.1f} ms"
+        )
+    print(
+        f"Addon calls: {dict(addon.calls)}; "
+        f"reconnects: {addon.calls['connect'] - args.devices}"
+    )
+
+
+async def _async_main(args: argparse.Namespace) -> Results:
+    """Run the load test and report its results."""
+    serials = [f"FAKE{index:04d}" for index in range(args.devices)]
+    addon = FakeAddon(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        storm_every=args.storm_every,
+        storm_duration=args.storm_duration,
+        serials=serials,
+    )
+    runner = web.AppRunner(addon.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        http_client = httpx.AsyncClient()
+        client = FrameoAddonApiClient(
+            hass, host="127.0.0.1", port=args.port, http_client=http_client
+        )
+        coordinators = [
+            FrameoDataUpdateCoordinator(
+                hass,
+                client,
+                conn_details={CONF_CONN_TYPE: ConnectionType.USB, CONF_SERIAL: serial},
+            )
+            for serial in serials
+        ]
+        for coordinator in coordinators:
+            await coordinator.async_select_transport()
+            coordinator.async_start_heartbeat(args.heartbeat)
+
+        results = Results()
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_loop_lag(results, stop))
+        start = time.monotonic()
+        await asyncio.gather(
+            *(
+                _drive(coordinator, args.rate, args.duration, results)
+                for coordinator in coordinators
+            )
+        )
+        elapsed = time.monotonic() - start
+        stop.set()
+        await probe
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await http_client.aclose()
+        await hass.async_stop(force=True)
+
+    await runner.cleanup()
+    _report(args, addon, results, elapsed)
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10, help="number of devices")
+    parser.add_argument("--rate", type=float, default=1.0, help="ops/s per device")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--latency", type=float, default=0.05, help="addon latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="latency stddev (s)")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of requests failing with 503"
+    )
+    parser.add_argument(
+        "--storm-every", type=float, default=0.0, help="seconds between disconnect storms"
+    )
+    parser.add_argument(
+        "--storm-duration", type=float, default=2.0, help="length of a storm (s)"
+    )
+    parser.add_argument(
+        "--heartbeat", type=float, default=0.0, help="heartbeat interval (s), 0 = off"
+    )
+    parser.add_argument("--port", type=int, default=5099, help="fake addon port")
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
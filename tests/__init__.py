@@ -0,0 +1 @@
+"""Tests for the HA Frameo Control integration."""
@@ -0,0 +1,311 @@
+"""Fixtures for HA Frameo Control tests."""
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from collections.abc import AsyncGenerator, Callable
+from unittest.mock import patch
+
+import pytest
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, utils
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ha_frameo_control.adb import (
+    A_AUTH,
+    A_CLSE,
+    A_CNXN,
+    A_OKAY,
+    A_OPEN,
+    A_WRTE,
+    ADB_MAX_PAYLOAD,
+    ADB_VERSION,
+    FrameoAdbClient,
+    FrameoAdbKey,
+    async_read_packet,
+    build_packet,
+)
+from custom_components.ha_frameo_control.const import (
+    CONF_CONN_TYPE,
+    CONF_DIRECT_ADB,
+    DOMAIN,
+    ConnectionType,
+)
+from custom_components.ha_frameo_control.coordinator import FrameoDataUpdateCoordinator
+
+# A command written to the shell session by the client
+_SESSION_SCRIPT_RE = re.compile(
+    r'^echo "__FRAMEO_BEGIN_"(\d+)_; \( (.*)\n\) </dev/null 2>&1; '
+    r'echo "__FRAMEO_END_"\1_\n$',
+    re.DOTALL,
+)
+
+# Bytes per WRTE the fake device sends, small so output spans packets
+_CHUNK = 16
+
+
+async def async_wait_for(condition: Callable[[], bool], timeout: float = 2) -> None:
+    """Wait until a condition holds, failing the test after a timeout."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the integration in every test."""
+
+
+@pytest.fixture(scope="session")
+def adb_key() -> FrameoAdbKey:
+    """Return an ADB key, generated once as it is slow."""
+    return FrameoAdbKey.generate()
+
+
+class FakeAdbd:
+    """A minimal adbd on localhost answering from canned command output.
+
+    It authenticates with AUTH tokens when it knows a key, serves one-off
+    shell: and exec: streams and interactive shell sessions, and records
+    every packet the client sends and every command it runs.
+    """
+
+    def __init__(self, key: FrameoAdbKey | None) -> None:
+        """Initialize the device.
+
+        Args:
+            key: Key the device already trusts, or None to skip AUTH.
+
+        """
+        self.key = key
+        self.require_auth = key is not None
+        self.outputs: dict[str, bytes] = {}
+        # Commands that never finish
+        self.hang: set[str] = set()
+        # Commands that never finish the first time they run
+        self.hang_once: set[str] = set()
+        # Whether interactive shells are never acknowledged
+        self.hang_sessions = False
+        # Commands that drop the connection once, as if the device went away
+        self.drop: set[str] = set()
+        self.commands: list[str] = []
+        self.received: list[tuple[int, int, int, bytes]] = []
+        self.offered_key: bytes | None = None
+        self.closed = asyncio.Event()
+        self.port = 0
+        self._server: asyncio.Server | None = None
+        self._sessions: dict[int, int] = {}
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._next_id = 100
+
+    async def async_start(self) -> None:
+        """Start listening on a free port, or the previous one on a restart."""
+        self._server = await asyncio.start_server(
+            self._async_handle, "127.0.0.1", self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Stop listening and drop every connection."""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._writers:
+                writer.close()
+            await self._server.wait_closed()
+
+    def packets(self, command: int) -> list[tuple[int, int, int, bytes]]:
+        """Return the packets of one command the client sent."""
+        return [packet for packet in self.received if packet[0] == command]
+
+    def _hangs_once(self, command: str) -> bool:
+        """Return whether a command hangs this time, only the first time."""
+        if command in self.hang_once:
+            self.hang_once.discard(command)
+            return True
+        return False
+
+    def _verify(self, token: bytes, signature: bytes) -> bool:
+        """Check an AUTH signature against the trusted key."""
+        if self.key is None:
+            return False
+        try:
+            self.key._private_key.public_key().verify(  # noqa: SLF001
+                signature, token, padding.PKCS1v15(), utils.Prehashed(hashes.SHA1())
+            )
+        except InvalidSignature:
+            return False
+        return True
+
+    async def _async_read(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[int, int, int, bytes]:
+        """Read and record a packet from the client."""
+        packet = await async_read_packet(reader)
+        self.received.append(packet)
+        return packet
+
+    def _write_output(
+        self, writer: asyncio.StreamWriter, local_id: int, remote_id: int, data: bytes
+    ) -> None:
+        """Send output to a stream in small packets."""
+        for start in range(0, len(data), _CHUNK):
+            writer.write(build_packet(A_WRTE, local_id, remote_id, data[start : start + _CHUNK]))
+
+    async def _async_handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection."""
+        self._writers.add(writer)
+        try:
+            await self._async_read(reader)
+            if self.require_auth:
+                token = os.urandom(20)
+                writer.write(build_packet(A_AUTH, 1, 0, token))
+                _, _, _, signature = await self._async_read(reader)
+                if not self._verify(token, signature):
+                    # Ask again, so the client offers its public key
+                    writer.write(build_packet(A_AUTH, 1, 0, os.urandom(20)))
+                    _, _, _, self.offered_key = await self._async_read(reader)
+            writer.write(build_packet(A_CNXN, ADB_VERSION, ADB_MAX_PAYLOAD, b"device::\x00"))
+            while True:
+                command, arg0, arg1, payload = await self._async_read(reader)
+                if command == A_OPEN:
+                    self._open(writer, arg0, payload.rstrip(b"\x00").decode())
+                elif command == A_WRTE and arg1 in self._sessions:
+                    writer.write(build_packet(A_OKAY, arg1, arg0))
+                    if not self._run_in_session(writer, arg1, arg0, payload.decode()):
+                        break
+                elif command == A_CLSE:
+                    self._sessions.pop(arg1, None)
+                    self.closed.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _open(self, writer: asyncio.StreamWriter, remote_id: int, service: str) -> None:
+        """Answer an OPEN packet."""
+        if service == "shell:" and self.hang_sessions:
+            return
+        self._next_id += 1
+        local_id = self._next_id
+        writer.write(build_packet(A_OKAY, local_id, remote_id))
+        if service == "shell:":
+            self._sessions[local_id] = remote_id
+            return
+        kind, _, command = service.partition(":")
+        self.commands.append(command)
+        if command in self.hang or self._hangs_once(command):
+            return
+        output = self.outputs.get(command, b"")
+        if kind == "shell":
+            # A terminal ends lines with CRLF
+            output = output.replace(b"\n", b"\r\n")
+        self._write_output(writer, local_id, remote_id, output)
+        writer.write(build_packet(A_CLSE, local_id, remote_id))
+
+    def _run_in_session(
+        self, writer: asyncio.StreamWriter, local_id: int, remote_id: int, script: str
+    ) -> bool:
+        """Echo a script like a terminal, then print its framed output.
+
+        Returns:
+            False if the command drops the connection.
+
+        """
+        if not (match := _SESSION_SCRIPT_RE.match(script)):
+            raise AssertionError(f"Unexpected session input: {script!r}")
+        sequence, command = match.groups()
+        self.commands.append(command)
+        if command in self.drop:
+            self.drop.discard(command)
+            return False
+        if command in self.hang or self._hangs_once(command):
+            return True
+        output = (
+            script.encode()
+            + f"__FRAMEO_BEGIN_{sequence}_\n".encode()
+            + self.outputs.get(command, b"")
+            + f"__FRAMEO_END_{sequence}_\n".encode()
+        )
+        self._write_output(writer, local_id, remote_id, output.replace(b"\n", b"\r\n"))
+        return True
+
+
+@pytest.fixture
+async def fake_adbd(
+    socket_enabled: None, adb_key: FrameoAdbKey
+) -> AsyncGenerator[FakeAdbd]:
+    """Start a fake adbd that trusts the test key."""
+    device = FakeAdbd(adb_key)
+    await device.async_start()
+    yield device
+    await device.async_stop()
+
+
+@pytest.fixture
+async def client(
+    hass: HomeAssistant, fake_adbd: FakeAdbd, adb_key: FrameoAdbKey
+) -> AsyncGenerator[FrameoAdbClient]:
+    """Return a direct ADB client connected to the fake device."""
+    client = FrameoAdbClient(hass, "127.0.0.1", fake_adbd.port, adb_key)
+    assert (await client.async_connect({})).connected
+    yield client
+    await client.async_close()
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant,
+    client: FrameoAdbClient,
+    fake_adbd: FakeAdbd,
+    request: pytest.FixtureRequest,
+) -> AsyncGenerator[FrameoDataUpdateCoordinator]:
+    """Return a coordinator of the fake device over direct ADB.
+
+    Extra coordinator arguments can be passed with indirect parametrization.
+    """
+    coordinator = FrameoDataUpdateCoordinator(
+        hass,
+        client,
+        {
+            CONF_CONN_TYPE: ConnectionType.NETWORK,
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: fake_adbd.port,
+        },
+        **getattr(request, "param", {}),
+    )
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+async def config_entry(
+    hass: HomeAssistant, fake_adbd: FakeAdbd, adb_key: FrameoAdbKey
+) -> AsyncGenerator[MockConfigEntry]:
+    """Set up an entry of the fake device over direct ADB."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Frameo (127.0.0.1)",
+        unique_id="127.0.0.1",
+        data={
+            CONF_CONN_TYPE: ConnectionType.NETWORK,
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: fake_adbd.port,
+        },
+        options={CONF_DIRECT_ADB: True},
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.ha_frameo_control.async_get_adb_key", return_value=adb_key
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,128 @@
+"""Tests for the direct ADB client."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_frameo_control import adb
+from custom_components.ha_frameo_control.adb import (
+    A_AUTH,
+    A_CLSE,
+    A_CNXN,
+    A_OPEN,
+    ADB_HEADER,
+    FrameoAdbClient,
+    FrameoAdbKey,
+    async_read_packet,
+    build_packet,
+)
+from custom_components.ha_frameo_control.api import FrameoApiError
+
+from .conftest import FakeAdbd, async_wait_for
+
+
+async def test_packet_round_trip() -> None:
+    """Test that packets are encoded with their checksum and magic."""
+    packet = build_packet(A_OPEN, 1, 2, b"shell:ls\x00")
+    command, arg0, arg1, length, checksum, magic = ADB_HEADER.unpack_from(packet)
+    assert (command, arg0, arg1, length) == (A_OPEN, 1, 2, 9)
+    assert checksum == sum(b"shell:ls\x00")
+    assert magic == A_OPEN ^ 0xFFFFFFFF
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(packet + build_packet(A_CLSE, 3, 4))
+    assert await async_read_packet(reader) == (A_OPEN, 1, 2, b"shell:ls\x00")
+    assert await async_read_packet(reader) == (A_CLSE, 3, 4, b"")
+
+
+async def test_auth_with_trusted_key(
+    hass: HomeAssistant, fake_adbd: FakeAdbd, adb_key: FrameoAdbKey
+) -> None:
+    """Test that a trusted key connects with a signature alone."""
+    client = FrameoAdbClient(hass, "127.0.0.1", fake_adbd.port, adb_key)
+    assert (await client.async_connect({})).status == "connected"
+    auth = fake_adbd.packets(A_AUTH)
+    assert [packet[1] for packet in auth] == [2]
+    assert fake_adbd.offered_key is None
+    await client.async_close()
+
+
+async def test_auth_offers_new_key(hass: HomeAssistant, fake_adbd: FakeAdbd) -> None:
+    """Test that an unknown key is offered to the device after its signature."""
+    fake_adbd.key = None
+    key = FrameoAdbKey.generate()
+    client = FrameoAdbClient(hass, "127.0.0.1", fake_adbd.port, key)
+    assert (await client.async_connect({})).connected
+    assert [packet[1] for packet in fake_adbd.packets(A_AUTH)] == [2, 3]
+    assert fake_adbd.offered_key == key.public_key
+    await client.async_close()
+
+
+async def test_auth_without_key(hass: HomeAssistant, fake_adbd: FakeAdbd) -> None:
+    """Test that a device asking for a key rejects a client without one."""
+    client = FrameoAdbClient(hass, "127.0.0.1", fake_adbd.port)
+    result = await client.async_connect({})
+    assert result.status == "error"
+    assert not client.connected
+    assert fake_adbd.packets(A_CNXN)
+
+
+async def test_shell_session_framing(
+    client: FrameoAdbClient, fake_adbd: FakeAdbd
+) -> None:
+    """Test that commands share one shell and get only their own output."""
+    fake_adbd.outputs["getprop ro.product.model"] = b"Frameo\n"
+    # Output that looks like a marker of another command must not confuse it
+    fake_adbd.outputs["cat log"] = b"line 1\n__FRAMEO_END_9_ line 2\n" * 8
+
+    assert (await client.async_shell("getprop ro.product.model")).output == "Frameo"
+    assert (await client.async_shell("cat log")).output == (
+        "line 1\n__FRAMEO_END_9_ line 2\n" * 8
+    ).strip()
+    assert (await client.async_shell("true")).output == ""
+
+    assert client.shell_sessions == 1
+    opens = [packet[3] for packet in fake_adbd.packets(A_OPEN)]
+    assert opens == [b"shell:\x00"]
+
+
+async def test_exec_is_binary_safe(client: FrameoAdbClient, fake_adbd: FakeAdbd) -> None:
+    """Test that exec output is returned as written, without a terminal."""
+    frame = bytes(range(256)) * 4
+    fake_adbd.outputs["screencap 2>/dev/null"] = frame
+    assert await client.async_exec("screencap 2>/dev/null") == frame
+
+
+async def test_service_timeout_closes_stream(
+    client: FrameoAdbClient, fake_adbd: FakeAdbd, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a stream that times out is closed on the device too."""
+    monkeypatch.setattr(adb, "DEFAULT_TIMEOUT", 0.1)
+    fake_adbd.hang.add("sleep 100")
+    with pytest.raises(FrameoApiError):
+        await client.async_exec("sleep 100")
+    await asyncio.wait_for(fake_adbd.closed.wait(), 1)
+    (_, local_id, _, _) = fake_adbd.packets(A_OPEN)[-1]
+    assert any(packet[1] == local_id for packet in fake_adbd.packets(A_CLSE))
+    assert not client._streams  # noqa: SLF001
+
+
+async def test_session_open_cancelled(
+    client: FrameoAdbClient, fake_adbd: FakeAdbd, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a shell session given up on while opening is forgotten."""
+    monkeypatch.setattr(adb, "DEFAULT_TIMEOUT", 0.1)
+    fake_adbd.hang_sessions = True
+    with pytest.raises(FrameoApiError):
+        await client.async_shell("true")
+    assert not client._streams  # noqa: SLF001
+
+    task = asyncio.create_task(client.async_shell("true"))
+    await async_wait_for(lambda: len(fake_adbd.packets(A_OPEN)) == 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not client._streams  # noqa: SLF001
@@ -0,0 +1,148 @@
+"""Tests for placing devices across addon backends."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+
+import pytest
+from aiohttp import web
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_frameo_control import api
+from custom_components.ha_frameo_control.backend import FrameoBackendPool
+from custom_components.ha_frameo_control.const import (
+    CONF_CONN_TYPE,
+    CONF_SERIAL,
+    ConnectionType,
+)
+from custom_components.ha_frameo_control.coordinator import FrameoDataUpdateCoordinator
+from scripts.load_test import FakeAddon
+
+_NETWORK = {
+    CONF_CONN_TYPE: ConnectionType.NETWORK,
+    CONF_HOST: "192.0.2.10",
+    CONF_PORT: 5555,
+}
+
+
+class _Backend:
+    """A fake addon served on localhost."""
+
+    def __init__(self, serials: list[str]) -> None:
+        """Initialize the backend.
+
+        Args:
+            serials: USB devices plugged into the backend.
+
+        """
+        self.addon = FakeAddon(
+            latency=0,
+            jitter=0,
+            error_rate=0,
+            storm_every=0,
+            storm_duration=0,
+            serials=serials,
+        )
+        self.runner = web.AppRunner(self.addon.app(), access_log=None)
+        self.port = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Return the (host, port) of the backend."""
+        return ("127.0.0.1", self.port)
+
+    async def async_start(self) -> None:
+        """Start serving on a free port."""
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+
+
+@pytest.fixture
+async def backends(socket_enabled: None) -> AsyncGenerator[list[_Backend]]:
+    """Start two fake addons, the second with a USB device plugged in."""
+    started = [_Backend([]), _Backend(["FRAMEO1"])]
+    for backend in started:
+        await backend.async_start()
+    yield started
+    for backend in started:
+        await backend.runner.cleanup()
+
+
+@pytest.fixture
+async def hung_address(socket_enabled: None) -> AsyncGenerator[tuple[str, int]]:
+    """Return the address of a backend that accepts connections but never answers."""
+
+    async def _ignore(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.read()
+
+    server = await asyncio.start_server(_ignore, "127.0.0.1", 0)
+    yield ("127.0.0.1", server.sockets[0].getsockname()[1])
+    server.close()
+
+
+@pytest.fixture
+def pool(hass: HomeAssistant) -> FrameoBackendPool:
+    """Return an empty backend pool."""
+    return FrameoBackendPool(hass)
+
+
+async def test_place_network_device(
+    pool: FrameoBackendPool,
+    backends: list[_Backend],
+    hung_address: tuple[str, int],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that network devices go to the least-loaded backend that answers."""
+    monkeypatch.setattr(api, "ADDON_PING_TIMEOUT", 0.2)
+    first, second = backends
+    pool.acquire(pool.get_client(*first.address))
+
+    start = time.monotonic()
+    chosen = await pool.async_place(
+        _NETWORK, [first.address, second.address, hung_address]
+    )
+    assert time.monotonic() - start < 1
+    assert chosen is not None
+    assert chosen.port == second.port
+    # Network devices need no USB scan
+    assert not first.addon.calls["devices"]
+    assert not second.addon.calls["devices"]
+
+
+async def test_place_usb_device(pool: FrameoBackendPool, backends: list[_Backend]) -> None:
+    """Test that USB devices only go to the backend they are plugged into."""
+    first, second = backends
+    # The second backend is busier, but the only one with the device
+    pool.acquire(pool.get_client(*second.address))
+    details = {CONF_CONN_TYPE: ConnectionType.USB, CONF_SERIAL: "FRAMEO1"}
+    chosen = await pool.async_place(details, [first.address, second.address])
+    assert chosen is not None
+    assert chosen.port == second.port
+
+    details[CONF_SERIAL] = "UNPLUGGED"
+    assert await pool.async_place(details, [first.address, second.address]) is None
+
+
+async def test_failover_to_other_backend(
+    hass: HomeAssistant, pool: FrameoBackendPool, backends: list[_Backend]
+) -> None:
+    """Test that a device moves to another backend when its own goes down."""
+    first, second = backends
+    addresses = [first.address, second.address]
+    client = await pool.async_place(_NETWORK, addresses)
+    assert client is not None
+    coordinator = FrameoDataUpdateCoordinator(
+        hass, client, _NETWORK, backend_pool=pool, backend_addresses=addresses
+    )
+    down, up = (first, second) if client.port == first.port else (second, first)
+    await down.runner.cleanup()
+
+    assert await coordinator.async_reconnect()
+    assert coordinator.client.port == up.port
+    assert pool.backend_stats(coordinator.client)["devices"] == 1
+    await coordinator.async_shutdown()
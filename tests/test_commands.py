@@ -0,0 +1,172 @@
+"""Tests for command classification and the offline queue."""
+from __future__ import annotations
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.ha_frameo_control import commands
+from custom_components.ha_frameo_control.api import ShellResult
+from custom_components.ha_frameo_control.commands import (
+    CommandCache,
+    CommandKind,
+    LatencyWindow,
+    OfflineCommandQueue,
+    classify_command,
+    command_intent,
+)
+from custom_components.ha_frameo_control.const import (
+    ADB_CMD_DEVICE_TIME,
+    ADB_CMD_POWER_KEY,
+    ADB_CMD_POWER_OFF_GUARDED,
+    ADB_CMD_POWER_ON_GUARDED,
+    ADB_CMD_WAKEUP,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+)
+
+
+@pytest.mark.parametrize(
+    ("command", "kind"),
+    [
+        ("getprop ro.product.model", CommandKind.READ),
+        ("dumpsys battery", CommandKind.READ),
+        ("dumpsys window windows | grep mCurrentFocus", CommandKind.READ),
+        ("dumpsys settings", CommandKind.READ),
+        ("dumpsys battery set level 5", CommandKind.ACTION),
+        ("dumpsys battery reset", CommandKind.ACTION),
+        ("dumpsys battery unplug", CommandKind.ACTION),
+        ("dumpsys deviceidle force-idle", CommandKind.ACTION),
+        ("date", CommandKind.READ),
+        ("date +%s", CommandKind.READ),
+        (ADB_CMD_DEVICE_TIME, CommandKind.READ),
+        ("date -s 20240101.120000", CommandKind.ACTION),
+        ("date 010112002024", CommandKind.ACTION),
+        ("logcat -d -v time -T '10-19 12:00:00.000'", CommandKind.READ),
+        ("logcat -d -c", CommandKind.ACTION),
+        ("logcat -d -G 1M", CommandKind.ACTION),
+        ("logcat -d -P '~1000'", CommandKind.ACTION),
+        ("logcat -d --clear", CommandKind.ACTION),
+        ("settings get system screen_brightness", CommandKind.READ),
+        ("settings put system screen_brightness 10", CommandKind.WRITE),
+        ("input keyevent 224", CommandKind.WRITE),
+        (ADB_CMD_POWER_KEY, CommandKind.ACTION),
+        ("cat /proc/uptime > /sdcard/out", CommandKind.ACTION),
+        ("getprop ro.product.model\nreboot", CommandKind.ACTION),
+        ("echo ok | sh", CommandKind.ACTION),
+    ],
+)
+def test_classify_command(command: str, kind: CommandKind) -> None:
+    """Test that only commands without side effects are taken for reads."""
+    assert classify_command(command) is kind
+
+
+@pytest.mark.parametrize(
+    ("command", "intent"),
+    [
+        (ADB_CMD_POWER_ON_GUARDED, "power"),
+        (ADB_CMD_POWER_OFF_GUARDED, "power"),
+        (ADB_CMD_POWER_ON_GUARDED.replace(" ", "  "), "power"),
+        (ADB_CMD_WAKEUP, "power"),
+        (ADB_CMD_POWER_KEY, "power_toggle"),
+        (f"{ADB_CMD_POWER_ON_GUARDED}; reboot", None),
+    ],
+)
+def test_power_intent(command: str, intent: str | None) -> None:
+    """Test that the power commands the integration sends are recognized."""
+    assert command_intent(command) == intent
+
+
+def test_guarded_power_replaces_toggles() -> None:
+    """Test that a guarded power command drops queued power key toggles."""
+    queue = OfflineCommandQueue(60)
+    queue.add(ADB_CMD_POWER_KEY, CommandKind.ACTION)
+    queue.add(ADB_CMD_POWER_OFF_GUARDED, CommandKind.WRITE)
+    queue.add(ADB_CMD_POWER_ON_GUARDED, CommandKind.WRITE)
+    assert [entry.command for entry in queue.pop_all()] == [ADB_CMD_POWER_ON_GUARDED]
+
+
+def test_cache_ttl(freezer: FrozenDateTimeFactory) -> None:
+    """Test that cached results are only used while younger than the TTL."""
+    cache = CommandCache()
+    cache.put("getprop  ro.serialno", ShellResult(output="ABC"))
+    # Equivalent commands share an entry
+    assert cache.get("getprop ro.serialno", 10) == ShellResult(output="ABC")
+    freezer.tick(11)
+    assert cache.get("getprop ro.serialno", 10) is None
+    assert cache.get("getprop ro.serialno", 60) == ShellResult(output="ABC")
+    cache.clear()
+    assert cache.get("getprop ro.serialno", 60) is None
+
+
+def test_cache_evicts_least_recently_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a full cache drops the entry used longest ago."""
+    monkeypatch.setattr(commands, "COMMAND_CACHE_SIZE", 2)
+    cache = CommandCache()
+    cache.put("id", ShellResult(output="uid=0"))
+    cache.put("uptime", ShellResult(output="up"))
+    assert cache.get("id", 60)
+    cache.put("df", ShellResult(output="free"))
+    assert cache.get("uptime", 60) is None
+    assert cache.get("id", 60)
+    assert cache.get("df", 60)
+
+
+def test_queue_merges_by_intent() -> None:
+    """Test that later commands replace earlier ones and toggles cancel out."""
+    queue = OfflineCommandQueue(60)
+    queue.add("settings put system screen_brightness 10", CommandKind.WRITE)
+    queue.add(ADB_CMD_POWER_KEY, CommandKind.ACTION)
+    queue.add("input tap 10 10", CommandKind.ACTION)
+    queue.add("settings put system screen_brightness 20", CommandKind.WRITE)
+    queue.add(ADB_CMD_POWER_KEY, CommandKind.ACTION)
+    assert [entry.command for entry in queue.pop_all()] == [
+        "input tap 10 10",
+        "settings put system screen_brightness 20",
+    ]
+    assert not len(queue)
+
+
+def test_queue_expiry(freezer: FrozenDateTimeFactory) -> None:
+    """Test that commands older than the TTL are dropped."""
+    queue = OfflineCommandQueue(30)
+    queue.add("settings put system screen_brightness 10", CommandKind.WRITE)
+    freezer.tick(20)
+    queue.add("input tap 10 10", CommandKind.ACTION)
+    assert queue.prune() == 2
+    freezer.tick(15)
+    assert queue.prune() == 1
+    freezer.tick(20)
+    assert queue.pop_all() == []
+
+
+def test_queue_restore_keeps_order() -> None:
+    """Test that unsent commands go back ahead of those queued meanwhile."""
+    queue = OfflineCommandQueue(60)
+    queue.add("input tap 1 1", CommandKind.ACTION)
+    queue.add("settings put system screen_brightness 10", CommandKind.WRITE)
+    unsent = queue.pop_all()
+    queue.add("input tap 2 2", CommandKind.ACTION)
+    # A newer value of the same setting still wins
+    queue.add("settings put system screen_brightness 20", CommandKind.WRITE)
+    queue.restore(unsent)
+    assert [entry.command for entry in queue.pop_all()] == [
+        "input tap 1 1",
+        "input tap 2 2",
+        "settings put system screen_brightness 20",
+    ]
+
+
+def test_hedge_delay() -> None:
+    """Test that hedging waits for enough samples and the latency percentile."""
+    window = LatencyWindow()
+    for latency in range(1, HEDGE_MIN_SAMPLES):
+        window.add(latency)
+    assert window.hedge_delay() is None
+    window.add(HEDGE_MIN_SAMPLES)
+    assert window.hedge_delay() == HEDGE_MIN_SAMPLES * HEDGE_PERCENTILE // 100 + 1
+
+    fast = LatencyWindow()
+    for _ in range(HEDGE_MIN_SAMPLES):
+        fast.add(0.001)
+    assert fast.hedge_delay() == HEDGE_MIN_DELAY
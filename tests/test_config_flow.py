@@ -0,0 +1,281 @@
+"""Tests for the config and options flows."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, SOURCE_USER
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResult, FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ha_frameo_control.api import (
+    FrameoAddonApiClient,
+    FrameoApiError,
+    StatusResult,
+)
+from custom_components.ha_frameo_control.const import (
+    CONF_ADDON_BACKENDS,
+    CONF_ADDON_HOST,
+    CONF_ADDON_PORT,
+    CONF_CONN_TYPE,
+    CONF_DIRECT_ADB,
+    CONF_GESTURES,
+    CONF_SCREEN_WIDTH,
+    CONF_SERIAL,
+    DEFAULT_ADDON_HOST,
+    DEFAULT_ADDON_PORT,
+    DOMAIN,
+    ConnectionType,
+)
+
+_ADDON = {CONF_ADDON_HOST: DEFAULT_ADDON_HOST, CONF_ADDON_PORT: DEFAULT_ADDON_PORT}
+
+
+@pytest.fixture(autouse=True)
+def addon() -> Generator[AsyncMock]:
+    """Mock the addon, with one USB device plugged in, and entry setup."""
+    with (
+        patch.object(
+            FrameoAddonApiClient,
+            "async_get_usb_devices",
+            AsyncMock(return_value=["FRAMEO1"]),
+        ),
+        patch.object(
+            FrameoAddonApiClient,
+            "async_connect",
+            AsyncMock(return_value=StatusResult(status="connected")),
+        ) as connect,
+        patch(
+            "custom_components.ha_frameo_control.async_setup_entry", return_value=True
+        ),
+        patch(
+            "custom_components.ha_frameo_control.async_unload_entry", return_value=True
+        ),
+    ):
+        yield connect
+
+
+async def _async_start(hass: HomeAssistant, conn_type: str) -> FlowResult:
+    """Start a flow and pick a connection type."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.FORM
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], _ADDON)
+    assert result["type"] is FlowResultType.MENU
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": conn_type}
+    )
+
+
+async def test_network_flow(hass: HomeAssistant, addon: AsyncMock) -> None:
+    """Test setting up a device on the network."""
+    result = await _async_start(hass, ConnectionType.NETWORK)
+    assert result["step_id"] == "Network"
+
+    # The addon answers at once, so the flow moves on without showing progress
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "192.0.2.20", CONF_PORT: 5555}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Frameo (192.0.2.20)"
+    assert result["data"] == {
+        CONF_CONN_TYPE: ConnectionType.NETWORK,
+        CONF_HOST: "192.0.2.20",
+        CONF_PORT: 5555,
+        **_ADDON,
+    }
+    assert result["result"].unique_id == "192.0.2.20"
+    addon.assert_awaited_once()
+
+
+async def test_network_connect_failed(hass: HomeAssistant, addon: AsyncMock) -> None:
+    """Test that a failed connection shows the form again, then can be retried."""
+    addon.return_value = StatusResult(status="error", message="refused")
+    result = await _async_start(hass, ConnectionType.NETWORK)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "192.0.2.20", CONF_PORT: 5555}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "Network"
+    assert result["errors"] == {"base": "cannot_connect"}
+
+    addon.return_value = StatusResult(status="connected")
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "192.0.2.20", CONF_PORT: 5555}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+
+
+async def test_network_already_configured(hass: HomeAssistant) -> None:
+    """Test that a device cannot be added twice."""
+    MockConfigEntry(domain=DOMAIN, unique_id="192.0.2.20").add_to_hass(hass)
+    result = await _async_start(hass, ConnectionType.NETWORK)
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: "192.0.2.20", CONF_PORT: 5555}
+    )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_network_scan(hass: HomeAssistant) -> None:
+    """Test that scanned devices are offered on the network form."""
+    with patch(
+        "custom_components.ha_frameo_control.config_flow.async_scan_for_devices",
+        return_value=["192.0.2.20", "192.0.2.21"],
+    ):
+        result = await _async_start(hass, "network_scan")
+
+    assert result["step_id"] == "Network"
+    selector = result["data_schema"].schema[CONF_HOST]
+    assert selector.config["options"] == ["192.0.2.20", "192.0.2.21"]
+    assert selector.config["custom_value"]
+
+
+async def test_usb_flow(hass: HomeAssistant, addon: AsyncMock) -> None:
+    """Test setting up a USB device, waiting for the user to allow debugging."""
+    allowed = asyncio.Event()
+
+    async def _async_connect(conn_details: dict[str, str]) -> StatusResult:
+        await allowed.wait()
+        return StatusResult(status="connected")
+
+    addon.side_effect = _async_connect
+    result = await _async_start(hass, ConnectionType.USB)
+    assert result["step_id"] == "usb_select"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_SERIAL: "FRAMEO1"}
+    )
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+    assert result["progress_action"] == "usb_authorization"
+
+    # Still waiting for the prompt on the device
+    result = await hass.config_entries.flow.async_configure(result["flow_id"])
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+
+    allowed.set()
+    await hass.async_block_till_done()
+    result = await hass.config_entries.flow.async_configure(result["flow_id"])
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Frameo (USB: FRAMEO1)"
+    assert result["data"] == {
+        CONF_CONN_TYPE: ConnectionType.USB,
+        CONF_SERIAL: "FRAMEO1",
+        **_ADDON,
+    }
+
+
+async def test_closing_cancels_connect(hass: HomeAssistant, addon: AsyncMock) -> None:
+    """Test that closing the progress dialog stops waiting for the device."""
+    cancelled = asyncio.Event()
+
+    async def _async_connect(conn_details: dict[str, str]) -> StatusResult:
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cancelled.set()
+
+    addon.side_effect = _async_connect
+    result = await _async_start(hass, ConnectionType.USB)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_SERIAL: "FRAMEO1"}
+    )
+    assert result["type"] is FlowResultType.SHOW_PROGRESS
+
+    hass.config_entries.flow.async_abort(result["flow_id"])
+    await hass.async_block_till_done()
+
+    assert cancelled.is_set()
+
+
+async def test_usb_no_devices(hass: HomeAssistant) -> None:
+    """Test that the flow aborts when no USB device is plugged in."""
+    with patch.object(
+        FrameoAddonApiClient, "async_get_usb_devices", AsyncMock(return_value=[])
+    ):
+        result = await _async_start(hass, ConnectionType.USB)
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "no_devices_found"
+
+
+async def test_addon_not_running(hass: HomeAssistant) -> None:
+    """Test that the addon form is shown again when the addon does not answer."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    with patch.object(
+        FrameoAddonApiClient,
+        "async_get_usb_devices",
+        AsyncMock(side_effect=FrameoApiError("refused")),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], _ADDON
+        )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"base": "addon_not_running"}
+
+
+async def test_discovery_flow(hass: HomeAssistant) -> None:
+    """Test setting up a USB device found by the background discovery."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": SOURCE_INTEGRATION_DISCOVERY},
+        data={CONF_SERIAL: "FRAMEO1", **_ADDON},
+    )
+    assert result["step_id"] == "discovery_confirm"
+    assert result["description_placeholders"] == {"serial": "FRAMEO1"}
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "FRAMEO1"
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test that invalid backends and gestures are rejected and numbers made ints."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_CONN_TYPE: ConnectionType.NETWORK, CONF_HOST: "192.0.2.20"},
+    )
+    entry.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert CONF_DIRECT_ADB in result["data_schema"].schema
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_ADDON_BACKENDS: ["192.0.2.2:5000", "bad address"],
+            CONF_GESTURES: ["Next: pinch 0.5 0.5"],
+        },
+    )
+    assert result["errors"] == {
+        CONF_ADDON_BACKENDS: "invalid_backend",
+        CONF_GESTURES: "invalid_gesture",
+    }
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_ADDON_BACKENDS: [" 192.0.2.2:5000 ", ""],
+            CONF_GESTURES: ["Next: swipe 0.6 0.6 0.1 0.6"],
+            CONF_SCREEN_WIDTH: 1024.0,
+        },
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_ADDON_BACKENDS] == ["192.0.2.2:5000"]
+    assert entry.options[CONF_GESTURES] == ["Next: swipe 0.6 0.6 0.1 0.6"]
+    assert entry.options[CONF_SCREEN_WIDTH] == 1024
+    assert isinstance(entry.options[CONF_SCREEN_WIDTH], int)
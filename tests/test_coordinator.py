@@ -0,0 +1,279 @@
+"""Tests for the device coordinator."""
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncGenerator
+
+import httpx
+import pytest
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_frameo_control.api import FrameoAddonApiClient, FrameoApiError
+from custom_components.ha_frameo_control import commands
+from custom_components.ha_frameo_control import coordinator as coordinator_module
+from custom_components.ha_frameo_control.adb import FrameoAdbClient
+from custom_components.ha_frameo_control.const import (
+    ADB_CMD_WLAN_ADDRESS,
+    CONF_CONN_TYPE,
+    CONF_SERIAL,
+    DEFAULT_DEVICE_PORT,
+    ConnectionType,
+)
+from custom_components.ha_frameo_control.coordinator import FrameoDataUpdateCoordinator
+
+from .conftest import FakeAdbd, async_wait_for
+
+_BRIGHTNESS = "settings put system screen_brightness {}"
+_TIMEOUT = "settings put system screen_off_timeout 60000"
+
+_WLAN_ADDRESS = "192.0.2.20"
+
+
+class _UsbAddon:
+    """An addon with one device on USB, which can enable wireless ADB."""
+
+    def __init__(self) -> None:
+        """Initialize the addon."""
+        self.tcpip = False
+        # Whether adbd comes up on the network after wireless ADB is enabled
+        self.listens = True
+        self.wlan = f"    inet {_WLAN_ADDRESS}/24 brd 192.0.2.255 scope global wlan0"
+        self.connected: list[dict[str, str]] = []
+        self._link: str | None = None
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer an addon API request."""
+        payload = json.loads(request.content or b"{}")
+        if request.url.path == "/connect":
+            self._link = self._connect(payload)
+            if self._link is None:
+                return httpx.Response(200, json={"status": "error"})
+            self.connected.append(payload)
+            return httpx.Response(200, json={"status": "connected"})
+        if self._link is None:
+            return httpx.Response(503)
+        if request.url.path == "/tcpip":
+            # adbd restarts on the network, which drops the USB link
+            self.tcpip = True
+            self._link = None
+            return httpx.Response(200, json={"status": "success"})
+        command = payload["command"]
+        if command == ADB_CMD_WLAN_ADDRESS:
+            return httpx.Response(200, json={"result": self.wlan})
+        return httpx.Response(200, json={"result": command.partition(" ")[2]})
+
+    def _connect(self, payload: dict[str, str]) -> str | None:
+        """Return the link a connection request gets, if any."""
+        if payload[CONF_CONN_TYPE] == ConnectionType.USB:
+            return ConnectionType.USB
+        if self.tcpip and self.listens and payload[CONF_HOST] == _WLAN_ADDRESS:
+            return ConnectionType.NETWORK
+        return None
+
+
+@pytest.fixture
+async def offline(
+    coordinator: FrameoDataUpdateCoordinator,
+    client: FrameoAdbClient,
+    fake_adbd: FakeAdbd,
+    monkeypatch: pytest.MonkeyPatch,
+) -> FakeAdbd:
+    """Take the fake device offline, retrying the offline queue quickly."""
+    monkeypatch.setattr(coordinator_module, "OFFLINE_RECONNECT_INTERVAL", 0.05)
+    await fake_adbd.async_stop()
+    await async_wait_for(lambda: not client.connected)
+    return fake_adbd
+
+
+@pytest.fixture
+def usb_addon() -> _UsbAddon:
+    """Return an addon with the device plugged in over USB."""
+    return _UsbAddon()
+
+
+@pytest.fixture
+async def usb_coordinator(
+    hass: HomeAssistant, usb_addon: _UsbAddon, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[FrameoDataUpdateCoordinator]:
+    """Return a coordinator connected to the device over USB."""
+    monkeypatch.setattr(coordinator_module, "TCPIP_CONNECT_DELAY", 0)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(usb_addon.handle))
+    client = FrameoAddonApiClient(hass, http_client=http_client)
+    coordinator = FrameoDataUpdateCoordinator(
+        hass, client, {CONF_CONN_TYPE: ConnectionType.USB, CONF_SERIAL: "FRAMEO1"}
+    )
+    assert await coordinator.async_select_transport()
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+async def test_polls_skip_the_cache(
+    coordinator: FrameoDataUpdateCoordinator, fake_adbd: FakeAdbd
+) -> None:
+    """Test that polled reads do not evict cached results of other reads."""
+    fake_adbd.outputs["getprop ro.product.model"] = b"Frameo\n"
+    command = "getprop ro.product.model"
+    assert (await coordinator.async_execute_command(command)).output == "Frameo"
+
+    # More distinct polls than the cache holds
+    for second in range(80):
+        await coordinator.async_poll_command(
+            f"logcat -d -T '01-01 00:{second // 60:02}:{second % 60:02}.000'"
+        )
+
+    fake_adbd.outputs[command] = b"Other\n"
+    result = await coordinator.async_execute_command(command, cache_ttl=60)
+    assert result.output == "Frameo"
+
+
+async def test_writes_clear_the_cache(
+    coordinator: FrameoDataUpdateCoordinator, fake_adbd: FakeAdbd
+) -> None:
+    """Test that a cached read is not served after a command that may change it."""
+    command = "settings get system screen_brightness"
+    fake_adbd.outputs[command] = b"10\n"
+    assert (await coordinator.async_execute_command(command)).output == "10"
+    fake_adbd.outputs[command] = b"20\n"
+    assert (await coordinator.async_execute_command(command, cache_ttl=60)).output == "10"
+
+    await coordinator.async_execute_command(_BRIGHTNESS.format(20))
+    assert (await coordinator.async_execute_command(command, cache_ttl=60)).output == "20"
+    # Reads without a TTL always go to the device
+    fake_adbd.outputs[command] = b"30\n"
+    assert (await coordinator.async_execute_command(command)).output == "30"
+
+
+@pytest.mark.parametrize("coordinator", [{"offline_queue_ttl": 60}], indirect=True)
+async def test_offline_queue_flush(
+    coordinator: FrameoDataUpdateCoordinator, offline: FakeAdbd
+) -> None:
+    """Test that writes sent while offline are merged and sent on reconnect."""
+    for brightness in (10, 20, 30):
+        result = await coordinator.async_execute_command(_BRIGHTNESS.format(brightness))
+        assert result.queued
+    await coordinator.async_execute_command(_TIMEOUT)
+    assert coordinator.queued_commands == 2
+
+    offline.commands.clear()
+    await offline.async_start()
+    await async_wait_for(lambda: _TIMEOUT in offline.commands)
+    assert coordinator.queued_commands == 0
+    assert offline.commands == [_BRIGHTNESS.format(30), _TIMEOUT]
+    assert coordinator.is_connected
+
+
+@pytest.mark.parametrize("coordinator", [{"offline_queue_ttl": 60}], indirect=True)
+async def test_offline_queue_restored_on_drop(
+    coordinator: FrameoDataUpdateCoordinator,
+    offline: FakeAdbd,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that a drop while flushing keeps the rest queued, without resending."""
+    for command in (_BRIGHTNESS.format(10), "input keyevent 26", _TIMEOUT):
+        assert (await coordinator.async_execute_command(command)).queued
+    offline.drop.add("input keyevent 26")
+    offline.commands.clear()
+
+    await offline.async_start()
+    await async_wait_for(lambda: _TIMEOUT in offline.commands)
+    assert coordinator.queued_commands == 0
+    # The power key may have been pressed before the drop, so it is not resent
+    assert offline.commands == [_BRIGHTNESS.format(10), "input keyevent 26", _TIMEOUT]
+    # The drop is reported as such, not as a failed reconnect
+    after_reconnect = caplog.text.partition("Reconnection successful")[2]
+    assert "1 command(s) stay queued" in after_reconnect
+    assert "Reconnection failed" not in after_reconnect
+
+
+async def test_health_skipped_while_offline(
+    coordinator: FrameoDataUpdateCoordinator,
+    offline: FakeAdbd,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that health polls leave reconnecting to the device coordinator."""
+    with pytest.raises(FrameoApiError):
+        await coordinator.async_execute_command(_TIMEOUT)
+    assert not coordinator.is_connected
+    unsub = coordinator.health.async_track_metric("foreground")
+    caplog.clear()
+
+    await coordinator.health.async_refresh()
+    assert not coordinator.health.last_update_success
+    assert "reconnect" not in caplog.text
+    unsub()
+
+
+async def test_slow_read_is_hedged(
+    coordinator: FrameoDataUpdateCoordinator,
+    fake_adbd: FakeAdbd,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a read slower than usual is sent again and the first answer used."""
+    monkeypatch.setattr(commands, "HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(commands, "HEDGE_MIN_DELAY", 0.05)
+    command = "getprop ro.product.model"
+    fake_adbd.outputs[command] = b"Frameo\n"
+    for _ in range(3):
+        await coordinator.async_execute_command(command)
+
+    fake_adbd.hang_once.add(command)
+    assert (await coordinator.async_execute_command(command)).output == "Frameo"
+    assert fake_adbd.commands.count(command) == 5
+    # The stuck request does not hold up later ones
+    assert (await coordinator.async_execute_command(command)).output == "Frameo"
+
+
+async def test_upgrade_to_network(
+    usb_coordinator: FrameoDataUpdateCoordinator, usb_addon: _UsbAddon
+) -> None:
+    """Test that a USB device moves to its wireless address, keeping USB as fallback."""
+    details = await usb_coordinator.async_upgrade_to_network()
+
+    assert details == {
+        CONF_CONN_TYPE: ConnectionType.NETWORK,
+        CONF_HOST: _WLAN_ADDRESS,
+        CONF_PORT: DEFAULT_DEVICE_PORT,
+    }
+    assert usb_addon.connected[-1] == details
+    assert usb_coordinator.is_connected
+    assert [transport.name for transport in usb_coordinator.transports] == [
+        ConnectionType.NETWORK,
+        ConnectionType.USB,
+    ]
+    assert usb_coordinator.active_transport.name == ConnectionType.NETWORK
+    assert (await usb_coordinator.async_execute_command("echo hi")).output == "hi"
+
+
+async def test_upgrade_falls_back_to_usb(
+    usb_coordinator: FrameoDataUpdateCoordinator, usb_addon: _UsbAddon
+) -> None:
+    """Test that the USB link is restored when wireless ADB does not come up."""
+    usb_addon.listens = False
+
+    with pytest.raises(FrameoApiError, match=_WLAN_ADDRESS):
+        await usb_coordinator.async_upgrade_to_network()
+
+    assert usb_coordinator.is_connected
+    assert usb_coordinator.active_transport.name == ConnectionType.USB
+    assert usb_addon.connected[-1][CONF_CONN_TYPE] == ConnectionType.USB
+
+
+async def test_upgrade_without_address(
+    usb_coordinator: FrameoDataUpdateCoordinator, usb_addon: _UsbAddon
+) -> None:
+    """Test that wireless ADB is left off when the device has no address."""
+    usb_addon.wlan = "Device \"wlan0\" does not exist."
+
+    with pytest.raises(FrameoApiError, match="network address"):
+        await usb_coordinator.async_upgrade_to_network()
+
+    assert not usb_addon.tcpip
+    assert usb_coordinator.is_connected
+
+
+async def test_upgrade_requires_usb(coordinator: FrameoDataUpdateCoordinator) -> None:
+    """Test that a device already on the network is not upgraded."""
+    with pytest.raises(FrameoApiError, match="not connected over USB"):
+        await coordinator.async_upgrade_to_network()
@@ -0,0 +1,112 @@
+"""Tests for user-defined gestures."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.ha_frameo_control.gestures import (
+    FrameoGesture,
+    FrameoGestureTable,
+    GestureKind,
+    parse_gesture,
+)
+
+
+@pytest.mark.parametrize(
+    ("definition", "gesture"),
+    [
+        (
+            "Home: tap 0.5 0.25",
+            FrameoGesture(name="Home", kind=GestureKind.TAP, x=0.5, y=0.25),
+        ),
+        (
+            "  Next photo :  swipe 0.6 0.6 0.1 0.6 300 ",
+            FrameoGesture(
+                name="Next photo",
+                kind=GestureKind.SWIPE,
+                x=0.6,
+                y=0.6,
+                x2=0.1,
+                y2=0.6,
+                duration=300,
+            ),
+        ),
+        (
+            "Menu: long_press 0 1",
+            FrameoGesture(name="Menu", kind=GestureKind.LONG_PRESS, x=0, y=1),
+        ),
+        (
+            "Menu: long_press 0.5 0.5 2500",
+            FrameoGesture(
+                name="Menu", kind=GestureKind.LONG_PRESS, x=0.5, y=0.5, duration=2500
+            ),
+        ),
+    ],
+)
+def test_parse_gesture(definition: str, gesture: FrameoGesture) -> None:
+    """Test parsing valid gesture definitions."""
+    assert parse_gesture(definition) == gesture
+
+
+@pytest.mark.parametrize(
+    "definition",
+    [
+        "tap 0.5 0.5",
+        "Home: tap",
+        "Home: tap 0.5",
+        "Home: tap 0.5 0.5 100",
+        "Home: pinch 0.5 0.5",
+        "Home: tap 1.5 0.5",
+        "Home: tap -0.5 0.5",
+        "Next: swipe 0.6 0.6 0.1",
+        "Next: swipe 0.6 0.6 0.1 0.6 300 5",
+        "???: tap 0.5 0.5",
+    ],
+)
+def test_parse_invalid_gesture(definition: str) -> None:
+    """Test that malformed gesture definitions are rejected."""
+    with pytest.raises(ValueError, match="Invalid gesture definition"):
+        parse_gesture(definition)
+
+
+@pytest.mark.parametrize(
+    ("definition", "command"),
+    [
+        ("Home: tap 0.5 0.25", "input tap 640 200"),
+        ("Next: swipe 0.6 0.6 0.1 0.6", "input swipe 768 480 128 480"),
+        ("Next: swipe 0.6 0.6 0.1 0.6 300", "input swipe 768 480 128 480 300"),
+        ("Menu: long_press 0.5 0.5", "input swipe 640 400 640 400 1000"),
+        ("Menu: long_press 0.5 0.5 2500", "input swipe 640 400 640 400 2500"),
+    ],
+)
+def test_build_command(definition: str, command: str) -> None:
+    """Test that normalized coordinates are scaled to the screen size."""
+    assert parse_gesture(definition).build_command(1280, 800) == command
+
+
+def test_table_rebuilds_on_geometry_change() -> None:
+    """Test that commands are built once per screen geometry."""
+    table = FrameoGestureTable(
+        {
+            "home": parse_gesture("Home: tap 0.5 0.25"),
+            "next": parse_gesture("Next: swipe 0.6 0.6 0.1 0.6"),
+        }
+    )
+
+    with patch.object(
+        FrameoGesture,
+        "build_command",
+        autospec=True,
+        side_effect=FrameoGesture.build_command,
+    ) as build_command:
+        assert table.command("home", 1280, 800) == "input tap 640 200"
+        assert table.command("next", 1280, 800) == "input swipe 768 480 128 480"
+        assert build_command.call_count == 2
+
+        # Rotated to portrait
+        assert table.command("home", 800, 1280) == "input tap 400 320"
+        assert build_command.call_count == 4
+
+    with pytest.raises(KeyError):
+        table.command("removed", 800, 1280)
@@ -0,0 +1,242 @@
+"""Tests for the device health metrics."""
+from __future__ import annotations
+
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.ha_frameo_control.const import ADB_CMD_POWER_KEY
+from custom_components.ha_frameo_control.health import (
+    FrameoStateSnapshot,
+    build_health_command,
+    build_launch_command,
+    build_restore_command,
+    build_snapshot_command,
+    parse_health_output,
+    parse_launch_output,
+    parse_snapshot_output,
+)
+
+_DUMPSYS_BATTERY = """Current Battery Service state:
+  AC powered: false
+  USB powered: true
+  present: true
+  level: 87
+  temperature: 312
+"""
+
+_DF_TOOLBOX = """Filesystem               Size     Used     Free   Blksize
+/data                   11.8G     2.3G     9.5G   4096
+"""
+
+_DF_TOYBOX = """Filesystem      1K-blocks    Used Available Use% Mounted on
+/dev/block/dm-0  12338208 2411164   9927044  20% /data
+"""
+
+
+def _output(**sections: str) -> str:
+    """Join metric outputs the way the combined health command prints them."""
+    return "".join(f"@@frameo:{key}\n{text}\n" for key, text in sections.items())
+
+
+def test_build_health_command() -> None:
+    """Test that each metric's command is preceded by its section marker."""
+    assert build_health_command(["uptime", "storage"]) == (
+        "echo @@frameo:uptime; cat /proc/uptime; echo @@frameo:storage; df /data"
+    )
+
+
+def test_parse_health_output(freezer: FrozenDateTimeFactory) -> None:
+    """Test that every metric is parsed from its own section."""
+    freezer.move_to("2026-10-19 12:00:00+00:00")
+    output = _output(
+        foreground="  mCurrentFocus=Window{4f2 u0 net.frameo.app/.MainActivity}",
+        wifi="mWifiInfo SSID: home, RSSI: -61, Link speed: 72Mbps",
+        memory="MemFree:           51200 kB\nMemAvailable:     524288 kB",
+        battery=_DUMPSYS_BATTERY,
+        uptime="3600.00 7000.11",
+        storage=_DF_TOOLBOX,
+    )
+
+    assert parse_health_output(output) == {
+        "foreground": {"package": "net.frameo.app", "activity": ".MainActivity"},
+        "wifi": -61,
+        "memory": 512.0,
+        "battery": {"level": 87, "temperature": 31.2},
+        "uptime": datetime.fromisoformat("2026-10-19 11:00:00+00:00"),
+        "storage": 9728.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("key", "text", "value"),
+    [
+        ("storage", _DF_TOYBOX, 9694.4),
+        ("memory", "MemFree:           102400 kB", 100.0),
+        ("wifi", "mWifiInfo SSID: <unknown ssid>, RSSI: -127", None),
+        ("foreground", "  mCurrentFocus=null", None),
+        ("battery", "  present: false\n  level: 0", None),
+    ],
+)
+def test_parse_fallbacks(key: str, text: str, value: object) -> None:
+    """Test older tool output and the states reported as no value."""
+    assert parse_health_output(_output(**{key: text})) == {key: value}
+
+
+@pytest.mark.parametrize(
+    ("key", "text"),
+    [
+        ("memory", "SwapFree:          0 kB"),
+        ("uptime", ""),
+        ("storage", "df: /data: Permission denied"),
+        ("battery", "  level: full"),
+    ],
+)
+def test_unparseable_metric(key: str, text: str) -> None:
+    """Test that a metric that cannot be parsed reads None without failing others."""
+    output = _output(**{key: text, "wifi": "RSSI: -50"})
+
+    assert parse_health_output(output) == {key: None, "wifi": -50}
+
+
+def test_unknown_and_stray_output() -> None:
+    """Test that output before the first marker and unknown keys are ignored."""
+    output = "stray\n" + _output(removed="1", uptime="60.00 1.00")
+
+    assert parse_health_output(output).keys() == {"uptime"}
+
+
+def test_build_launch_command() -> None:
+    """Test that the launch is skipped on the device when the app is in front."""
+    assert build_launch_command("net.frameo.app", "-n net.frameo.app/.Main") == (
+        "dumpsys window windows | grep -q 'mCurrentFocus=.* net.frameo.app/'"
+        " || am start -W -n net.frameo.app/.Main"
+    )
+
+
+@pytest.mark.parametrize(
+    ("output", "timing"),
+    [
+        (
+            "Starting: Intent { cmp=net.frameo.app/.Main }\n"
+            "Status: ok\nLaunchState: COLD\nActivity: net.frameo.app/.Main\n"
+            "TotalTime: 812\nWaitTime: 830\nComplete\n",
+            {"state": "COLD", "total_time": 812, "wait_time": 830},
+        ),
+        (
+            # Android 6 does not report the launch state
+            "Status: ok\nThisTime: 95\nTotalTime: 95\nWaitTime: 110\nComplete\n",
+            {"state": None, "total_time": 95, "wait_time": 110},
+        ),
+        ("", None),
+        ("\n", None),
+    ],
+)
+def test_parse_launch_output(output: str, timing: dict[str, object] | None) -> None:
+    """Test launch timing parsing, and no timing when the app was in front."""
+    assert parse_launch_output(output) == timing
+
+
+_SNAPSHOT = FrameoStateSnapshot(
+    is_on=True,
+    brightness=120,
+    auto_rotate=False,
+    rotation=1,
+    foreground={"package": "net.frameo.app", "activity": ".MainActivity"},
+)
+
+# Shell stand-ins for the device tools the restore command calls, backed by
+# files in the current directory; every call that changes state is logged
+_FAKE_DEVICE = """
+dumpsys() { echo "mWakefulness=$(cat power)"; echo "mCurrentFocus=x $(cat focus)/"; }
+settings() {
+    if [ "$1" = get ]; then cat "$3" 2>/dev/null || echo null
+    else echo "$4" > "$3"; echo "settings $3 $4" >> log; fi
+}
+input() {
+    if [ "$(cat power)" = Awake ]; then echo Asleep > power; else echo Awake > power; fi
+    echo power >> log
+}
+am() { echo "${3%%/*}" > focus; echo "am $3" >> log; }
+"""
+
+
+def test_parse_snapshot_output() -> None:
+    """Test that the snapshot command's output parses back into a snapshot."""
+    output = _output(
+        power="  mWakefulness=Awake",
+        brightness="120",
+        auto_rotate="0",
+        rotation="1",
+        foreground="  mCurrentFocus=Window{4f2 u0 net.frameo.app/.MainActivity}",
+    )
+
+    assert build_snapshot_command().count("echo @@frameo:") == 5
+    assert parse_snapshot_output(output) == _SNAPSHOT
+
+
+def test_parse_snapshot_unset_settings() -> None:
+    """Test that settings that were never set and a missing focus read None."""
+    output = _output(
+        power="  mWakefulness=Asleep",
+        brightness="null",
+        auto_rotate="1",
+        rotation="null",
+        foreground="  mCurrentFocus=null",
+    )
+
+    assert parse_snapshot_output(output) == FrameoStateSnapshot(
+        is_on=False, brightness=None, auto_rotate=True, rotation=None, foreground=None
+    )
+
+
+@pytest.mark.parametrize("output", ["", _output(power="Permission denial")])
+def test_parse_snapshot_without_power(output: str) -> None:
+    """Test that a snapshot without the power state is rejected."""
+    with pytest.raises(ValueError):
+        parse_snapshot_output(output)
+
+
+def test_build_restore_command_skips_unknown() -> None:
+    """Test that fields that were not captured are left alone."""
+    snapshot = FrameoStateSnapshot(
+        is_on=True, brightness=None, auto_rotate=True, rotation=2, foreground=None
+    )
+    command = build_restore_command(snapshot, ADB_CMD_POWER_KEY)
+
+    assert "screen_brightness" not in command
+    # The user rotation has no effect while auto rotate is on
+    assert "user_rotation" not in command
+    assert "am start" not in command
+    assert command.endswith("; true")
+
+
+@pytest.mark.parametrize("is_on", [True, False])
+def test_restore_command_is_repeatable(tmp_path: Path, is_on: bool) -> None:
+    """Test the restore command against a fake device, and that a repeat is a no-op."""
+    (tmp_path / "power").write_text("Asleep" if is_on else "Awake")
+    (tmp_path / "focus").write_text("com.android.launcher")
+    (tmp_path / "screen_brightness").write_text("40")
+    command = build_restore_command(
+        FrameoStateSnapshot(**{**_SNAPSHOT.as_dict(), "is_on": is_on}),
+        ADB_CMD_POWER_KEY,
+    )
+
+    for _ in range(2):
+        subprocess.run(
+            ["sh", "-c", _FAKE_DEVICE + command], cwd=tmp_path, check=True
+        )
+
+    # The screen is toggled once: woken first, or put to sleep after the launch
+    assert (tmp_path / "log").read_text().splitlines() == [
+        *(("power",) if is_on else ()),
+        "settings screen_brightness 120",
+        "settings accelerometer_rotation 0",
+        "settings user_rotation 1",
+        "am net.frameo.app/.MainActivity",
+        *(() if is_on else ("power",)),
+    ]
+    assert (tmp_path / "power").read_text().strip() == ("Awake" if is_on else "Asleep")
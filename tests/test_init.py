@@ -0,0 +1,65 @@
+"""Tests for setting up the integration."""
+from __future__ import annotations
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ha_frameo_control import async_move_entry_to_network
+from custom_components.ha_frameo_control.const import (
+    CONF_CONN_TYPE,
+    CONF_FALLBACK_HOST,
+    CONF_FALLBACK_SERIAL,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_SERIAL,
+    DEFAULT_DEVICE_PORT,
+    DOMAIN,
+    ConnectionType,
+)
+
+_NETWORK = {
+    CONF_CONN_TYPE: ConnectionType.NETWORK,
+    CONF_HOST: "192.0.2.20",
+    CONF_PORT: DEFAULT_DEVICE_PORT,
+}
+
+
+def _usb_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Add a USB entry that falls back to an old network address."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Frameo (FRAMEO1)",
+        unique_id="FRAMEO1",
+        data={CONF_CONN_TYPE: ConnectionType.USB, CONF_SERIAL: "FRAMEO1"},
+        options={CONF_FALLBACK_HOST: "192.0.2.99", CONF_HEARTBEAT_INTERVAL: 30},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_move_entry_to_network(hass: HomeAssistant) -> None:
+    """Test that a USB entry is switched to the network, falling back to USB."""
+    entry = _usb_entry(hass)
+
+    async_move_entry_to_network(hass, entry, _NETWORK)
+
+    assert entry.title == "Frameo (192.0.2.20)"
+    assert entry.unique_id == "192.0.2.20"
+    assert dict(entry.data) == _NETWORK
+    assert dict(entry.options) == {
+        CONF_HEARTBEAT_INTERVAL: 30,
+        CONF_FALLBACK_SERIAL: "FRAMEO1",
+    }
+
+
+async def test_move_entry_keeps_unique_id_in_use(hass: HomeAssistant) -> None:
+    """Test that the unique ID is kept when another entry has the address."""
+    MockConfigEntry(domain=DOMAIN, unique_id="192.0.2.20", data=_NETWORK).add_to_hass(
+        hass
+    )
+    entry = _usb_entry(hass)
+
+    async_move_entry_to_network(hass, entry, _NETWORK)
+
+    assert entry.unique_id == "FRAMEO1"
+    assert entry.data[CONF_HOST] == "192.0.2.20"
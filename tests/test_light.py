@@ -0,0 +1,76 @@
+"""Tests for the screen light."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.components.light import ATTR_BRIGHTNESS, DOMAIN as LIGHT_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.ha_frameo_control.const import (
+    ADB_CMD_BRIGHTNESS,
+    BRIGHTNESS_DEBOUNCE,
+)
+
+from .conftest import FakeAdbd
+
+_ENTITY_ID = "light.frameo_127_0_0_1_screen"
+
+
+def _brightness_writes(fake_adbd: FakeAdbd) -> list[str]:
+    """Return the brightness commands the device ran."""
+    prefix = ADB_CMD_BRIGHTNESS.format(brightness="")
+    return [command for command in fake_adbd.commands if command.startswith(prefix)]
+
+
+async def _async_turn_on(hass: HomeAssistant, brightness: int) -> None:
+    """Set the screen brightness."""
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: _ENTITY_ID, ATTR_BRIGHTNESS: brightness},
+        blocking=True,
+    )
+
+
+async def test_brightness_burst_written_once(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_adbd: FakeAdbd
+) -> None:
+    """Test that a burst of brightness changes shows each and writes the last."""
+    for brightness in (10, 80, 150):
+        await _async_turn_on(hass, brightness)
+        assert hass.states.get(_ENTITY_ID).attributes[ATTR_BRIGHTNESS] == brightness
+    assert not _brightness_writes(fake_adbd)
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=BRIGHTNESS_DEBOUNCE)
+    )
+    await hass.async_block_till_done()
+
+    assert _brightness_writes(fake_adbd) == [ADB_CMD_BRIGHTNESS.format(brightness=150)]
+    state = hass.states.get(_ENTITY_ID)
+    assert state.state == "on"
+    assert state.attributes[ATTR_BRIGHTNESS] == 150
+
+
+async def test_turn_off_drops_pending_brightness(
+    hass: HomeAssistant, config_entry: MockConfigEntry, fake_adbd: FakeAdbd
+) -> None:
+    """Test that turning off before the write supersedes the brightness."""
+    await _async_turn_on(hass, 200)
+    await hass.services.async_call(
+        LIGHT_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: _ENTITY_ID}, blocking=True
+    )
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=BRIGHTNESS_DEBOUNCE)
+    )
+    await hass.async_block_till_done()
+
+    assert not _brightness_writes(fake_adbd)
+    assert hass.states.get(_ENTITY_ID).state == "off"
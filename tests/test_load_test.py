@@ -0,0 +1,35 @@
+"""Smoke test of the load test script."""
+from __future__ import annotations
+
+import argparse
+import socket
+
+import pytest
+
+from scripts.load_test import _async_main
+
+
+async def test_load_test_runs(
+    socket_enabled: None, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that a short run drives every operation without failures."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    args = argparse.Namespace(
+        devices=3,
+        rate=10.0,
+        duration=1.0,
+        latency=0.005,
+        jitter=0.0,
+        error_rate=0.0,
+        storm_every=0.0,
+        storm_duration=0.0,
+        heartbeat=0.2,
+        port=port,
+    )
+    results = await _async_main(args)
+
+    assert not results.failures
+    assert sum(len(samples) for samples in results.latencies.values()) >= 20
+    assert "Throughput" in capsys.readouterr().out
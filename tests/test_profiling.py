@@ -0,0 +1,55 @@
+"""Tests for request profiling."""
+from __future__ import annotations
+
+import cProfile
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_frameo_control.adb import FrameoAdbClient
+from custom_components.ha_frameo_control.const import EVENT_PROFILE
+from custom_components.ha_frameo_control.profiling import FrameoProfiler
+
+
+async def test_profile_direct_client(
+    hass: HomeAssistant, client: FrameoAdbClient
+) -> None:
+    """Test that requests over direct ADB are profiled per service."""
+    events = []
+    hass.bus.async_listen(EVENT_PROFILE, events.append)
+    profiler = FrameoProfiler(hass, client, operations=3)
+    profiler.async_start()
+    await client.async_shell("true")
+    await client.async_shell("true")
+    await client.async_exec("true")
+    await hass.async_block_till_done()
+
+    assert client.profiler is None
+    endpoints = events[0].data["endpoints"]
+    assert {name: data["count"] for name, data in endpoints.items()} == {
+        "session": 2,
+        "exec:": 1,
+    }
+
+
+async def test_replaced_profiler_stops(
+    hass: HomeAssistant, client: FrameoAdbClient
+) -> None:
+    """Test that a profiler replaced on its client still stops its cProfile."""
+    events = []
+    hass.bus.async_listen(EVENT_PROFILE, events.append)
+    first = FrameoProfiler(hass, client, duration=60, cprofile=True)
+    first.async_start()
+    second = FrameoProfiler(hass, client, duration=60)
+    second.async_start()
+    assert client.profiler is second
+
+    await first.async_stop()
+    await first.async_stop()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert client.profiler is second
+    # The first cProfile was disabled, so another one can run
+    profile = cProfile.Profile()
+    profile.enable()
+    profile.disable()
+    await second.async_stop()
@@ -0,0 +1,131 @@
+"""Tests for the local network scan."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+import pytest
+import pytest_socket
+
+from custom_components.ha_frameo_control.adb import (
+    A_AUTH,
+    A_CNXN,
+    ADB_MAX_PAYLOAD,
+    ADB_VERSION,
+    async_read_packet,
+    build_packet,
+)
+from custom_components.ha_frameo_control.scan import async_probe_adb, async_scan_hosts
+
+type Handler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
+
+# Probe timeout used by the tests, in seconds
+_TIMEOUT = 0.3
+
+
+async def _answer_cnxn(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer like a device that trusts everyone."""
+    await async_read_packet(reader)
+    writer.write(build_packet(A_CNXN, ADB_VERSION, ADB_MAX_PAYLOAD, b"device::\x00"))
+    await writer.drain()
+
+
+async def _answer_auth(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer like a device that wants a key."""
+    await async_read_packet(reader)
+    writer.write(build_packet(A_AUTH, 1, 0, bytes(20)))
+    await writer.drain()
+
+
+async def _answer_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer like a service that is not adbd."""
+    await reader.read(24)
+    writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+    await writer.drain()
+
+
+async def _silent(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Accept the connection but never answer."""
+    await reader.read()
+
+
+@pytest.fixture
+async def listeners(
+    socket_enabled: None,
+) -> AsyncGenerator[tuple[int, dict[str, Handler]]]:
+    """Start listeners on loopback addresses sharing one port."""
+    handlers: dict[str, Handler] = {
+        "127.0.0.2": _answer_cnxn,
+        "127.0.0.3": _silent,
+        "127.0.0.4": _answer_auth,
+        "127.0.0.5": _answer_http,
+    }
+    # Only 127.0.0.1 may be connected to by default
+    pytest_socket.socket_allow_hosts([*handlers, "127.0.0.6"], allow_unix_socket=True)
+    servers: list[asyncio.Server] = []
+    writers: list[asyncio.StreamWriter] = []
+    port = 0
+
+    def _track(handler: Handler) -> Handler:
+        async def _handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            writers.append(writer)
+            await handler(reader, writer)
+
+        return _handle
+
+    for host, handler in handlers.items():
+        server = await asyncio.start_server(_track(handler), host, port)
+        port = server.sockets[0].getsockname()[1]
+        servers.append(server)
+    yield port, handlers
+    for writer in writers:
+        writer.close()
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.parametrize(
+    ("host", "expected"),
+    [
+        ("127.0.0.2", True),
+        ("127.0.0.3", False),
+        ("127.0.0.4", True),
+        ("127.0.0.5", False),
+        # Nothing listens here, so the connection is refused
+        ("127.0.0.6", False),
+    ],
+)
+async def test_probe(
+    listeners: tuple[int, dict[str, Handler]], host: str, expected: bool
+) -> None:
+    """Test that only hosts answering CNXN or AUTH are taken for adbd."""
+    port, _ = listeners
+    start = time.monotonic()
+    assert await async_probe_adb(host, port, _TIMEOUT) is expected
+    assert time.monotonic() - start < _TIMEOUT * 2
+
+
+async def test_scan_hosts(listeners: tuple[int, dict[str, Handler]]) -> None:
+    """Test that a scan finds the devices in order, bounded by the timeout."""
+    port, _ = listeners
+    hosts = [f"127.0.0.{last}" for last in range(2, 7)] * 4
+    start = time.monotonic()
+    found = await async_scan_hosts(hosts, port, concurrency=8, timeout=_TIMEOUT)
+    elapsed = time.monotonic() - start
+    assert found == ["127.0.0.2", "127.0.0.4"] * 4
+    # Four silent hosts, each held for the timeout, spread over eight slots
+    assert elapsed < _TIMEOUT * 3
+
+
+async def test_scan_concurrency(listeners: tuple[int, dict[str, Handler]]) -> None:
+    """Test that probes beyond the concurrency limit wait for a free slot."""
+    port, _ = listeners
+    start = time.monotonic()
+    found = await async_scan_hosts(["127.0.0.3"] * 3, port, concurrency=1, timeout=_TIMEOUT)
+    assert found == []
+    # Silent hosts probed one at a time each take the whole timeout
+    assert time.monotonic() - start >= _TIMEOUT * 3
@@ -0,0 +1,139 @@
+"""Tests for decoding raw screen captures."""
+from __future__ import annotations
+
+import gzip
+import struct
+import zlib
+
+import pytest
+
+from custom_components.ha_frameo_control.screencap import (
+    FrameoScreenshot,
+    PixelFormat,
+    build_capture_command,
+    decode_screencap,
+)
+
+# A 2x2 frame of red, green, blue and white pixels, as 8-bit RGB
+_RGB = bytes((255, 0, 0, 0, 255, 0, 0, 0, 255, 255, 255, 255))
+
+# The same pixels in each format screencap writes
+_PIXELS = {
+    PixelFormat.RGBA_8888: bytes(
+        (255, 0, 0, 255, 0, 255, 0, 255, 0, 0, 255, 255, 255, 255, 255, 255)
+    ),
+    PixelFormat.RGBX_8888: bytes(
+        (255, 0, 0, 0, 0, 255, 0, 0, 0, 0, 255, 0, 255, 255, 255, 0)
+    ),
+    PixelFormat.RGB_888: _RGB,
+    PixelFormat.BGRA_8888: bytes(
+        (0, 0, 255, 255, 0, 255, 0, 255, 255, 0, 0, 255, 255, 255, 255, 255)
+    ),
+    PixelFormat.RGB_565: struct.pack("<4H", 0xF800, 0x07E0, 0x001F, 0xFFFF),
+}
+
+
+def _frame(
+    width: int,
+    height: int,
+    pixel_format: PixelFormat,
+    pixels: bytes,
+    *,
+    color_space: bool = True,
+) -> bytes:
+    """Build raw screencap output."""
+    header = struct.pack("<3I", width, height, pixel_format)
+    return header + (b"\x01\x00\x00\x00" if color_space else b"") + pixels
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_build_capture_command(compress: bool) -> None:
+    """Test that stderr is dropped and the frame is gzipped on request."""
+    command = build_capture_command(compress)
+
+    assert command.startswith("screencap 2>/dev/null")
+    assert command.endswith("| gzip -1") is compress
+
+
+@pytest.mark.parametrize("pixel_format", list(PixelFormat))
+def test_decode_pixel_formats(pixel_format: PixelFormat) -> None:
+    """Test that every pixel format decodes to the same RGB."""
+    raw = _frame(2, 2, pixel_format, _PIXELS[pixel_format])
+
+    assert decode_screencap(raw) == FrameoScreenshot(width=2, height=2, rgb=_RGB)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        # Android 8 and older write no color space
+        _frame(2, 2, PixelFormat.RGB_888, _RGB, color_space=False),
+        gzip.compress(_frame(2, 2, PixelFormat.RGB_888, _RGB)),
+        # Rows padded to 4 pixels
+        _frame(2, 2, PixelFormat.RGB_888, _RGB[:6] + bytes(6) + _RGB[6:] + bytes(6)),
+    ],
+    ids=["no_color_space", "gzip", "padded_rows"],
+)
+def test_decode_frame_layouts(raw: bytes) -> None:
+    """Test old headers, compressed frames and padded rows."""
+    assert decode_screencap(raw) == FrameoScreenshot(width=2, height=2, rgb=_RGB)
+
+
+@pytest.mark.parametrize(
+    ("max_width", "step", "width", "height"),
+    [(None, 1, 5, 3), (5, 1, 5, 3), (4, 2, 2, 2), (2, 3, 1, 1), (1, 5, 1, 1)],
+)
+def test_decode_downscales(
+    max_width: int | None, step: int, width: int, height: int
+) -> None:
+    """Test that frames are scaled down by a whole factor to fit a width."""
+    # Each pixel's red is its column and green its row
+    pixels = bytes(value for y in range(3) for x in range(5) for value in (x, y, 0))
+
+    screenshot = decode_screencap(_frame(5, 3, PixelFormat.RGB_888, pixels), max_width)
+
+    assert (screenshot.width, screenshot.height) == (width, height)
+    # Every step-th pixel of every step-th row is kept
+    assert screenshot.rgb == bytes(
+        value
+        for y in range(0, 3, step)
+        for x in range(0, width * step, step)
+        for value in (x, y, 0)
+    )
+
+
+@pytest.mark.parametrize(
+    ("raw", "message"),
+    [
+        (b"", "no frame"),
+        (b"screencap: not found\n", "Unsupported pixel format"),
+        (_frame(2, 2, 9, bytes(16)), "Unsupported pixel format"),
+        (_frame(0, 2, PixelFormat.RGBA_8888, b""), "Invalid frame size"),
+        (_frame(2, 2, PixelFormat.RGBA_8888, bytes(15)), "does not match"),
+    ],
+)
+def test_decode_invalid(raw: bytes, message: str) -> None:
+    """Test that data that is not a supported frame is rejected."""
+    with pytest.raises(ValueError, match=message):
+        decode_screencap(raw)
+
+
+def test_to_png() -> None:
+    """Test that the PNG holds the image in unfiltered RGB scanlines."""
+    png = FrameoScreenshot(width=2, height=2, rgb=_RGB).to_png()
+
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    chunks = {}
+    position = 8
+    while position < len(png):
+        (length,) = struct.unpack_from(">I", png, position)
+        kind = png[position + 4 : position + 8]
+        data = png[position + 8 : position + 8 + length]
+        (crc,) = struct.unpack_from(">I", png, position + 8 + length)
+        assert crc == zlib.crc32(kind + data)
+        chunks[kind] = data
+        position += 12 + length
+
+    assert list(chunks) == [b"IHDR", b"IDAT", b"IEND"]
+    assert struct.unpack(">2I5B", chunks[b"IHDR"]) == (2, 2, 8, 2, 0, 0, 0)
+    assert zlib.decompress(chunks[b"IDAT"]) == b"\x00" + _RGB[:6] + b"\x00" + _RGB[6:]